@@ -1,38 +1,124 @@
-from pynput.mouse import Button, Controller
-from pynput import keyboard
+import argparse  # Command line options
 import time
-import threading
-
-# Initialize mouse controller
-mouse = Controller()
-
-# Settings
-clicking = False  # Start with clicking disabled
-delay = 0.01  # Delay between clicks (in seconds)
-
-# Clicker function
-def clicker():
-    while True:
-        if clicking:
-            mouse.click(Button.left)
-        time.sleep(delay)
-
-# Keyboard listener functions
-def on_press(key):
-    global clicking
-    try:
-        if key.char == 's':  # Toggle clicking with 's'
-            clicking = not clicking  # Flip the state
-        elif key.char == 'q':  # Quit program with 'q'
-            return False
-    except AttributeError:
-        pass
-
-# Start clicker thread
-clicker_thread = threading.Thread(target=clicker)
-clicker_thread.daemon = True  # Ensure thread exits when main program exits
-clicker_thread.start()
-
-# Start listening for keyboard input
-with keyboard.Listener(on_press=on_press) as listener:
-    listener.join()
+from precise_timing import PacedLoop, constant_intervals, burst_intervals, pattern_intervals
+from hotkeys import HotkeyManager, parse_bindings
+
+
+# Functions to check the numbers given on the command line (argparse types).
+def positive_float(text):
+    value = float(text)
+    if not 0 < value < float("inf"):
+        raise argparse.ArgumentTypeError(f"must be a number greater than 0, got {text}")
+    return value
+
+
+def positive_int(text):
+    value = int(text)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {text}")
+    return value
+
+
+def non_negative_float(text):
+    value = float(text)
+    if not value >= 0:
+        raise argparse.ArgumentTypeError(f"must not be negative, got {text}")
+    return value
+
+
+def interval_pattern(text):
+    return [positive_float(part) for part in text.split(",")]
+
+
+# Function to build the interval generator for the chosen mode.
+# Rates and intervals must be positive: the generators run on the clicker
+# thread, where an error would only stop the clicking.
+def make_intervals(cps, burst=None, burst_pause=0.5, pattern=None):
+    if pattern is not None and (not pattern or min(pattern) <= 0):
+        raise ValueError("pattern intervals must be greater than 0")
+    if not 0 < cps < float("inf"):
+        raise ValueError("cps must be a number greater than 0")
+    if pattern:
+        # Pattern mode: intervals in milliseconds, repeated.
+        seconds = [interval / 1000 for interval in pattern]
+        return lambda: pattern_intervals(seconds)
+    if burst:
+        # Burst mode: burst clicks at cps, then a pause.
+        return lambda: burst_intervals(cps, burst, burst_pause)
+    return lambda: constant_intervals(cps)
+
+
+# Function to print the achieved rate and jitter of the clicker.
+def print_stats(stats):
+    summary = stats.summary()
+    if "rate" not in summary:
+        print(f"{summary['count']} clicks")
+        return
+    print(f"{summary['count']} clicks, {summary['rate']:.1f} CPS, "
+          f"jitter {summary['jitter_ms']:.3f} ms, "
+          f"late {summary['lateness_mean_ms']:.3f} ms avg / {summary['lateness_max_ms']:.3f} ms max, "
+          f"{summary['resyncs']} resyncs")
+
+
+# Function to run the timing engine without clicking, to check the rate it holds.
+def benchmark(intervals, seconds):
+    clicker = PacedLoop(lambda: None, intervals)
+    clicker.start()
+    time.sleep(seconds)
+    clicker.stop()
+    clicker.close()
+    print_stats(clicker.stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Auto clicker: 's' starts/stops clicking, 'q' quits.")
+    parser.add_argument("--keys", default="s=toggle,q=quit",
+                        help="key bindings for the toggle and quit commands (default s=toggle,q=quit)")
+    parser.add_argument("--cps", type=positive_float, default=100, help="target clicks per second (default 100)")
+    parser.add_argument("--burst", type=positive_int, help="click in bursts of this many clicks")
+    parser.add_argument("--burst-pause", type=non_negative_float, default=0.5, help="pause between bursts in seconds")
+    parser.add_argument("--pattern", type=interval_pattern,
+                        help="comma separated click intervals in milliseconds, repeated")
+    parser.add_argument("--benchmark", type=positive_float, metavar="SECONDS",
+                        help="run the timing engine without clicking and print the stats")
+    args = parser.parse_args()
+
+    intervals = make_intervals(args.cps, args.burst, args.burst_pause, args.pattern)
+
+    if args.benchmark:
+        benchmark(intervals, args.benchmark)
+        return
+
+    from pynput.mouse import Button, Controller  # Imported here: needs a display
+
+    # Initialize mouse controller
+    mouse = Controller()
+    # The clicker thread waits parked until it is started
+    clicker = PacedLoop(lambda: mouse.click(Button.left), intervals)
+
+    # Toggle clicking: print the stats of a run when it stops
+    def toggle():
+        if clicker.running:
+            clicker.stop()
+            print_stats(clicker.stats)
+        else:
+            clicker.stats.reset()
+            clicker.start()
+
+    hotkeys = HotkeyManager()
+    commands = {"toggle": toggle, "quit": hotkeys.stop}
+    for key, command in parse_bindings(args.keys).items():
+        if command not in commands:
+            parser.error(f"unknown command {command!r} (use toggle or quit)")
+        hotkeys.bind(key, commands[command], command)
+
+    # Listen for the hotkeys until quit is pressed
+    hotkeys.start()
+    hotkeys.wait()
+    clicker.close()
+    print_stats(clicker.stats)
+    hotkeys.print_latency()
+
+
+if __name__ == "__main__":
+    main()
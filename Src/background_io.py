@@ -0,0 +1,188 @@
+import queue  # Hands results from the worker threads back to the GUI thread
+import threading  # Cancellation and completion flags
+import traceback  # Reporting errors of jobs without an error callback
+from collections import deque  # Jobs waiting for an earlier job with the same key
+from concurrent.futures import ThreadPoolExecutor  # Worker threads
+
+
+class JobCancelled(Exception):
+    """Raised by Job.check_cancelled() to stop a job that was cancelled."""
+
+
+class Job:
+    """Handle of one piece of work submitted to a BackgroundExecutor.
+
+    The job function receives its Job as first argument, so it can report
+    progress and check for cancellation between steps. Cancelling a job that
+    has not started yet skips it; a running job stops at its next
+    check_cancelled().
+    """
+
+    def __init__(self, executor, func, args, key, on_done, on_error, on_progress, on_cancel):
+        self._executor = executor
+        self.func = func
+        self.args = args
+        self.key = key  # Jobs with the same key run one after another, in submission order.
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancel = on_cancel
+        self._cancel_event = threading.Event()
+        self._finished = threading.Event()
+        self._progress = None  # Latest (done, total, message) not yet delivered.
+        self._progress_lock = threading.Lock()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    @property
+    def finished(self):
+        return self._finished.is_set()
+
+    def check_cancelled(self):
+        # Called by the job function between steps.
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+    def report_progress(self, done, total=None, message=None):
+        # Called by the job function. Reports are coalesced: if the GUI has not
+        # picked up the previous one yet, it only sees the latest.
+        if self.on_progress is None:
+            return
+        with self._progress_lock:
+            pending = self._progress is not None
+            self._progress = (done, total, message)
+        if not pending:
+            self._executor._post(self._deliver_progress)
+
+    def _deliver_progress(self):
+        with self._progress_lock:
+            progress, self._progress = self._progress, None
+        if progress is not None:
+            self.on_progress(*progress)
+
+    def wait(self, timeout=None):
+        # Block until the job has finished (or was skipped). Not for the GUI thread.
+        return self._finished.wait(timeout)
+
+
+class BackgroundExecutor:
+    """Runs slow work (file I/O, rendering) on worker threads.
+
+    The callbacks of a job (on_done, on_error, on_progress, on_cancel) are not
+    called on the worker thread but queued and run by poll(), which attach()
+    schedules on the Tk main loop with root.after, so they can safely touch
+    widgets. Jobs that share a key, e.g. writes to the same project, are
+    executed strictly one after another in the order they were submitted.
+    """
+
+    def __init__(self, max_workers=2):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="background-io")
+        self._lock = threading.Lock()
+        self._waiting = {}  # key -> deque of jobs queued behind the running job with that key
+        self._jobs = set()  # Jobs not finished yet.
+        self._callbacks = queue.SimpleQueue()  # (callback, args) to run on the GUI thread.
+        self._root = None
+        self._poll_interval = 50
+
+    # --- Submitting work ---
+
+    def submit(self, func, *args, key=None, on_done=None, on_error=None, on_progress=None, on_cancel=None):
+        # Run func(job, *args) on a worker thread and return the Job.
+        job = Job(self, func, args, key, on_done, on_error, on_progress, on_cancel)
+        with self._lock:
+            self._jobs.add(job)
+            if key is not None:
+                waiting = self._waiting.get(key)
+                if waiting is not None:
+                    # Another job with this key is running; start after it.
+                    waiting.append(job)
+                    return job
+                self._waiting[key] = deque()
+        self._pool.submit(self._run, job)
+        return job
+
+    def _run(self, job):
+        try:
+            job.check_cancelled()
+            result = job.func(job, *job.args)
+        except JobCancelled:
+            self._post(job.on_cancel)
+        except Exception as e:
+            if job.on_error is not None:
+                self._post(job.on_error, e)
+            else:
+                traceback.print_exception(type(e), e, e.__traceback__)
+        else:
+            self._post(job.on_done, result)
+        finally:
+            next_job = None
+            with self._lock:
+                self._jobs.discard(job)
+                if job.key is not None:
+                    waiting = self._waiting[job.key]
+                    if waiting:
+                        next_job = waiting.popleft()
+                    else:
+                        del self._waiting[job.key]
+            job._finished.set()
+            if next_job is not None:
+                self._pool.submit(self._run, next_job)
+
+    def cancel_all(self):
+        with self._lock:
+            jobs = list(self._jobs)
+        for job in jobs:
+            job.cancel()
+
+    @property
+    def busy(self):
+        with self._lock:
+            return bool(self._jobs)
+
+    def shutdown(self, cancel_pending=False):
+        # Wait until all submitted jobs have finished (optionally cancelling them
+        # first), then stop the worker threads. Queued callbacks are dropped.
+        if cancel_pending:
+            self.cancel_all()
+        while True:
+            with self._lock:
+                jobs = list(self._jobs)
+            if not jobs:
+                break
+            for job in jobs:
+                job.wait()
+        self._pool.shutdown(wait=True)
+
+    # --- Delivering results on the GUI thread ---
+
+    def _post(self, callback, *args):
+        if callback is not None:
+            self._callbacks.put((callback, args))
+
+    def poll(self):
+        # Run the callbacks queued so far; returns how many ran.
+        count = 0
+        while True:
+            try:
+                callback, args = self._callbacks.get_nowait()
+            except queue.Empty:
+                return count
+            callback(*args)
+            count += 1
+
+    def attach(self, root, interval=50):
+        # Poll for results every interval milliseconds on the Tk main loop of root.
+        self._root = root
+        self._poll_interval = interval
+        root.after(interval, self._poll_loop)
+
+    def _poll_loop(self):
+        try:
+            self.poll()
+        finally:
+            self._root.after(self._poll_interval, self._poll_loop)
@@ -0,0 +1,193 @@
+import os  # File paths, sizes and access times
+import json  # Cached pages and the digest memo
+import shutil  # Copying cached DOCX files
+import hashlib  # Content hashes
+import threading  # Thread id in temporary file names
+
+try:
+    import pymupdf  # PDF access (installed with pdf2docx)
+except ImportError:
+    import fitz as pymupdf  # Older PyMuPDF releases only have the "fitz" name
+
+from file_utils import DATA_DIR, atomic_write_text
+
+
+# Default cache location and size (the cache is only used when asked for).
+CACHE_DIR = os.path.join(DATA_DIR, "pdf_cache")
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+# Part of every key; bump it when the converter output or the stored page format changes.
+CACHE_VERSION = 1
+
+
+# Function to compute the SHA-256 of a file, reading it in blocks.
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Function to compute content hashes of single pages of a PDF.
+# Every page is copied into a one-page PDF on its own (without a random file
+# id), so a page gets the same digest in any document it appears in.
+def page_digests(pdf_file, page_numbers):
+    digests = {}
+    with pymupdf.open(pdf_file) as document:
+        for number in page_numbers:
+            single = pymupdf.open()
+            try:
+                single.insert_pdf(document, from_page=number, to_page=number)
+                digests[number] = hashlib.sha256(single.tobytes(garbage=3, no_new_id=True)).hexdigest()
+            finally:
+                single.close()
+    return digests
+
+
+# Function to get a temporary name next to path, unique per process and thread.
+# Files written there and then renamed over path keep the normal permissions
+# (tempfile.mkstemp would create them readable by the owner only).
+def temporary_path(path):
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, f".tmp-{os.getpid()}-{threading.get_ident()}-{name}")
+
+
+def _key(*parts):
+    text = json.dumps([CACHE_VERSION, *parts], sort_keys=True, default=str)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class ConversionCache:
+    """Content-addressed cache of PDF to DOCX conversion results.
+
+    Whole documents are cached under a key made from the PDF's content hash,
+    the converter settings and the page range, so an unchanged PDF is
+    converted once and later runs only copy (or hard-link) the stored DOCX.
+    Parsed pages are cached as well, keyed by the content hash of the single
+    page, so documents that share pages reuse that work. Entries are files
+    whose modification time is bumped on every hit; evict() removes the least
+    recently used ones once the cache is larger than max_bytes.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._documents_dir = os.path.join(cache_dir, "documents")
+        self._pages_dir = os.path.join(cache_dir, "pages")
+        self._digests_path = os.path.join(cache_dir, "digests.json")
+        os.makedirs(self._documents_dir, exist_ok=True)
+        os.makedirs(self._pages_dir, exist_ok=True)
+
+    # --- Keys ---
+
+    def pdf_digest(self, pdf_file):
+        # Content hash of a PDF. Remembered by path, size and modification time,
+        # so an unchanged file is not read again on the next run.
+        path = os.path.abspath(pdf_file)
+        stat = os.stat(path)
+        try:
+            with open(self._digests_path, "r") as file:
+                digests = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            digests = {}
+        entry = digests.get(path)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry["digest"]
+        digest = file_digest(path)
+        digests[path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "digest": digest}
+        atomic_write_text(self._digests_path, json.dumps(digests))
+        return digest
+
+    def document_key(self, pdf_file, settings=None, start=0, end=None):
+        return _key("document", self.pdf_digest(pdf_file), settings or {}, start, end)
+
+    def page_key(self, page_digest, settings=None):
+        return _key("page", page_digest, settings or {})
+
+    # --- Documents ---
+
+    def _document_path(self, key):
+        return os.path.join(self._documents_dir, key + ".docx")
+
+    def fetch_document(self, key, docx_file, link=False):
+        # Put the cached DOCX for key at docx_file; returns False on a miss.
+        cached = self._document_path(key)
+        try:
+            os.utime(cached)  # Mark as recently used.
+        except FileNotFoundError:
+            return False
+        tmp_path = temporary_path(docx_file)
+        try:
+            if link:
+                try:
+                    os.link(cached, tmp_path)
+                except OSError:
+                    # Different file system (or no hard links): fall back to a copy.
+                    shutil.copyfile(cached, tmp_path)
+            else:
+                shutil.copyfile(cached, tmp_path)
+            os.replace(tmp_path, docx_file)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return True
+
+    def store_document(self, key, docx_file):
+        tmp_path = temporary_path(self._document_path(key))
+        try:
+            shutil.copyfile(docx_file, tmp_path)
+            os.replace(tmp_path, self._document_path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    # --- Pages ---
+
+    def _page_path(self, key):
+        return os.path.join(self._pages_dir, key + ".json")
+
+    def fetch_page(self, key):
+        # The stored (pdf2docx Page.store()) form of a parsed page, or None.
+        path = self._page_path(key)
+        try:
+            with open(path, "r") as file:
+                data = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        try:
+            os.utime(path)  # Mark as recently used.
+        except FileNotFoundError:
+            pass  # Evicted by another process in the meantime.
+        return data
+
+    def store_page(self, key, data):
+        atomic_write_text(self._page_path(key), json.dumps(data, separators=(",", ":")))
+
+    # --- Size limit ---
+
+    def evict(self):
+        # Remove the least recently used entries until the cache fits into
+        # max_bytes. Returns the number of removed entries.
+        entries = []
+        total = 0
+        for directory in (self._documents_dir, self._pages_dir):
+            with os.scandir(directory) as scan:
+                for entry in scan:
+                    if entry.is_file() and not entry.name.startswith(".tmp-"):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                        total += stat.st_size
+        removed = 0
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
@@ -1,39 +1,757 @@
 import os
+import gc
+import glob
+import json
+import time
+import shutil
+import hashlib
+import logging
+import zipfile
+import argparse
+import posixpath
+import tkinter as tk
 from tkinter import Tk, filedialog
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from docx import Document
+from docx.opc.constants import RELATIONSHIP_TYPE
+from docx.oxml.ns import qn
+from lxml import etree
 from pdf2docx import Converter
+from pdf2docx.converter import ConversionException
 
-# Hide the main Tkinter window
-root = Tk()
-root.withdraw()
-
-# Open a file dialog to select the PDF file
-pdf_file = filedialog.askopenfilename(
-    title="Select PDF file", 
-    filetypes=[("PDF files", "*.pdf")]
-)
-
-# Ask for the output DOCX file path using a save dialog
-docx_file = filedialog.asksaveasfilename(
-    title="Save DOCX file as", 
-    defaultextension=".docx", 
-    filetypes=[("Word Documents", "*.docx")]
-)
-
-# Check if the user selected a file and proceed with conversion
-if not pdf_file:
-    print("No PDF file selected. Exiting...")
-elif not docx_file:
-    print("No output file path selected. Exiting...")
-else:
-    # Create a converter object and convert the PDF to DOCX
-    print(f"Converting {pdf_file} to {docx_file}...")
+from background_io import BackgroundExecutor
+from file_utils import atomic_write_text
+from conversion_cache import CACHE_DIR, MAX_CACHE_BYTES, ConversionCache, page_digests, temporary_path
+
+try:
+    import psutil  # Optional: memory usage on every platform
+except ImportError:
+    psutil = None
+
+
+# Large PDFs are split into ranges of this many pages, which are parsed in parallel.
+CHUNK_PAGES = 25
+
+# Streaming mode converts this many pages at a time.
+WINDOW_PAGES = 50
+# Streaming mode remembers its progress in this file next to the DOCX.
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+MIB = 1024 * 1024
+# Namespace of relationship references (images, hyperlinks) in document XML.
+RELATIONSHIP_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+# Files of a DOCX package that merge_parts() combines; the others come from the first part.
+DOCUMENT_XML = "word/document.xml"
+DOCUMENT_RELS = "word/_rels/document.xml.rels"
+CONTENT_TYPES = "[Content_Types].xml"
+PACKAGE_RELS_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+CONTENT_TYPES_NS = "{http://schemas.openxmlformats.org/package/2006/content-types}"
+COPY_CHUNK = 1024 * 1024
+
+
+# Function to convert a PDF file (or the pages start..end-1 of it) to a DOCX file.
+# Runs the pdf2docx steps one by one so that a background job can report the
+# progress per page and be cancelled between pages.
+def convert_pdf(pdf_file, docx_file, start=0, end=None, job=None, **settings):
+    converter = Converter(pdf_file)
+    try:
+        options = converter.default_settings
+        options.update(settings)
+        converter.load_pages(start, end).parse_document(**options)
+
+        pages = [page for page in converter.pages if not page.skip_parsing]
+        for number, page in enumerate(pages, start=1):
+            if job is not None:
+                job.check_cancelled()
+                job.report_progress(number - 1, len(pages), f"Converting page {page.id + 1}")
+            try:
+                page.parse(**options)
+            except Exception as e:
+                # Same rule as Converter.parse_pages: skip broken pages unless asked not to.
+                if options["raw_exceptions"]:
+                    raise
+                if options["debug"] or not options["ignore_page_error"]:
+                    raise ConversionException(f"Error when parsing page {page.id + 1}: {e}")
+                logging.error("Ignore page %d due to parsing page error: %s", page.id + 1, e)
+
+        if job is not None:
+            job.check_cancelled()
+            job.report_progress(len(pages), len(pages), "Writing the DOCX file")
+        converter.make_docx(docx_file, **options)
+        return len(pages)
+    finally:
+        converter.close()
+
+
+# ---------------------------
+# Batch conversion
+# ---------------------------
+
+# Function to expand the command line arguments (files, directories or glob
+# patterns) into a sorted list of PDF files. Directories are searched recursively.
+def find_pdfs(paths):
+    pdf_files = set()
+    for path in paths:
+        if os.path.isdir(path):
+            pdf_files.update(glob.glob(os.path.join(glob.escape(path), "**", "*.pdf"), recursive=True))
+        elif os.path.isfile(path):
+            pdf_files.add(path)
+        else:
+            pdf_files.update(match for match in glob.glob(path, recursive=True) if match.lower().endswith(".pdf"))
+    return sorted(pdf_files)
+
+
+# Function to build the output path of a PDF: next to it, or in output_dir.
+def docx_path_for(pdf_file, output_dir=None):
+    base_name = os.path.splitext(os.path.basename(pdf_file))[0] + ".docx"
+    return os.path.join(output_dir or os.path.dirname(pdf_file), base_name)
+
+
+# Function to check whether the DOCX of a PDF exists and is newer than the PDF.
+def is_up_to_date(pdf_file, docx_file):
+    try:
+        return os.path.getmtime(docx_file) >= os.path.getmtime(pdf_file)
+    except FileNotFoundError:
+        return False
+
+
+def count_pages(pdf_file):
+    converter = Converter(pdf_file)
+    try:
+        return len(converter.fitz_doc)
+    finally:
+        converter.close()
+
+
+# Function to split the pages 0..page_count-1 into (start, end) ranges of at most chunk_pages pages.
+def page_ranges(page_count, chunk_pages=CHUNK_PAGES):
+    return [(start, min(start + chunk_pages, page_count)) for start in range(0, page_count, chunk_pages)]
+
+
+# Function run once in every worker process: keep pdf2docx from logging every page.
+def _init_worker():
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+# Function run in a worker process to parse one page range of a PDF.
+# Returns when the work started and the parsed pages in pdf2docx's stored
+# (plain dict) form, which the main process restores to build the DOCX;
+# this is how pdf2docx's own multi_processing mode hands pages back, too.
+# With a cache directory, pages whose content was parsed before (in any
+# document) are taken from the page cache and only the others are parsed.
+def _parse_page_range(pdf_file, start, end, settings, cache_dir=None):
+    started = time.time()
+    stored = {}
+    page_keys = {}
+    cache = None
+    if cache_dir:
+        cache = ConversionCache(cache_dir)
+        for number, digest in page_digests(pdf_file, range(start, end)).items():
+            page_keys[number] = cache.page_key(digest, settings)
+            data = cache.fetch_page(page_keys[number])
+            if data is not None:
+                data["id"] = number  # The cached page may come from another position or document.
+                stored[number] = data
+    missing = [number for number in range(start, end) if number not in stored]
+    if missing:
+        converter = Converter(pdf_file)
+        try:
+            options = converter.default_settings
+            options.update(settings)
+            converter.parse(pages=missing, **options)
+            for page in converter.pages:
+                if page.finalized:
+                    stored[page.id] = page.store()
+                    if cache is not None:
+                        cache.store_page(page_keys[page.id], stored[page.id])
+        finally:
+            converter.close()
+    return started, [stored[number] for number in sorted(stored)]
+
+
+# Function to build the DOCX file from parsed pages.
+# The file is written under a temporary name and renamed when complete, so an
+# interrupted run never leaves a DOCX that looks up to date.
+def write_docx(pdf_file, docx_file, stored_pages, settings):
+    converter = Converter(pdf_file)
+    try:
+        options = converter.default_settings
+        options.update(settings)
+        converter.load_pages()
+        converter.restore({"pages": stored_pages})
+        tmp_path = temporary_path(docx_file)
+        try:
+            converter.make_docx(tmp_path, **options)
+            os.replace(tmp_path, docx_file)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    finally:
+        converter.close()
+
+
+# Function to take the DOCX of a PDF from the conversion cache, if it is there.
+# Returns the cache key of the document (None without a cache) and whether it was a hit.
+def fetch_from_cache(cache, pdf_file, docx_file, settings, link=False):
+    if cache is None:
+        return None, False
+    started = time.perf_counter()
+    key = cache.document_key(pdf_file, settings)
+    if not cache.fetch_document(key, docx_file, link):
+        return key, False
+    print(f"{pdf_file} -> {docx_file}: from cache ({(time.perf_counter() - started) * 1000:.0f} ms)")
+    return key, True
+
+
+def convert_batch(pdf_files, output_dir=None, workers=None, chunk_pages=CHUNK_PAGES, force=False, settings=None,
+                  cache=None, link=False):
+    # Convert many PDFs with a bounded pool of worker processes. Every file is
+    # split into page ranges, so several files and the ranges of one large file
+    # are parsed at the same time. Files whose DOCX is up to date are skipped.
+    # With a ConversionCache, unchanged documents are copied (or hard-linked
+    # with link=True) from the cache and known pages are not parsed again.
+    # Returns the lists of converted, skipped and failed PDF files.
+    settings = settings or {}
+    cache_dir = cache.cache_dir if cache is not None else None
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    converted, skipped, failed = [], [], []
+    jobs = {}  # pdf file -> {"docx", "pages", "remaining", "started", "stored"}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        futures = {}
+        for pdf_file in pdf_files:
+            docx_file = docx_path_for(pdf_file, output_dir)
+            if not force and is_up_to_date(pdf_file, docx_file):
+                skipped.append(pdf_file)
+                continue
+            try:
+                key, hit = fetch_from_cache(cache, pdf_file, docx_file, settings, link)
+                if hit:
+                    converted.append(pdf_file)
+                    continue
+                page_count = count_pages(pdf_file)
+            except Exception as e:
+                print(f"{pdf_file}: cannot open: {e}")
+                failed.append(pdf_file)
+                continue
+            ranges = page_ranges(page_count, chunk_pages)
+            if not ranges:
+                print(f"{pdf_file}: no pages")
+                failed.append(pdf_file)
+                continue
+            jobs[pdf_file] = {"docx": docx_file, "pages": page_count, "remaining": len(ranges),
+                              "started": None, "stored": [], "error": None, "key": key}
+            for start, end in ranges:
+                futures[executor.submit(_parse_page_range, pdf_file, start, end, settings, cache_dir)] = pdf_file
+
+        for future in as_completed(futures):
+            pdf_file = futures[future]
+            job = jobs[pdf_file]
+            job["remaining"] -= 1
+            try:
+                started, stored_pages = future.result()
+                job["started"] = started if job["started"] is None else min(job["started"], started)
+                job["stored"].extend(stored_pages)
+            except Exception as e:
+                job["error"] = e
+            if job["remaining"]:
+                continue
+
+            # All ranges of this file are parsed: write its DOCX.
+            del jobs[pdf_file]
+            try:
+                if job["error"] is not None:
+                    raise job["error"]
+                write_docx(pdf_file, job["docx"], job["stored"], settings)
+                if job["key"] is not None:
+                    cache.store_document(job["key"], job["docx"])
+            except Exception as e:
+                # One broken file should not stop the others.
+                print(f"{pdf_file}: conversion failed: {e}")
+                failed.append(pdf_file)
+                continue
+            elapsed = time.time() - job["started"]
+            print(f"{pdf_file} -> {job['docx']}: {job['pages']} pages in {elapsed:.1f} s "
+                  f"({job['pages'] / max(elapsed, 1e-9):.1f} pages/s)")
+            converted.append(pdf_file)
+    if cache is not None:
+        cache.evict()
+    return converted, skipped, failed
+
+
+# ---------------------------
+# Streaming conversion
+# ---------------------------
+
+class MemoryLimitExceeded(Exception):
+    """The conversion cannot continue within the configured memory limit."""
+
+
+# Function to get the resident memory of this process in MiB, or None if unknown.
+def current_memory_mb():
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / MIB
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / MIB
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def load_checkpoint(checkpoint_path):
+    try:
+        with open(checkpoint_path, "r") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+# Function to save the pages of one window as a DOCX part and record the
+# progress. The part is written before the checkpoint names it, so a crash at
+# any moment leaves a consistent pair behind. Only the new window is written,
+# so the checkpoints of a whole file cost O(pages) I/O in total.
+def save_checkpoint(document, docx_file, source, next_page, parts):
+    if document is not None:
+        part = os.path.abspath(f"{docx_file}.part-{next_page}.docx")
+        document.save(part)
+        parts = parts + [part]
+    atomic_write_text(docx_file + CHECKPOINT_SUFFIX, json.dumps({"source": source, "next_page": next_page, "parts": parts}))
+    return parts
+
+
+# Function to remove the part files of an (old) checkpoint.
+def remove_parts(parts):
+    for part in parts:
+        if os.path.exists(part):
+            os.remove(part)
 
+
+# Function to copy one file of a zip archive into another under a new name,
+# a chunk at a time.
+def copy_zip_entry(source, info, target, name):
+    target_info = zipfile.ZipInfo(name, info.date_time)
+    target_info.compress_type = info.compress_type
+    with source.open(info) as reader, target.open(target_info, "w", force_zip64=True) as writer:
+        shutil.copyfileobj(reader, writer, COPY_CHUNK)
+
+
+# Function to hash one file of a zip archive, a chunk at a time.
+def zip_entry_digest(archive, name):
+    digest = hashlib.sha1()
+    with archive.open(name) as reader:
+        for chunk in iter(lambda: reader.read(COPY_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Function to turn the target of a document relationship into its name in the package.
+def package_name(target):
+    if target.startswith("/"):
+        return target[1:]
+    return posixpath.normpath(posixpath.join("word", target))
+
+
+def xml_bytes(element):
+    return etree.tostring(element, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+class _PackageMerger:
+    """Relationships, images and content types of a DOCX merged from parts.
+
+    Starts with those of the first part. add_part() maps the relationship
+    ids of a later part to ids of the merged document: images are copied
+    into the merged package (equal images once), links are added (equal links
+    once), and the styles, numbering etc. of the python-docx template, which
+    every part has, are taken to be the first part's.
+    """
+
+    def __init__(self, first, merged):
+        self.merged = merged
+        self.rels = etree.fromstring(first.read(DOCUMENT_RELS))
+        self.content_types = etree.fromstring(first.read(CONTENT_TYPES))
+        self.names = set(first.namelist())
+        self.shared = {}  # (type, target, external) -> relationship id
+        self.images = {}  # Content digest -> relationship id
+        self.next_id = 1
+        for relationship in self.rels:
+            r_id = relationship.get("Id")
+            if r_id.startswith("rId") and r_id[3:].isdigit():
+                self.next_id = max(self.next_id, int(r_id[3:]) + 1)
+            rel_type, target = relationship.get("Type"), relationship.get("Target")
+            external = relationship.get("TargetMode") == "External"
+            self.shared[(rel_type, target, external)] = r_id
+            if rel_type == RELATIONSHIP_TYPE.IMAGE and not external:
+                self.images.setdefault(zip_entry_digest(first, package_name(target)), r_id)
+
+    def add_part(self, part):
+        mapping = {}
+        part_types = etree.fromstring(part.read(CONTENT_TYPES))
+        for relationship in etree.fromstring(part.read(DOCUMENT_RELS)):
+            rel_type, target = relationship.get("Type"), relationship.get("Target")
+            external = relationship.get("TargetMode") == "External"
+            if rel_type == RELATIONSHIP_TYPE.IMAGE and not external:
+                name = package_name(target)
+                digest = zip_entry_digest(part, name)
+                if digest not in self.images:
+                    self.images[digest] = self._relate(rel_type, self._copy_image(part, part_types, name))
+                mapping[relationship.get("Id")] = self.images[digest]
+                continue
+            key = (rel_type, target, external)
+            if key not in self.shared:
+                if not external:
+                    raise ConversionException(f"Cannot merge {part.filename}: unexpected relationship to {target}")
+                self.shared[key] = self._relate(rel_type, target, external)
+            mapping[relationship.get("Id")] = self.shared[key]
+        return mapping
+
+    def _relate(self, rel_type, target, external=False):
+        r_id = f"rId{self.next_id}"
+        self.next_id += 1
+        relationship = etree.SubElement(self.rels, PACKAGE_RELS_NS + "Relationship", Id=r_id, Type=rel_type, Target=target)
+        if external:
+            relationship.set("TargetMode", "External")
+        return r_id
+
+    def _copy_image(self, part, part_types, name):
+        # Copy an image under a name not used yet; returns its relationship target.
+        extension = posixpath.splitext(name)[1]
+        number = 1
+        while f"word/media/image{number}{extension}" in self.names:
+            number += 1
+        new_name = f"word/media/image{number}{extension}"
+        self.names.add(new_name)
+        copy_zip_entry(part, part.getinfo(name), self.merged, new_name)
+        # Register its content type, unless it is already covered by the extension.
+        for override in part_types.iter(CONTENT_TYPES_NS + "Override"):
+            if override.get("PartName") == "/" + name:
+                etree.SubElement(self.content_types, CONTENT_TYPES_NS + "Override",
+                                 PartName="/" + new_name, ContentType=override.get("ContentType"))
+                break
+        else:
+            known = {default.get("Extension").lower() for default in self.content_types.iter(CONTENT_TYPES_NS + "Default")}
+            for default in part_types.iter(CONTENT_TYPES_NS + "Default"):
+                if default.get("Extension").lower() == extension[1:].lower() and extension[1:].lower() not in known:
+                    etree.SubElement(self.content_types, CONTENT_TYPES_NS + "Default",
+                                     Extension=default.get("Extension"), ContentType=default.get("ContentType"))
+        return posixpath.relpath(new_name, "word")
+
+
+# Function to write the bodies of the parts one after another into a single
+# document.xml. Only one part's XML is in memory at a time. Every part but the
+# last ends with a section break that keeps its page size and margins (as
+# every converted page starts a new section); the last part's page setup
+# ends the document.
+def write_merged_body(output, parts, mappings):
+    first_namespaces = None
+    for number, (part, mapping) in enumerate(zip(parts, mappings)):
+        with zipfile.ZipFile(part) as archive, archive.open(DOCUMENT_XML) as reader:
+            root = etree.parse(reader).getroot()
+        body = root.find(qn("w:body"))
+        for node in body.iter():
+            for name, value in node.attrib.items():
+                if name.startswith(RELATIONSHIP_NS) and value in mapping:
+                    node.set(name, mapping[value])
+        sect_pr = body.find(qn("w:sectPr"))
+        if number < len(parts) - 1 and sect_pr is not None:
+            body.remove(sect_pr)
+            paragraph = etree.SubElement(body, qn("w:p"))
+            etree.SubElement(paragraph, qn("w:pPr")).append(sect_pr)
+        # The body is cut out of the serialized part, so its elements are
+        # written without repeating the namespace declarations of the root.
+        text = xml_bytes(root)
+        body_tag = f"<{root.prefix}:body" if root.prefix else "<body"
+        start = text.index(b">", text.index(body_tag.encode())) + 1
+        end = text.rindex(b"</", 0, text.rindex(b"</"))
+        if number == 0:
+            output.write(text[:start])
+            first_namespaces = root.nsmap
+        if root.nsmap == first_namespaces:
+            output.write(text[start:end])
+        else:
+            for element in body:
+                output.write(etree.tostring(element))
+        if number == len(parts) - 1:
+            output.write(text[end:])
+
+
+# Function to join the DOCX parts of a streaming conversion into docx_file.
+# The merge works on the packages: images are copied across a chunk at a time
+# and each part's document XML is parsed on its own, so memory use depends on
+# the largest part (one window), not on the number of pages.
+def merge_parts(parts, docx_file):
+    tmp_path = temporary_path(docx_file)
     try:
-        # Create the converter and handle the conversion
-        cv = Converter(pdf_file)
-        cv.convert(docx_file, start=0, end=None)
-        cv.close()
-        
+        with zipfile.ZipFile(parts[0]) as first, zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as merged:
+            for info in first.infolist():
+                if info.filename not in (DOCUMENT_XML, DOCUMENT_RELS, CONTENT_TYPES):
+                    copy_zip_entry(first, info, merged, info.filename)
+            package = _PackageMerger(first, merged)
+            mappings = [{}]
+            for part in parts[1:]:
+                with zipfile.ZipFile(part) as archive:
+                    mappings.append(package.add_part(archive))
+            merged.writestr(CONTENT_TYPES, xml_bytes(package.content_types))
+            merged.writestr(DOCUMENT_RELS, xml_bytes(package.rels))
+            with merged.open(DOCUMENT_XML, "w", force_zip64=True) as output:
+                write_merged_body(output, parts, mappings)
+        os.replace(tmp_path, docx_file)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# Function to convert a PDF in fixed-size page windows, for documents too large
+# to parse at once. Each window is parsed by a fresh Converter, written to a
+# DOCX part file of its own and freed before the next one, so memory use during
+# parsing depends on the window size, not on the page count. After every window
+# the progress is checkpointed; a later call with resume=True continues after
+# the last finished window. At the end the parts are merged into the DOCX,
+# which also holds only one part in memory at a time (see merge_parts).
+# With memory_limit_mb, the window is halved whenever a window used more than
+# that, and the conversion stops (resumably) if even a freed process does not
+# fit any more. The limit is checked per window; the merge is not checked, as
+# it needs no more memory than converting the largest window did.
+def convert_streaming(pdf_file, docx_file, window_pages=WINDOW_PAGES, memory_limit_mb=None, resume=True,
+                      settings=None, job=None):
+    settings = settings or {}
+    checkpoint_path = docx_file + CHECKPOINT_SUFFIX
+    stat = os.stat(pdf_file)
+    # A checkpoint is only used for the same PDF, unchanged, with the same settings.
+    source = {"pdf": os.path.abspath(pdf_file), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "settings": settings}
+
+    checkpoint = load_checkpoint(checkpoint_path)
+    if (resume and checkpoint and checkpoint["source"] == source and "parts" in checkpoint
+            and all(os.path.exists(part) for part in checkpoint["parts"])):
+        next_page, parts = checkpoint["next_page"], checkpoint["parts"]
+        logging.info("Resuming %s at page %d", pdf_file, next_page + 1)
+    else:
+        if checkpoint:
+            remove_parts(checkpoint.get("parts", []))  # Left over from a different or changed PDF.
+        next_page, parts = 0, []
+
+    page_count = count_pages(pdf_file)
+    window = max(1, window_pages)
+    while next_page < page_count:
+        if job is not None:
+            job.check_cancelled()
+            job.report_progress(next_page, page_count, "Converting pages")
+        end = min(next_page + window, page_count)
+        document = Document()
+        made = 0
+        converter = Converter(pdf_file)
+        try:
+            options = converter.default_settings
+            options.update(settings)
+            converter.parse(next_page, end, **options)
+            for page in converter.pages:
+                if not page.finalized:
+                    continue
+                try:
+                    page.make_docx(document)
+                    made += 1
+                except Exception as e:
+                    # Same rule as Converter.make_docx: skip broken pages unless asked not to.
+                    if options["raw_exceptions"] or options["debug"] or not options["ignore_page_error"]:
+                        raise
+                    logging.error("Ignore page %d due to making page error: %s", page.id + 1, e)
+            window_memory = current_memory_mb()
+        finally:
+            converter.close()
+        # Drop the parsed pages of this window before starting the next one.
+        del converter
+        gc.collect()
+
+        next_page = end
+        parts = save_checkpoint(document if made else None, docx_file, source, next_page, parts)
+        del document
+
+        if memory_limit_mb and window_memory is not None and window_memory > memory_limit_mb:
+            memory = current_memory_mb()
+            if window == 1 or memory > memory_limit_mb:
+                raise MemoryLimitExceeded(
+                    f"{pdf_file}: {memory:.0f} MiB in use after page {next_page}, limit is {memory_limit_mb} MiB; "
+                    f"run again with a higher limit to resume")
+            window = max(1, window // 2)
+            logging.warning("%s: window used %.0f MiB, continuing with %d pages per window",
+                            pdf_file, window_memory, window)
+
+    if not parts:
+        raise ConversionException(f"{pdf_file} has no pages.")
+    if job is not None:
+        job.report_progress(page_count, page_count, "Writing the DOCX file")
+    merge_parts(parts, docx_file)
+    os.remove(checkpoint_path)
+    remove_parts(parts)
+    return page_count
+
+
+# Function run in a worker process to stream-convert one whole file.
+def _stream_file(pdf_file, docx_file, window_pages, memory_limit_mb, settings):
+    started = time.time()
+    page_count = convert_streaming(pdf_file, docx_file, window_pages, memory_limit_mb, settings=settings)
+    return started, page_count
+
+
+def convert_batch_streaming(pdf_files, output_dir=None, workers=None, window_pages=WINDOW_PAGES,
+                            memory_limit_mb=None, force=False, settings=None, cache=None, link=False):
+    # Like convert_batch, but every file is converted in page windows by one
+    # worker (several files at once), with resumable checkpoints. The cache is
+    # used for whole documents only.
+    settings = settings or {}
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    converted, skipped, failed = [], [], []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        futures = {}
+        for pdf_file in pdf_files:
+            docx_file = docx_path_for(pdf_file, output_dir)
+            if not force and is_up_to_date(pdf_file, docx_file):
+                skipped.append(pdf_file)
+                continue
+            try:
+                key, hit = fetch_from_cache(cache, pdf_file, docx_file, settings, link)
+            except OSError as e:
+                print(f"{pdf_file}: cannot read: {e}")
+                failed.append(pdf_file)
+                continue
+            if hit:
+                converted.append(pdf_file)
+                continue
+            futures[executor.submit(_stream_file, pdf_file, docx_file, window_pages, memory_limit_mb, settings)] = (
+                pdf_file, docx_file, key)
+        for future in as_completed(futures):
+            pdf_file, docx_file, key = futures[future]
+            try:
+                started, page_count = future.result()
+                if key is not None:
+                    cache.store_document(key, docx_file)
+            except Exception as e:
+                print(f"{pdf_file}: conversion failed: {e}")
+                failed.append(pdf_file)
+                continue
+            elapsed = time.time() - started
+            print(f"{pdf_file} -> {docx_file}: {page_count} pages in {elapsed:.1f} s "
+                  f"({page_count / max(elapsed, 1e-9):.1f} pages/s)")
+            converted.append(pdf_file)
+    if cache is not None:
+        cache.evict()
+    return converted, skipped, failed
+
+
+# ---------------------------
+# Interactive conversion
+# ---------------------------
+
+def convert_with_dialog():
+    # Hide the main Tkinter window
+    root = Tk()
+    root.withdraw()
+
+    # Open a file dialog to select the PDF file
+    pdf_file = filedialog.askopenfilename(
+        title="Select PDF file",
+        filetypes=[("PDF files", "*.pdf")]
+    )
+
+    # Ask for the output DOCX file path using a save dialog
+    docx_file = filedialog.asksaveasfilename(
+        title="Save DOCX file as",
+        defaultextension=".docx",
+        filetypes=[("Word Documents", "*.docx")]
+    )
+
+    # Check if the user selected a file and proceed with conversion
+    if not pdf_file:
+        print("No PDF file selected. Exiting...")
+        return
+    if not docx_file:
+        print("No output file path selected. Exiting...")
+        return
+
+    print(f"Converting {pdf_file} to {docx_file}...")
+
+    # Show a small progress window while the conversion runs on a worker thread,
+    # so the window stays responsive and the conversion can be cancelled.
+    window = tk.Toplevel(root)
+    window.title("Converting PDF to DOCX")
+    status = tk.Label(window, text=f"Converting {os.path.basename(pdf_file)}...", width=50)
+    status.pack(padx=10, pady=10)
+    executor = BackgroundExecutor(max_workers=1)
+    started = time.perf_counter()
+
+    def on_progress(done, total, message):
+        status.config(text=f"{message} ({done}/{total})")
+
+    def on_done(page_count):
+        elapsed = time.perf_counter() - started
         print(f"Conversion complete! Your DOCX file has been saved to: {docx_file}")
-    except Exception as e:
-        print(f"An error occurred during conversion: {e}")
+        print(f"{page_count} page(s) in {elapsed:.1f} s")
+        root.quit()
+
+    def on_error(error):
+        print(f"An error occurred during conversion: {error}")
+        root.quit()
+
+    def on_cancel():
+        print("Conversion cancelled.")
+        root.quit()
+
+    job = executor.submit(lambda job: convert_pdf(pdf_file, docx_file, job=job), on_done=on_done,
+                          on_error=on_error, on_progress=on_progress, on_cancel=on_cancel)
+    tk.Button(window, text="Cancel", command=job.cancel).pack(pady=(0, 10))
+    window.protocol("WM_DELETE_WINDOW", job.cancel)
+    executor.attach(root)
+    root.mainloop()
+    executor.shutdown(cancel_pending=True)
+    root.destroy()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert PDF files to DOCX. Without arguments, the files are picked in a dialog.")
+    parser.add_argument("paths", nargs="*", help="PDF files, directories (searched recursively) or glob patterns")
+    parser.add_argument("-o", "--output-dir", default=None, help="directory for the DOCX files (default: next to each PDF)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="number of worker processes (default: CPU count)")
+    parser.add_argument("--chunk-pages", type=int, default=CHUNK_PAGES,
+                        help="pages per parallel work unit (default: %(default)s)")
+    parser.add_argument("-f", "--force", action="store_true", help="convert even if the DOCX is up to date")
+    parser.add_argument("--stream", action="store_true",
+                        help="convert each file in page windows with bounded memory and resumable checkpoints")
+    parser.add_argument("--window-pages", type=int, default=WINDOW_PAGES,
+                        help="pages per window in streaming mode (default: %(default)s)")
+    parser.add_argument("--memory-limit", type=float, default=None, metavar="MB",
+                        help="memory ceiling per worker in streaming mode")
+    parser.add_argument("--cache", action="store_true",
+                        help="reuse earlier conversions of unchanged documents and pages from a disk cache")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="conversion cache directory (default: %(default)s)")
+    parser.add_argument("--cache-size", type=float, default=MAX_CACHE_BYTES / MIB, metavar="MB",
+                        help="size limit of the conversion cache (default: %(default).0f)")
+    parser.add_argument("--link", action="store_true", help="hard-link cached DOCX files instead of copying them")
+    args = parser.parse_args()
+
+    if not args.paths:
+        convert_with_dialog()
+        return
+
+    logging.getLogger().setLevel(logging.WARNING)
+    pdf_files = find_pdfs(args.paths)
+    if not pdf_files:
+        print("No PDF files found.")
+        return
+    started = time.perf_counter()
+    cache = ConversionCache(args.cache_dir, int(args.cache_size * MIB)) if args.cache else None
+    if args.stream:
+        converted, skipped, failed = convert_batch_streaming(pdf_files, args.output_dir, args.workers, args.window_pages,
+                                                             args.memory_limit, args.force, cache=cache, link=args.link)
+    else:
+        converted, skipped, failed = convert_batch(pdf_files, args.output_dir, args.workers, args.chunk_pages, args.force,
+                                                   cache=cache, link=args.link)
+    print(f"Converted {len(converted)} file(s), skipped {len(skipped)} up-to-date, {len(failed)} failed "
+          f"in {time.perf_counter() - started:.1f} s.")
+
+
+if __name__ == "__main__":
+    main()
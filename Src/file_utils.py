@@ -0,0 +1,27 @@
+import os  # File paths and atomic os.replace()
+import tempfile  # Temporary files for atomic writes
+
+
+# Data directory shared by the scripts (data/ next to Src/).
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+
+
+# Function to write text to a file atomically.
+# The data goes to a temporary file in the same directory first, which is then
+# renamed over the target, so readers never see a half-written file.
+def atomic_write_text(path, text):
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=os.path.basename(path), dir=directory)
+    try:
+        with os.fdopen(fd, "w") as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,293 @@
+import io  # Rendering charts into memory
+import json  # Response bodies (hashed for the ETag)
+import hashlib  # ETags of response bodies
+import argparse  # Command line options
+import threading  # Chart cache lock and render lock
+from collections import OrderedDict  # LRU order of the cached charts
+from datetime import datetime  # ISO 8601 range parameters
+
+from flask import Flask, Response, jsonify, request
+
+from project_store import open_store
+from project_task import Task, datetime_to_minutes, format_minutes, tasks_digest
+
+
+# Chart formats the API renders, with their content types.
+CHART_FORMATS = {"png": "image/png", "svg": "image/svg+xml"}
+DEFAULT_DPI = 100
+MAX_DPI = 300
+
+
+class ChartCache:
+    """Rendered chart images, keyed by project, content digest, format and dpi.
+
+    A chart is rendered once per project content; requests for the same
+    chart while it is being rendered wait for that render instead of starting
+    their own. Entries of a project are dropped when the project is changed
+    through the API (changes made elsewhere change the digest, so stale
+    entries are never served either), and the least recently used ones are
+    dropped once more than max_entries are cached.
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._images = OrderedDict()  # key -> bytes
+        self._rendering = {}  # key -> Event set when the render has finished
+        self.hits = 0
+        self.renders = 0
+
+    def get(self, key, render):
+        while True:
+            with self._lock:
+                image = self._images.get(key)
+                if image is not None:
+                    self._images.move_to_end(key)
+                    self.hits += 1
+                    return image
+                event = self._rendering.get(key)
+                if event is None:
+                    event = self._rendering[key] = threading.Event()
+                    break
+            event.wait()  # Someone else renders it; then look again.
+        try:
+            image = render()
+            with self._lock:
+                self.renders += 1
+                self._images[key] = image
+                while len(self._images) > self.max_entries:
+                    self._images.popitem(last=False)
+            return image
+        finally:
+            with self._lock:
+                del self._rendering[key]
+            event.set()
+
+    def invalidate(self, project_name):
+        with self._lock:
+            for key in [key for key in self._images if key[0] == project_name]:
+                del self._images[key]
+
+    def clear(self):
+        with self._lock:
+            self._images.clear()
+
+
+# matplotlib is not thread-safe; charts are built and saved one at a time.
+_render_lock = threading.Lock()
+
+
+# Function to render the Gantt chart of a list of tasks to PNG or SVG bytes.
+def render_chart(project_name, tasks, file_format, dpi):
+    from gantt_plot import build_gantt_figure  # Imported on first use: loads matplotlib
+    with _render_lock:
+        fig = build_gantt_figure(project_name, tasks)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=file_format, dpi=dpi)
+    return buffer.getvalue()
+
+
+# Function to turn a range parameter into the "dd.mm.yyyy HH:MM" format of the
+# store. Both that format and ISO 8601 ("2024-01-31T08:00") are accepted.
+def parse_time_parameter(text):
+    try:
+        return format_minutes(datetime_to_minutes(datetime.fromisoformat(text)))
+    except ValueError:
+        datetime.strptime(text, "%d.%m.%Y %H:%M")  # Raises ValueError if this does not fit either.
+        return text
+
+
+def _error(status, message):
+    response = jsonify({"error": message})
+    response.status_code = status
+    return response
+
+
+# Function to build a JSON response whose ETag is the hash of its body, so a
+# client that already has this exact content gets a 304 without a body.
+def _json_with_etag(data):
+    body = json.dumps(data)
+    response = Response(body, mimetype="application/json")
+    response.set_etag(hashlib.blake2b(body.encode(), digest_size=16).hexdigest())
+    return response.make_conditional(request)
+
+
+def create_app(store=None, chart_cache=None):
+    """Create the Flask app serving the projects of store (default: open_store()).
+
+    Reads can run concurrently on the threads of the server: the stores lock
+    internally and hand out copies of their task lists. Charts are rendered
+    with the Agg/SVG backends and cached in chart_cache.
+    """
+    app = Flask(__name__)
+    store = store if store is not None else open_store()
+    charts = chart_cache if chart_cache is not None else ChartCache()
+    app.extensions["gantt_store"] = store
+    app.extensions["gantt_charts"] = charts
+
+    # --- Projects ---
+
+    @app.get("/api/projects")
+    def list_projects():
+        return _json_with_etag({"projects": store.project_names()})
+
+    @app.post("/api/projects")
+    def add_project():
+        data = request.get_json(silent=True) or {}
+        project_name = data.get("name")
+        if not isinstance(project_name, str) or not project_name:
+            return _error(400, "Expected a JSON body with a non-empty \"name\".")
+        if "/" in project_name:
+            # The name is a single path segment in the URLs below.
+            return _error(400, "Project names cannot contain \"/\".")
+        if not store.add_project(project_name):
+            return _error(409, f"Project {project_name!r} already exists.")
+        return jsonify({"name": project_name}), 201
+
+    @app.get("/api/projects/<project_name>")
+    def get_project(project_name):
+        if not store.has_project(project_name):
+            return _error(404, f"No project {project_name!r}.")
+        tasks = store.get_sorted_tasks(project_name)
+        data = {"name": project_name, "tasks": len(tasks), "digest": store.project_digest(project_name)}
+        if tasks:
+            data["start"] = tasks[0].start_text
+            data["end"] = format_minutes(max(task.end for task in tasks))
+        return _json_with_etag(data)
+
+    @app.delete("/api/projects/<project_name>")
+    def delete_project(project_name):
+        if not store.delete_project(project_name):
+            return _error(404, f"No project {project_name!r}.")
+        charts.invalidate(project_name)
+        return "", 204
+
+    # --- Tasks ---
+
+    @app.get("/api/projects/<project_name>/tasks")
+    def list_tasks(project_name):
+        # All tasks ordered by start time; with start and/or end only those
+        # active at some point in that range.
+        if not store.has_project(project_name):
+            return _error(404, f"No project {project_name!r}.")
+        start, end = request.args.get("start"), request.args.get("end")
+        if start is None and end is None:
+            tasks = store.get_sorted_tasks(project_name)
+        else:
+            try:
+                start = parse_time_parameter(start) if start else format_minutes(0)
+                end = parse_time_parameter(end) if end else "31.12.9999 23:59"
+            except ValueError:
+                return _error(400, "start and end must be \"dd.mm.yyyy HH:MM\" or ISO 8601.")
+            tasks = store.tasks_in_range(project_name, start, end)
+        return _json_with_etag({"project": project_name, "tasks": [task.to_dict() for task in tasks]})
+
+    def task_from_request():
+        data = request.get_json(silent=True) or {}
+        try:
+            return Task.from_strings(data["task"], data["start"], data["end"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    # The mutations below do not check first and then act: another request
+    # may delete the project or task in between. The store raises KeyError
+    # instead, and the task passed to it comes back with its id set.
+
+    @app.post("/api/projects/<project_name>/tasks")
+    def add_task(project_name):
+        task = task_from_request()
+        if task is None:
+            return _error(400, "Expected a JSON body with \"task\", \"start\" and \"end\" (dd.mm.yyyy HH:MM).")
+        try:
+            store.add_task(project_name, task)
+        except KeyError:
+            return _error(404, f"No project {project_name!r}.")
+        charts.invalidate(project_name)
+        return jsonify(task.to_dict()), 201
+
+    @app.get("/api/projects/<project_name>/tasks/<int:task_id>")
+    def get_task(project_name, task_id):
+        task = store.get_task(project_name, task_id)
+        if task is None:
+            return _error(404, f"No task {task_id} in project {project_name!r}.")
+        return _json_with_etag(task.to_dict())
+
+    @app.put("/api/projects/<project_name>/tasks/<int:task_id>")
+    def edit_task(project_name, task_id):
+        task = task_from_request()
+        if task is None:
+            return _error(400, "Expected a JSON body with \"task\", \"start\" and \"end\" (dd.mm.yyyy HH:MM).")
+        try:
+            store.edit_task(project_name, task_id, task)
+        except KeyError:
+            return _error(404, f"No task {task_id} in project {project_name!r}.")
+        charts.invalidate(project_name)
+        return jsonify(task.to_dict())
+
+    @app.delete("/api/projects/<project_name>/tasks/<int:task_id>")
+    def delete_task(project_name, task_id):
+        try:
+            store.delete_task(project_name, task_id)
+        except KeyError:
+            return _error(404, f"No task {task_id} in project {project_name!r}.")
+        charts.invalidate(project_name)
+        return "", 204
+
+    # --- Charts ---
+
+    @app.get("/api/projects/<project_name>/chart.<file_format>")
+    def get_chart(project_name, file_format):
+        if file_format not in CHART_FORMATS:
+            return _error(404, f"Charts are available as {', '.join(CHART_FORMATS)}.")
+        if not store.has_project(project_name):
+            return _error(404, f"No project {project_name!r}.")
+        try:
+            dpi = int(request.args.get("dpi", DEFAULT_DPI))
+        except ValueError:
+            return _error(400, "dpi must be a number.")
+        if not 10 <= dpi <= MAX_DPI:
+            return _error(400, f"dpi must be between 10 and {MAX_DPI}.")
+        if file_format == "svg":
+            dpi = DEFAULT_DPI  # Vector output does not depend on it.
+
+        # The digest identifies the chart, so an unchanged chart is answered
+        # with a 304 (or from the cache) without building it.
+        digest = store.project_digest(project_name)
+        etag = f"{digest}-{file_format}-{dpi}"
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+        tasks = store.get_sorted_tasks(project_name)
+        if not tasks:
+            return _error(404, f"Project {project_name!r} has no tasks.")
+        # Key the image by the digest of exactly these tasks, in case the project changed meanwhile.
+        digest = tasks_digest(tasks)
+        etag = f"{digest}-{file_format}-{dpi}"
+        image = charts.get((project_name, digest, file_format, dpi),
+                           lambda: render_chart(project_name, tasks, file_format, dpi))
+        response = Response(image, mimetype=CHART_FORMATS[file_format])
+        response.set_etag(etag)
+        return response
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the projects over a local HTTP API.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--storage", choices=["json", "journal", "sqlite", "sharded"], default=None,
+                        help="storage backend (default: from data/config.json)")
+    args = parser.parse_args()
+
+    store = open_store(args.storage)
+    app = create_app(store)
+    try:
+        app.run(host=args.host, port=args.port, threaded=True)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
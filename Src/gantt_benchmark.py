@@ -0,0 +1,224 @@
+import io  # Charts are saved into memory
+import os  # Paths of the temporary data files
+import sys  # Python version in the results
+import json  # Results file
+import time  # perf_counter for the timings
+import random  # Deterministic dataset generator
+import shutil  # Removing the temporary data directory
+import argparse  # Command line options
+import platform  # Machine description in the results
+import tempfile  # Directory for the generated data
+from datetime import datetime  # Date of the run
+
+import matplotlib
+matplotlib.use("Agg")  # Charts are rendered off screen, like the export does.
+
+from project_store import DATA_DIR, ProjectStore, load_projects, save_projects
+from project_task import Task, datetime_to_minutes, format_minutes
+from gantt_plot import build_gantt_figure
+from gantt_lod import LOD_MIN_TASKS, build_lod_gantt_figure
+
+
+# Total task counts measured by default.
+DEFAULT_SIZES = [10, 100, 1000, 10_000, 100_000, 1_000_000]
+# Default results file.
+RESULTS_FILE = os.path.join(DATA_DIR, "gantt_benchmark.json")
+# The full chart draws one labelled row per task, which takes minutes for
+# 10000 tasks; the export is only timed up to this many tasks per project.
+MAX_EXPORT_TASKS = 2000
+# Timings that got slower than this factor, and by at least this many
+# seconds (shorter timings are mostly noise), are reported by --compare.
+REGRESSION_FACTOR = 1.2
+REGRESSION_MIN_SECONDS = 0.001
+# First task start of the generated projects.
+FIRST_START = datetime_to_minutes(datetime(2024, 1, 1, 8, 0))
+
+
+# Function to generate a projects.json-shaped dataset. The same arguments
+# always give the same data. overlap is the share of tasks that start before
+# the previous task of the project ends (0 = strictly one after another).
+def generate_projects(projects, tasks_per_project, overlap=0.3, seed=0):
+    rng = random.Random(seed)
+    data = {}
+    task_id = 1
+    for number in range(projects):
+        tasks = []
+        start, duration = FIRST_START, 0
+        for index in range(tasks_per_project):
+            if index and rng.random() < overlap:
+                start += rng.randrange(0, max(duration, 1))
+            else:
+                start += duration + rng.randrange(0, 240)
+            duration = rng.randrange(30, 8 * 60)
+            tasks.append({"id": task_id, "task": f"Task {number}-{index}",
+                          "start": format_minutes(start), "end": format_minutes(start + duration)})
+            task_id += 1
+        data[f"Project {number:04d}"] = tasks
+    return data
+
+
+# Function to open one of the store backends on files in directory,
+# importing the dataset from json_path.
+def open_benchmark_store(storage, directory, json_path):
+    if storage == "json":
+        return ProjectStore(json_path, flush_delay=3600)
+    if storage == "journal":
+        from project_journal import JournalProjectStore
+        return JournalProjectStore(os.path.join(directory, "projects.journal"),
+                                   os.path.join(directory, "projects.snapshot.json"), import_path=json_path)
+    if storage == "sqlite":
+        from project_sqlite import SqliteProjectStore
+        return SqliteProjectStore(os.path.join(directory, "projects.sqlite3"), import_path=json_path)
+    if storage == "sharded":
+        from project_shards import ShardedProjectStore
+        return ShardedProjectStore(os.path.join(directory, "projects"), import_path=json_path, flush_delay=3600)
+    raise ValueError(f"Unknown storage backend: {storage!r}")
+
+
+# Function to run func repeat times and return the best time in seconds
+# (and the result of the last run).
+def timed(func, repeat=1):
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+# Function to save a figure as PNG into memory (what the export does on disk).
+def render_png(fig):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    return buffer
+
+
+# Function to measure one dataset size. Returns {timing name: seconds}
+# (None for timings that were skipped).
+def run_size(total_tasks, projects, overlap, storage, repeat, lookups, seed):
+    projects = max(1, min(projects, total_tasks))
+    tasks_per_project = total_tasks // projects
+    timings = {}
+    data = generate_projects(projects, tasks_per_project, overlap, seed)
+    directory = tempfile.mkdtemp(prefix="gantt-benchmark-")
+    store = None
+    try:
+        json_path = os.path.join(directory, "projects.json")
+
+        # Plain file I/O, as used by the json backend.
+        timings["save_projects"], _ = timed(lambda: save_projects(data, json_path), repeat)
+        timings["load_projects"], _ = timed(lambda: load_projects(json_path), repeat)
+        del data
+
+        # Opening the store (parsing into Task records, migration for the other backends).
+        timings["open_store"], store = timed(lambda: open_benchmark_store(storage, directory, json_path))
+        project_name = store.project_names()[0]
+
+        # Sorted tasks: the first call builds the order, later calls copy it.
+        timings["get_sorted_tasks_first"], tasks = timed(lambda: store.get_sorted_tasks(project_name))
+        timings["get_sorted_tasks"], tasks = timed(lambda: store.get_sorted_tasks(project_name), repeat)
+
+        # Task lookup, edit and delete by id, as edit_task/delete_task in the GUI do.
+        rng = random.Random(seed)
+        sample = [rng.choice(tasks) for _ in range(min(lookups, len(tasks)))]
+        if sample:
+            seconds, _ = timed(lambda: [store.get_task(project_name, task.id) for task in sample], repeat)
+            timings["get_task"] = seconds / len(sample)
+            seconds, _ = timed(lambda: [store.edit_task(project_name, task.id, Task(task.name + "*", task.start, task.end))
+                                        for task in sample])
+            timings["edit_task"] = seconds / len(sample)
+            unique = list({task.id: task for task in sample}.values())
+            seconds, _ = timed(lambda: [store.delete_task(project_name, task.id) for task in unique])
+            timings["delete_task"] = seconds / len(unique)
+        timings["flush"], _ = timed(store.flush)
+
+        # Charts: the preview (level of detail above LOD_MIN_TASKS, as
+        # show_gantt_chart does) and the full chart saved as PNG (as the export does).
+        tasks = store.get_sorted_tasks(project_name)
+        builder = build_lod_gantt_figure if len(tasks) > LOD_MIN_TASKS else build_gantt_figure
+        timings["show_chart"], _ = timed(lambda: render_png(builder(project_name, tasks)), repeat)
+        if len(tasks) <= MAX_EXPORT_TASKS:
+            timings["export_chart_build"], fig = timed(lambda: build_gantt_figure(project_name, tasks), repeat)
+            timings["export_chart_png"], _ = timed(lambda: render_png(fig), repeat)
+        else:
+            timings["export_chart_build"] = timings["export_chart_png"] = None
+    finally:
+        if store is not None:
+            store.close()
+        shutil.rmtree(directory, ignore_errors=True)
+    return {"total_tasks": projects * tasks_per_project, "projects": projects,
+            "tasks_per_project": tasks_per_project, "timings": timings}
+
+
+# Function to read the timings of a results file, by total task count.
+def load_timings(path):
+    with open(path, "r") as file:
+        return {entry["total_tasks"]: entry["timings"] for entry in json.load(file)["results"]}
+
+
+# Function to print the timings that got slower than the previous ones
+# (read from previous_path by load_timings).
+def compare(results, previous, previous_path, factor=REGRESSION_FACTOR):
+    regressions = 0
+    for entry in results:
+        old_timings = previous.get(entry["total_tasks"])
+        if old_timings is None:
+            continue
+        for name, seconds in entry["timings"].items():
+            old = old_timings.get(name)
+            if seconds is None or not old:
+                continue
+            ratio = seconds / old
+            if ratio > factor and seconds - old >= REGRESSION_MIN_SECONDS:
+                regressions += 1
+                print(f"REGRESSION {entry['total_tasks']} tasks, {name}: {old * 1000:.3f} ms -> {seconds * 1000:.3f} ms "
+                      f"({ratio:.2f}x)")
+    print(f"{regressions} regression(s) compared to {previous_path}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how the Gantt manager scales with the number of tasks.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="total task counts to measure (default: 10 to 1000000)")
+    parser.add_argument("--projects", type=int, default=10, help="projects the tasks are spread over (default 10)")
+    parser.add_argument("--overlap", type=float, default=0.3,
+                        help="share of tasks overlapping the previous one, 0 to 1 (default 0.3)")
+    parser.add_argument("--storage", choices=["json", "journal", "sqlite", "sharded"], default="json")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per timing, the best one counts (default 3)")
+    parser.add_argument("--lookups", type=int, default=1000, help="tasks looked up, edited and deleted (default 1000)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the dataset generator")
+    parser.add_argument("-o", "--output", default=RESULTS_FILE, help="results file (default: %(default)s)")
+    parser.add_argument("--compare", metavar="PREVIOUS", help="report timings slower than this results file")
+    args = parser.parse_args()
+    # Read the previous results before the run: they may be in the output file.
+    previous = load_timings(args.compare) if args.compare else None
+
+    results = []
+    for size in args.sizes:
+        entry = run_size(size, args.projects, args.overlap, args.storage, args.repeat, args.lookups, args.seed)
+        results.append(entry)
+        print(f"{entry['total_tasks']} tasks ({entry['projects']} x {entry['tasks_per_project']}):")
+        for name, seconds in entry["timings"].items():
+            print(f"  {name:24s} {'skipped' if seconds is None else f'{seconds * 1000:12.3f} ms'}")
+
+    output = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "settings": {"projects": args.projects, "overlap": args.overlap, "storage": args.storage,
+                     "repeat": args.repeat, "lookups": args.lookups, "seed": args.seed},
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as file:
+        json.dump(output, file, indent=4)
+    print(f"Results written to {args.output}")
+    if args.compare:
+        sys.exit(1 if compare(results, previous, args.compare) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,61 +1,73 @@
+import io  # Exported charts are rendered into memory first
 import os  # Provides a way of using operating system dependent functionality (e.g., file paths)
-import json  # Used for encoding and decoding JSON data (to save and load projects)
 import tkinter as tk  # Imports the Tkinter GUI library and gives it the alias 'tk'
 from tkinter import messagebox, simpledialog  # Imports specific Tkinter modules for popup messages and dialogs
-from tkcalendar import Calendar, DateEntry  # Imports calendar widgets to allow date selection in the GUI
-from datetime import datetime  # Provides classes for manipulating dates and times
-import matplotlib.pyplot as plt  # Imports Matplotlib's pyplot module for plotting graphs
-import matplotlib.dates as mdates  # Provides functions to handle dates on Matplotlib plots
-import textwrap
+from file_utils import DATA_DIR  # data/ next to Src/, where exported charts are saved
+from project_store import open_store  # Project storage (JSON file, journal or SQLite)
+from project_task import Task, format_minutes, tasks_digest  # Task record with start/end parsed once into minutes
+from gantt_export import export_file_name  # File names of exported charts
+from virtual_list import VirtualListbox  # Listboxes that only create the rows in view
+from background_io import BackgroundExecutor  # Runs loading and exporting off the GUI thread
+# tkcalendar and matplotlib (gantt_plot, gantt_lod) take seconds to import on
+# slow machines, so they are imported where they are first needed instead of here.
 
 
-# Define the path for JSON storage.
-# BASE_DIR is set to the parent directory of the directory containing this file.
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-# DATA_DIR is a subdirectory named "data" within BASE_DIR.
-DATA_DIR = os.path.join(BASE_DIR, "data")
-# DATA_FILE is the full path to the JSON file that will store project data.
-DATA_FILE = os.path.join(DATA_DIR, "projects.json")
-
 # Ensure that the data directory exists; if it doesn't, create it.
 os.makedirs(DATA_DIR, exist_ok=True)
 
 # Global variable to store the currently selected project name.
 current_project = None
 
-# Function to load projects from the JSON file.
-def load_projects():
-    try:
-        # Open the JSON file in read mode.
-        with open(DATA_FILE, "r") as file:
-            # Parse and return the JSON data as a Python dictionary.
-            return json.load(file)
-    except (FileNotFoundError, json.JSONDecodeError):
-        # If the file doesn't exist or contains invalid JSON, return an empty dictionary.
-        return {}
-
-# Function to save the projects dictionary to the JSON file.
-def save_projects(projects):
-    # Open the JSON file in write mode.
-    with open(DATA_FILE, "w") as file:
-        # Write the projects dictionary to the file in JSON format with indentation for readability.
-        json.dump(projects, file, indent=4)
+# Open chart windows by project name.
+chart_windows = {}
+
+# The last exported chart per project: {project name: (tasks digest, file format, bytes)}.
+# Exporting an unchanged project again writes these bytes instead of rendering anew.
+exported_charts = {}
+
+# Set once the window is closing (while running background work finishes).
+closing = False
+
+# The project store, opened in the background once the window is up (None until then).
+# The backend is picked by the "storage" setting in data/config.json (or the
+# GANTT_STORAGE environment variable):
+# "json" (default) keeps projects.json in memory and rewrites it in the background,
+# "journal" appends one record per change to data/projects.journal,
+# "sqlite" keeps projects and tasks in data/projects.sqlite3,
+# "sharded" keeps a manifest and one file per project in data/projects/ and loads projects when used.
+# "sharded" and "sqlite" list the project names without reading the tasks;
+# "json" and "journal" parse every project first (on the worker thread, so the
+# window is up meanwhile, but the names appear only once that is done).
+store = None
+
+# Bumped whenever the task listbox is refilled, so a task list that finishes
+# loading after a newer refill is dropped.
+task_list_version = 0
+
+# Worker threads for loading and exporting. Their results are handed back to
+# the GUI through root.after polling, so the window never freezes on disk I/O.
+io_executor = BackgroundExecutor()
+
+# Function to create a date selector widget. tkcalendar is imported on first
+# use, i.e. when the first task dialog opens.
+def date_entry(master):
+    from tkcalendar import DateEntry  # Calendar widget to allow date selection in the GUI
+    return DateEntry(master, date_pattern='dd.mm.yyyy')
+
 
 # Function to add a new project.
 def add_project():
+    if store is None:
+        messagebox.showwarning("Warning", "Please wait until the projects are loaded.")
+        return
     # Prompt the user to enter a project name.
     project_name = simpledialog.askstring("New Project", "Enter project name:")
     if project_name:
-        # Load existing projects.
-        projects = load_projects()
-        if project_name in projects:
+        # Create a new project entry with an empty task list (fails if the name is taken).
+        if not store.add_project(project_name):
             # Warn the user if the project already exists.
             messagebox.showwarning("Warning", "Project already exists!")
         else:
-            # Create a new project entry with an empty task list.
-            projects[project_name] = []
-            # Save the updated projects dictionary.
-            save_projects(projects)
             # Add the new project to the project listbox in the GUI.
             project_listbox.insert(tk.END, project_name)
             # Inform the user that the project was added successfully.
@@ -73,16 +85,12 @@ def delete_project():
 
     # Retrieve the project name from the selected listbox item.
     project_name = project_listbox.get(selected[0])
-    # Load the current projects.
-    projects = load_projects()
 
     # Ask the user to confirm deletion of the project.
     confirm = messagebox.askyesno("Confirm", f"Are you sure you want to delete the project '{project_name}'?")
     if confirm:
-        # Remove the project from the dictionary.
-        del projects[project_name]
-        # Save the updated projects data.
-        save_projects(projects)
+        # Remove the project from the store.
+        store.delete_project(project_name)
         # Remove the project from the listbox.
         project_listbox.delete(selected[0])
         # If the deleted project was the current one, reset current_project.
@@ -118,16 +126,14 @@ def add_task():
         start_datetime = get_datetime_input(start_date_entry, start_time_entry)
         end_datetime = get_datetime_input(end_date_entry, end_time_entry)
 
-        # Load the current projects data.
-        projects = load_projects()
+        # Parse the start and end times once into a task record.
+        try:
+            task = Task.from_strings(task_name, start_datetime, end_datetime)
+        except ValueError:
+            messagebox.showerror("Error", "Please enter the times as HH:MM.")
+            return
         # Append the new task (with its name, start, and end times) to the current project.
-        projects[project_name].append({
-            "task": task_name, 
-            "start": start_datetime, 
-            "end": end_datetime
-        })
-        # Save the updated projects data.
-        save_projects(projects)
+        store.add_task(project_name, task)
         # Refresh the task listbox to include the new task.
         update_task_listbox(project_name)
         # Inform the user that the task was added successfully.
@@ -139,7 +145,7 @@ def add_task():
 
     # --- Start Date and Time Widgets ---
     tk.Label(dialog, text="Select Start Date and Time").pack(pady=5)
-    start_date_entry = DateEntry(dialog, date_pattern='dd.mm.yyyy')  # Date selector for start date.
+    start_date_entry = date_entry(dialog)  # Date selector for start date.
     start_date_entry.pack(pady=5)
     tk.Label(dialog, text="Enter Start Time (HH:MM)").pack(pady=5)
     start_time_entry = tk.Entry(dialog)  # Entry widget for start time.
@@ -147,7 +153,7 @@ def add_task():
 
     # --- End Date and Time Widgets ---
     tk.Label(dialog, text="Select End Date and Time").pack(pady=5)
-    end_date_entry = DateEntry(dialog, date_pattern='dd.mm.yyyy')  # Date selector for end date.
+    end_date_entry = date_entry(dialog)  # Date selector for end date.
     end_date_entry.pack(pady=5)
     tk.Label(dialog, text="Enter End Time (HH:MM)").pack(pady=5)
     end_time_entry = tk.Entry(dialog)  # Entry widget for end time.
@@ -159,8 +165,7 @@ def add_task():
 
 
 def get_sorted_tasks(project_name):
-    tasks = load_projects().get(project_name, [])
-    return sorted(tasks, key=lambda task: datetime.strptime(task["start"], "%d.%m.%Y %H:%M"))
+    return store.get_sorted_tasks(project_name)
 
 
 
@@ -172,25 +177,21 @@ def delete_task():
         return
 
     project_name = current_project
-    projects = load_projects()
-    tasks = projects.get(project_name, [])
-    sorted_tasks = sorted(tasks, key=lambda task: datetime.strptime(task["start"], "%d.%m.%Y %H:%M"))
 
     selected_task = task_listbox.curselection()
     if not selected_task:
         messagebox.showwarning("Warning", "Please select a task to delete!")
         return
 
-    selected_index = selected_task[0]
-    task_data = sorted_tasks[selected_index]
-    original_index = tasks.index(task_data)
+    # The listbox maps the selected row back to its task, also while filtered.
+    task_data = task_listbox.get(selected_task[0])
 
-    confirm = messagebox.askyesno("Confirm", f"Are you sure you want to delete:\n{task_data['task']}?")
+    confirm = messagebox.askyesno("Confirm", f"Are you sure you want to delete:\n{task_data.name}?")
     if confirm:
-        tasks.pop(original_index)
-        save_projects(projects)
+        # The task id identifies the record, even if another task has the same values.
+        store.delete_task(project_name, task_data.id)
         update_task_listbox(project_name)
-        messagebox.showinfo("Success", f"Task '{task_data['task']}' deleted!")
+        messagebox.showinfo("Success", f"Task '{task_data.name}' deleted!")
 
 
 # Function to edit an existing task in the current project.
@@ -201,37 +202,29 @@ def edit_task():
         return
 
     project_name = current_project
-    projects = load_projects()
-    # Get the original unsorted tasks list.
-    tasks = projects.get(project_name, [])
-    # Create a sorted copy for display.
-    sorted_tasks = sorted(tasks, key=lambda task: datetime.strptime(task["start"], "%d.%m.%Y %H:%M"))
 
     selected_task = task_listbox.curselection()
     if not selected_task:
         messagebox.showwarning("Warning", "Please select a task to edit!")
         return
 
-    selected_index = selected_task[0]
-    # Get the task data from the sorted list.
-    task_data = sorted_tasks[selected_index]
-    # Find its index in the original tasks list.
-    original_index = tasks.index(task_data)
+    # Get the task data of the selected row (the listbox maps it back, also while filtered).
+    task_data = task_listbox.get(selected_task[0])
 
-    # Convert the stored start and end datetime strings into datetime objects.
-    start_dt = datetime.strptime(task_data["start"], "%d.%m.%Y %H:%M")
-    end_dt = datetime.strptime(task_data["end"], "%d.%m.%Y %H:%M")
+    # Get the stored start and end times as datetime objects.
+    start_dt = task_data.start_datetime
+    end_dt = task_data.end_datetime
 
     dialog = tk.Toplevel(root)
     dialog.title("Edit Task")
 
     tk.Label(dialog, text="Task Name:").pack(pady=5)
     name_entry = tk.Entry(dialog)
-    name_entry.insert(0, task_data["task"])
+    name_entry.insert(0, task_data.name)
     name_entry.pack(pady=5)
 
     tk.Label(dialog, text="Select Start Date:").pack(pady=5)
-    start_date_entry = DateEntry(dialog, date_pattern='dd.mm.yyyy')
+    start_date_entry = date_entry(dialog)
     start_date_entry.set_date(start_dt)
     start_date_entry.pack(pady=5)
 
@@ -241,7 +234,7 @@ def edit_task():
     start_time_entry.pack(pady=5)
 
     tk.Label(dialog, text="Select End Date:").pack(pady=5)
-    end_date_entry = DateEntry(dialog, date_pattern='dd.mm.yyyy')
+    end_date_entry = date_entry(dialog)
     end_date_entry.set_date(end_dt)
     end_date_entry.pack(pady=5)
 
@@ -260,13 +253,13 @@ def edit_task():
         new_start_datetime = f"{new_start_date.strftime('%d.%m.%Y')} {new_start_time}"
         new_end_datetime = f"{new_end_date.strftime('%d.%m.%Y')} {new_end_time}"
 
-        # Update the task in the original tasks list.
-        tasks[original_index] = {
-            "task": new_name,
-            "start": new_start_datetime,
-            "end": new_end_datetime
-        }
-        save_projects(projects)
+        try:
+            task = Task.from_strings(new_name, new_start_datetime, new_end_datetime)
+        except ValueError:
+            messagebox.showerror("Error", "Please enter the times as HH:MM.")
+            return
+        # Replace the stored task with the same id.
+        store.edit_task(project_name, task_data.id, task)
         update_task_listbox(project_name)
         messagebox.showinfo("Success", f"Task '{new_name}' updated successfully!")
         dialog.destroy()
@@ -274,12 +267,94 @@ def edit_task():
     tk.Button(dialog, text="Submit", command=submit_edit).pack(pady=10)
 
 
+# Function to build the listbox row of a task.
+def format_task_row(task):
+    return f"{task.name} ({task.start_text} - {task.end_text})"
+
+
 # Function to update the task listbox to show all tasks for a given project.
+# The listbox only formats the rows in view, so this stays fast for very large projects.
 def update_task_listbox(project_name):
-    sorted_tasks = get_sorted_tasks(project_name)
-    task_listbox.delete(0, tk.END)
-    for task in sorted_tasks:
-        task_listbox.insert(tk.END, f"{task['task']} ({task['start']} - {task['end']})")
+    global task_list_version
+    task_list_version += 1
+    task_listbox.set_items(get_sorted_tasks(project_name))
+
+
+# Function to show the tasks of a newly selected project. They are loaded on a
+# worker thread, because the first access to a project may have to read,
+# parse or sort its tasks.
+def load_task_listbox(project_name):
+    global task_list_version
+    task_list_version += 1
+    version = task_list_version
+    task_listbox.set_items([])
+    set_status(f"Loading the tasks of '{project_name}'...")
+
+    def on_loaded(tasks):
+        # Skip the result if another project was selected or the list was refreshed meanwhile.
+        if version == task_list_version:
+            task_listbox.set_items(tasks)
+            set_status("")
+
+    def on_failed(error):
+        set_status("")
+        messagebox.showerror("Error", f"Could not load the tasks of '{project_name}': {error}")
+
+    io_executor.submit(lambda job: get_sorted_tasks(project_name), key=project_name,
+                       on_done=on_loaded, on_error=on_failed)
+
+
+# Function to filter the task listbox by the text in the filter entry.
+def on_task_filter_changed(event):
+    task_listbox.set_filter(task_filter_entry.get())
+
+
+# Function to list all pairs of overlapping tasks in the selected project.
+def show_conflicts():
+    global current_project  # Use the global current_project variable.
+    if not current_project:
+        # Warn the user if no project is selected.
+        messagebox.showwarning("Warning", "Please select a project first!")
+        return
+
+    project_name = current_project
+    # The store answers this from the project's interval index.
+    conflicts = store.find_conflicts(project_name)
+    if not conflicts:
+        messagebox.showinfo("Conflicts", f"No overlapping tasks in '{project_name}'.")
+        return
+
+    # Show each pair together with the time span in which both tasks run.
+    dialog = tk.Toplevel(root)
+    dialog.title(f"Overlapping Tasks in {project_name}")
+    conflict_listbox = tk.Listbox(dialog, width=100)
+    conflict_listbox.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
+    for first, second in conflicts:
+        overlap_start = format_minutes(max(first.start, second.start))
+        overlap_end = format_minutes(min(first.end, second.end))
+        conflict_listbox.insert(tk.END, f"{first.name} / {second.name} ({overlap_start} - {overlap_end})")
+
+
+# Function to pick the function that builds the chart figure of a project.
+# With level_of_detail, large projects get a figure that only draws the tasks in view.
+def chart_builder(task_count, level_of_detail=False):
+    from gantt_plot import build_gantt_figure  # Imported on first use: loads matplotlib
+    from gantt_lod import LOD_MIN_TASKS, build_lod_gantt_figure  # Charts that only draw what is in view
+    if level_of_detail and task_count > LOD_MIN_TASKS:
+        return build_lod_gantt_figure
+    return build_gantt_figure
+
+
+# Function to get the (cached) Gantt chart figure of a project, or None if it has no tasks.
+# The figure is reused by the preview as long as the project is unchanged. It is
+# only drawn on the Tk thread; exports render a figure of their own (see below).
+def get_chart_figure(project_name, level_of_detail=False):
+    tasks = store.get_sorted_tasks(project_name)  # Retrieve the tasks sorted by start time.
+    if not tasks:
+        return None
+    from gantt_plot import figure_cache  # Keeps recent figures for reuse
+    builder = chart_builder(len(tasks), level_of_detail)
+    return figure_cache.get_figure(project_name, store.project_digest(project_name), tasks, builder)
 
 
 # Function to display a Gantt chart for the selected project using Matplotlib.
@@ -291,55 +366,32 @@ def show_gantt_chart():
         return
 
     project_name = current_project  # Get the current project name.
-    projects = load_projects()  # Load the projects data.
-    tasks = projects.get(project_name, [])  # Retrieve the tasks for the project.
+    fig = get_chart_figure(project_name, level_of_detail=True)  # Build the chart, or reuse the one already drawn.
 
-    if not tasks:
+    if fig is None:
         # Warn the user if the project has no tasks.
         messagebox.showwarning("Warning", "No tasks in this project!")
         return
 
-    # Sort tasks by start datetime for plotting.
-    tasks.sort(key=lambda task: datetime.strptime(task["start"], "%d.%m.%Y %H:%M"))
-    
-    # Create a new Matplotlib figure and axis for the Gantt chart.
-    fig, ax = plt.subplots(figsize=(10, 6))
-    task_labels = []  # List to store task names for labeling the y-axis.
-
-    
-
-    # Loop through the tasks and add a horizontal bar for each.
-    for i, task in enumerate(tasks):
-        task_labels.append(task["task"])
-        # Convert the task's start and end strings into datetime objects.
-        start_dt = datetime.strptime(task["start"], "%d.%m.%Y %H:%M")
-        end_dt = datetime.strptime(task["end"], "%d.%m.%Y %H:%M")
-        # Convert datetime objects to Matplotlib's numeric format.
-        start_num = mdates.date2num(start_dt)
-        end_num = mdates.date2num(end_dt)
-        width = end_num - start_num  # Determine the duration of the task.
-        # Plot a horizontal bar representing the task.
-        ax.barh(i, width, left=start_num, color="skyblue", edgecolor="grey", height=0.8)
-
-    # Set the y-axis ticks and labels based on the number of tasks.
-    ax.set_yticks(range(len(task_labels)))
-    max_chars_per_line = 20  # You can tweak this number to suit your label lengths.
-    wrapped_labels = [textwrap.fill(label, width=max_chars_per_line) for label in task_labels]
-    ax.set_yticklabels(wrapped_labels)
-    # Invert the y-axis so that tasks are listed from top to bottom.
-    ax.invert_yaxis()
-    
-    # Configure the x-axis to display dates and times.
-    ax.xaxis_date()
-    ax.xaxis.set_major_locator(mdates.AutoDateLocator())
-    ax.xaxis.set_major_formatter(mdates.DateFormatter("%d.%m.%Y %H:%M"))
-    plt.xticks(rotation=45, ha="right")  # Rotate x-axis labels for clarity.
-    plt.grid(axis="x", linestyle="--", alpha=0.7)  # Add gridlines to the x-axis.
-    ax.set_xlabel("Date/Time")
-    ax.set_ylabel("Tasks")
-    ax.set_title(f"Gantt Chart for {project_name}")
-    fig.tight_layout()  # Adjust layout to ensure everything fits without overlap.
-    plt.show()  # Display the Gantt chart window.
+    # A figure can only be shown in one window at a time: bring an open window
+    # with this figure to the front, and replace an outdated one.
+    window = chart_windows.get(project_name)
+    if window is not None and window.winfo_exists():
+        if window.figure is fig:
+            window.lift()
+            return
+        window.destroy()
+
+    # Show the figure in a new window, with Matplotlib's pan/zoom toolbar.
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk  # Embeds Matplotlib charts in Tk windows
+    window = tk.Toplevel(root)
+    window.title(f"Gantt Chart for {project_name}")
+    window.figure = fig
+    canvas = FigureCanvasTkAgg(fig, master=window)
+    NavigationToolbar2Tk(canvas, window).pack(side=tk.BOTTOM, fill=tk.X)
+    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    canvas.draw()
+    chart_windows[project_name] = window
 
 # Function to export the Gantt chart as an image (PNG) or PDF file.
 def export_chart_as_image():
@@ -350,56 +402,71 @@ def export_chart_as_image():
         return
 
     project_name = current_project  # Get the current project name.
-    projects = load_projects()  # Load the projects data.
-    tasks = projects.get(project_name, [])  # Retrieve the tasks for the project.
 
-    if not tasks:
-        # Warn the user if there are no tasks to display.
-        messagebox.showwarning("Warning", "No tasks in this project!")
-        return
-
-    # Create a new Matplotlib figure and axis for the chart.
-    fig, ax = plt.subplots(figsize=(10, 6))
-    task_labels = []  # List for task names.
-    for i, task in enumerate(tasks):
-        task_labels.append(task["task"])
-        # Convert start and end times from strings to datetime objects.
-        start_dt = datetime.strptime(task["start"], "%d.%m.%Y %H:%M")
-        end_dt = datetime.strptime(task["end"], "%d.%m.%Y %H:%M")
-        start_num = mdates.date2num(start_dt)
-        end_num = mdates.date2num(end_dt)
-        width = end_num - start_num  # Calculate task duration.
-        # Plot a horizontal bar for the task.
-        ax.barh(i, width, left=start_num, color="skyblue", edgecolor="grey", height=0.8)
-    
-    # Configure y-axis ticks and labels.
-    ax.set_yticks(range(len(task_labels)))
-    ax.set_yticklabels(task_labels)
-    ax.invert_yaxis()  # Invert the y-axis for proper task order.
-    
-    # Configure x-axis to display dates.
-    ax.xaxis_date()
-    ax.xaxis.set_major_locator(mdates.AutoDateLocator())
-    ax.xaxis.set_major_formatter(mdates.DateFormatter("%d.%m.%Y %H:%M"))
-    plt.xticks(rotation=45, ha="right")
-    plt.grid(axis="x", linestyle="--", alpha=0.7)
-    ax.set_xlabel("Date/Time")
-    ax.set_ylabel("Tasks")
-    ax.set_title(f"Gantt Chart for {project_name}")
-    
     # Ask the user whether they want to export as an image or PDF.
     export_type = simpledialog.askstring("Export Type", "Enter 'image' or 'pdf' to export:")
-    if export_type == "image":
-        # Save the figure as a PNG image in the data directory.
-        fig.savefig(os.path.join(DATA_DIR, f"{project_name}_gantt_chart.png"))
-        messagebox.showinfo("Success", f"Gantt chart saved as {project_name}_gantt_chart.png!")
-    elif export_type == "pdf":
-        # Save the figure as a PDF file in the data directory.
-        fig.savefig(os.path.join(DATA_DIR, f"{project_name}_gantt_chart.pdf"))
-        messagebox.showinfo("Success", f"Gantt chart saved as {project_name}_gantt_chart.pdf!")
-    else:
+    file_formats = {"image": "png", "pdf": "pdf"}
+    if export_type not in file_formats:
         # Inform the user if an invalid export type was entered.
         messagebox.showerror("Error", "Invalid export type! Please enter 'image' or 'pdf'.")
+        return
+    file_name = export_file_name(project_name, file_formats[export_type])
+
+    # Runs on a worker thread: render the chart and save it in the data directory.
+    # Matplotlib figures are not thread-safe, and a cached preview figure may be
+    # drawn by a chart window on the Tk thread at any time (e.g. while panning),
+    # so the export renders a figure of its own that no other thread ever sees.
+    # The rendered bytes are kept, so exporting the unchanged project again
+    # only writes the file.
+    def export(job):
+        job.report_progress(0, 2, f"Building the chart of '{project_name}'...")
+        tasks = store.get_sorted_tasks(project_name)
+        if not tasks:
+            return None
+        file_format = file_formats[export_type]
+        digest = tasks_digest(tasks)
+        cached = exported_charts.get(project_name)
+        if cached is not None and cached[:2] == (digest, file_format):
+            image = cached[2]
+        else:
+            fig = chart_builder(len(tasks))(project_name, tasks)
+            job.check_cancelled()
+            job.report_progress(1, 2, f"Rendering {file_name}...")
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format=file_format)
+            image = buffer.getvalue()
+            # Exports of one project run one after another, so only one thread writes its entry.
+            exported_charts[project_name] = (digest, file_format, image)
+        job.check_cancelled()
+        with open(os.path.join(DATA_DIR, file_name), "wb") as file:
+            file.write(image)
+        return file_name
+
+    def on_exported(saved_name):
+        set_status("")
+        if saved_name is None:
+            # Warn the user if there are no tasks to display.
+            messagebox.showwarning("Warning", "No tasks in this project!")
+        else:
+            messagebox.showinfo("Success", f"Gantt chart saved as {saved_name}!")
+
+    def on_export_failed(error):
+        set_status("")
+        messagebox.showerror("Error", f"Could not export the chart: {error}")
+
+    # Exports of the same project are written one after another.
+    io_executor.submit(export, key=project_name, on_done=on_exported, on_error=on_export_failed,
+                       on_progress=show_progress, on_cancel=lambda: set_status("Export cancelled."))
+
+
+# Function to show a message in the status bar.
+def set_status(text):
+    status_label.config(text=text)
+
+
+# Function to show the progress of a background job in the status bar.
+def show_progress(done, total, message):
+    set_status(message if total is None else f"{message} ({done}/{total})")
 
 # ---------------------------
 # Main GUI Setup and Widgets
@@ -410,19 +477,32 @@ root = tk.Tk()
 root.title("Gantt Chart Manager")  # Set the title of the window.
 root.geometry("600x600")  # Set the window size to 600x600 pixels.
 
-# Create a Listbox widget to display the list of projects.
-project_listbox = tk.Listbox(root)
+# Create a listbox to display the list of projects.
+# Like the task listbox, it only creates the rows that are in view.
+project_listbox = VirtualListbox(root)
 # Pack the project listbox into the window with padding and allow it to expand.
 project_listbox.pack(pady=10, fill=tk.BOTH, expand=True)
 
-# Create a Listbox widget to display the tasks for the selected project.
-task_listbox = tk.Listbox(root)
+# Create an entry to filter the tasks by name while typing.
+task_filter_frame = tk.Frame(root)
+task_filter_frame.pack(fill=tk.X)
+tk.Label(task_filter_frame, text="Filter tasks:").pack(side=tk.LEFT)
+task_filter_entry = tk.Entry(task_filter_frame)
+task_filter_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+task_filter_entry.bind("<KeyRelease>", on_task_filter_changed)
+
+# Create a listbox to display the tasks for the selected project.
+task_listbox = VirtualListbox(root, formatter=format_task_row, filter_key=lambda task: task.name)
 # Pack the task listbox into the window with padding and allow it to expand.
 task_listbox.pack(pady=10, fill=tk.BOTH, expand=True)
 
-# Load existing projects from the JSON file and add them to the project listbox.
-for project in load_projects().keys():
-    project_listbox.insert(tk.END, project)
+# Create a status bar for background work, with a button to cancel it.
+status_frame = tk.Frame(root)
+status_frame.pack(side=tk.BOTTOM, fill=tk.X)
+status_label = tk.Label(status_frame, anchor=tk.W)
+status_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+btn_cancel = tk.Button(status_frame, text="Cancel", command=io_executor.cancel_all)
+btn_cancel.pack(side=tk.RIGHT, padx=5)
 
 # Create a Frame widget to hold all the buttons.
 btn_frame = tk.Frame(root)
@@ -456,6 +536,10 @@ btn_show_chart.pack(side=tk.LEFT, padx=5)
 btn_export_chart = tk.Button(btn_frame, text="Export Chart", command=export_chart_as_image)
 btn_export_chart.pack(side=tk.LEFT, padx=5)
 
+# Create and pack the "Show Conflicts" button.
+btn_show_conflicts = tk.Button(btn_frame, text="Show Conflicts", command=show_conflicts)
+btn_show_conflicts.pack(side=tk.LEFT, padx=5)
+
 # Function to update tasks when a project is selected.
 def on_project_select(event):
     global current_project  # Use the global current_project variable.
@@ -464,11 +548,52 @@ def on_project_select(event):
     if selected:
         # Update current_project with the selected project name.
         current_project = project_listbox.get(selected[0])
-        # Refresh the task listbox to display tasks for the selected project.
-        update_task_listbox(current_project)
+        # Load and show the tasks of the selected project.
+        load_task_listbox(current_project)
 
 # Bind the listbox selection event to the on_project_select function.
 project_listbox.bind("<<ListboxSelect>>", on_project_select)
 
+# Function to show the projects once the store has been opened in the background.
+def on_store_loaded(loaded_store):
+    global store
+    store = loaded_store
+    # Add the existing projects from the store to the project listbox.
+    project_listbox.set_items(store.project_names())
+    set_status("")
+
+def on_store_failed(error):
+    set_status("")
+    messagebox.showerror("Error", f"Could not load the projects: {error}")
+
+# Open the store on a worker thread; the window is usable while it loads.
+io_executor.attach(root)
+set_status("Loading projects...")
+io_executor.submit(lambda job: open_store(), on_done=on_store_loaded, on_error=on_store_failed)
+
+# Function to write pending changes to disk before the window closes.
+# Queued work is cancelled; running jobs are waited for on the event loop
+# instead of blocking it, so the window stays responsive until they are done.
+def on_close():
+    global closing
+    if closing:
+        return
+    closing = True
+    io_executor.cancel_all()
+    set_status("Finishing background work...")
+    finish_close()
+
+def finish_close():
+    if io_executor.busy:
+        root.after(50, finish_close)
+        return
+    io_executor.shutdown()
+    if store is not None:
+        store.flush()
+    root.destroy()
+
+# Make sure unsaved changes are written when the window is closed.
+root.protocol("WM_DELETE_WINDOW", on_close)
+
 # Start the Tkinter event loop to run the GUI.
 root.mainloop()
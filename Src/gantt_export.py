@@ -0,0 +1,139 @@
+import os  # File paths
+import json  # Incremental export manifest
+import time  # Timing of the export
+import fnmatch  # Project name filters with wildcards
+import argparse  # Command line options
+from concurrent.futures import ProcessPoolExecutor, as_completed  # Rendering in parallel processes
+
+from project_store import DATA_DIR, atomic_write_text, open_store
+
+
+# Name of the manifest that remembers what was exported, kept in the output directory.
+MANIFEST_NAME = ".gantt_export.json"
+
+# File formats the exporter can write.
+FORMATS = ("png", "pdf", "svg")
+
+
+# Function to build the file name of an exported chart (same naming as the GUI export).
+def export_file_name(project_name, file_format):
+    safe_name = project_name.replace(os.sep, "_")
+    if os.altsep:
+        safe_name = safe_name.replace(os.altsep, "_")
+    return f"{safe_name}_gantt_chart.{file_format}"
+
+
+# Function run once in every worker process: force the non-interactive Agg backend.
+def _init_worker():
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+# Function run in a worker process to render one project in all requested formats.
+# Tasks arrive as plain (name, start, end) tuples, which are cheap to send between processes.
+def _render_project(project_name, task_tuples, formats, dpi, output_dir):
+    from gantt_plot import build_gantt_figure
+    from project_task import Task
+
+    started = time.perf_counter()
+    fig = build_gantt_figure(project_name, [Task(*values) for values in task_tuples])
+    paths = []
+    for file_format in formats:
+        path = os.path.join(output_dir, export_file_name(project_name, file_format))
+        fig.savefig(path, format=file_format, dpi=dpi)
+        paths.append(path)
+    return project_name, paths, time.perf_counter() - started
+
+
+def load_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), "r") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_manifest(output_dir, manifest):
+    atomic_write_text(os.path.join(output_dir, MANIFEST_NAME), json.dumps(manifest, indent=4))
+
+
+# Function to check whether the files from a previous export are still current.
+def is_up_to_date(entry, digest, formats, dpi, output_dir, project_name):
+    if not entry or entry.get("digest") != digest or entry.get("dpi") != dpi:
+        return False
+    return all(
+        file_format in entry.get("formats", [])
+        and os.path.exists(os.path.join(output_dir, export_file_name(project_name, file_format)))
+        for file_format in formats
+    )
+
+
+def export_charts(store, output_dir, formats=("png",), dpi=100, patterns=None, incremental=False, workers=None):
+    # Render the charts of all (matching) projects in parallel.
+    # Returns the names of the exported and of the skipped projects.
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest(output_dir) if incremental else {}
+
+    jobs = []
+    skipped = []
+    for project_name in store.project_names():
+        if patterns and not any(fnmatch.fnmatchcase(project_name, pattern) for pattern in patterns):
+            continue
+        tasks = store.get_sorted_tasks(project_name)
+        if not tasks:
+            skipped.append(project_name)
+            continue
+        digest = store.project_digest(project_name)
+        if incremental and is_up_to_date(manifest.get(project_name), digest, formats, dpi, output_dir, project_name):
+            skipped.append(project_name)
+            continue
+        jobs.append((project_name, digest, [(task.name, task.start, task.end) for task in tasks]))
+
+    exported = []
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            futures = {
+                executor.submit(_render_project, project_name, task_tuples, formats, dpi, output_dir): (project_name, digest)
+                for project_name, digest, task_tuples in jobs
+            }
+            for future in as_completed(futures):
+                project_name, digest = futures[future]
+                try:
+                    _, paths, elapsed = future.result()
+                except Exception as e:
+                    # One broken project should not stop the others.
+                    print(f"{project_name}: export failed: {e}")
+                    continue
+                print(f"{project_name}: {', '.join(os.path.basename(path) for path in paths)} ({elapsed:.2f} s)")
+                manifest[project_name] = {"digest": digest, "formats": list(formats), "dpi": dpi}
+                exported.append(project_name)
+
+    if incremental:
+        save_manifest(output_dir, manifest)
+    return exported, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the Gantt charts of all projects without the GUI.")
+    parser.add_argument("-f", "--format", dest="formats", nargs="+", choices=FORMATS, default=["png"],
+                        help="file formats to write (default: png)")
+    parser.add_argument("--dpi", type=int, default=100, help="resolution of raster output (default: %(default)s)")
+    parser.add_argument("-o", "--output-dir", default=DATA_DIR, help="directory for the charts (default: %(default)s)")
+    parser.add_argument("-p", "--project", dest="patterns", action="append",
+                        help="only export projects matching this name or wildcard pattern (repeatable)")
+    parser.add_argument("-i", "--incremental", action="store_true",
+                        help="skip projects whose content has not changed since the last export")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="number of worker processes (default: CPU count)")
+    parser.add_argument("--storage", choices=["json", "journal", "sqlite", "sharded"], default=None,
+                        help="storage backend (default: from data/config.json)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    store = open_store(args.storage)
+    exported, skipped = export_charts(store, args.output_dir, args.formats, args.dpi, args.patterns,
+                                      args.incremental, args.workers)
+    print(f"Exported {len(exported)} project(s), skipped {len(skipped)} in {time.perf_counter() - started:.2f} s.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import math  # Rounding of view limits to rows
+
+import numpy as np  # Vectorized selection and aggregation of visible bars
+import matplotlib.dates as mdates  # Conversion between Matplotlib dates and task minutes
+from matplotlib.collections import PolyCollection  # One artist for all visible bars
+from matplotlib.figure import Figure  # Figures independent of pyplot
+
+from gantt_plot import BAR_COLOR, BAR_EDGE_COLOR, BAR_HEIGHT, bar_vertices, style_gantt_axes, task_date_arrays, task_label
+from interval_index import IntervalIndex  # Finds the tasks that overlap the visible time range
+from project_task import MINUTES_PER_DAY
+
+
+# Projects with more tasks than this are shown with level of detail in the chart window.
+LOD_MIN_TASKS = 500
+# Up to this many rows in view are drawn (and labelled) one by one; with more,
+# neighbouring rows are merged into at most this many aggregated swimlanes.
+MAX_DETAIL_ROWS = 60
+# With at most this many rows in view, the visible tasks are picked with a plain
+# array scan of those rows instead of an interval query.
+SCAN_MAX_ROWS = 2000
+
+
+class LevelOfDetailView:
+    """Draws only the part of a Gantt chart that is inside the current view.
+
+    Hooks the axis' xlim/ylim callbacks. Whenever the view changes, the tasks
+    that intersect it are looked up (row range from the y-limits, time range
+    through an interval index) and only those bars and y-labels are drawn.
+    When more than max_rows rows are in view, consecutive rows are collapsed
+    into aggregated swimlane bars that span their tasks; zooming in brings
+    back the individual tasks.
+    """
+
+    def __init__(self, ax, tasks, max_rows=MAX_DETAIL_ROWS):
+        # tasks: Task records in display order (sorted by start), task i on row i.
+        self.ax = ax
+        self.tasks = tasks
+        self.max_rows = max_rows
+        self.left, self.right = task_date_arrays(tasks)
+        self.index = IntervalIndex((task.start, task.end, row) for row, task in enumerate(tasks))
+        self._minutes_offset = mdates.date2num(np.datetime64(0, "m"))  # Date number of minute 0.
+        self._updating = False
+
+        self.bars = PolyCollection([], facecolors=BAR_COLOR, edgecolors=BAR_EDGE_COLOR)
+        ax.add_collection(self.bars)
+
+        # Start with the whole chart in view, with the same margins as the full chart.
+        x_margin = 0.05 * (self.right.max() - self.left.min())
+        ax.set_xlim(self.left.min(), self.right.max() + x_margin)
+        y_low, y_high = -BAR_HEIGHT / 2, len(tasks) - 1 + BAR_HEIGHT / 2
+        y_margin = 0.05 * (y_high - y_low)
+        ax.set_ylim(y_high + y_margin, y_low - y_margin)  # Inverted: first task at the top.
+
+        ax.callbacks.connect("xlim_changed", self._on_limits_changed)
+        ax.callbacks.connect("ylim_changed", self._on_limits_changed)
+        self.update()
+
+    def _on_limits_changed(self, ax):
+        self.update()
+        ax.figure.canvas.draw_idle()
+
+    def _to_minutes(self, date_number):
+        return (date_number - self._minutes_offset) * MINUTES_PER_DAY
+
+    def visible_row_range(self):
+        # First and one-past-last row whose bar reaches into the y-limits.
+        low, high = sorted(self.ax.get_ylim())
+        first = max(0, math.ceil(low - BAR_HEIGHT / 2))
+        last = min(len(self.tasks), math.floor(high + BAR_HEIGHT / 2) + 1)
+        return first, max(first, last)
+
+    def visible_rows(self, first, last):
+        # Rows in [first, last) whose task overlaps the x-limits, in row order.
+        x_low, x_high = sorted(self.ax.get_xlim())
+        if last - first <= SCAN_MAX_ROWS or (x_low <= self.left[first:last].min() and x_high >= self.right[first:last].max()):
+            rows = np.arange(first, last)
+            mask = (self.left[first:last] < x_high) & (self.right[first:last] > x_low)
+            return rows[mask]
+        # Rows are sorted by start, so no task below the view starts later than the last visible one.
+        end_minutes = min(self._to_minutes(x_high), self.tasks[last - 1].start + 1)
+        rows = np.array(self.index.query(self._to_minutes(x_low), end_minutes), dtype=np.int64)
+        rows = rows[(rows >= first) & (rows < last)]
+        rows.sort()
+        return rows
+
+    def update(self):
+        # Redraw the bars and labels for the current view.
+        if self._updating or not len(self.tasks):
+            return
+        self._updating = True  # Setting ticks must not re-trigger the limit callbacks.
+        try:
+            first, last = self.visible_row_range()
+            rows = self.visible_rows(first, last) if last > first else np.empty(0, dtype=np.int64)
+            if last - first <= self.max_rows:
+                self._draw_rows(rows, first, last)
+            else:
+                self._draw_lanes(rows, first, last)
+        finally:
+            self._updating = False
+
+    def _set_yticks(self, positions, labels):
+        # Only ticks inside the view: set_yticks would widen the limits to include the others.
+        low, high = sorted(self.ax.get_ylim())
+        kept = [(position, label) for position, label in zip(positions, labels) if low <= position <= high]
+        self.ax.set_yticks([position for position, _ in kept])
+        self.ax.set_yticklabels([label for _, label in kept])
+
+    def _draw_rows(self, rows, first, last):
+        self.bars.set_verts(bar_vertices(rows.astype(float), self.left[rows], self.right[rows]))
+        labelled = range(first, last)
+        self._set_yticks(labelled, [task_label(self.tasks[row]) for row in labelled])
+
+    def _draw_lanes(self, rows, first, last):
+        # Split the rows in view into max_rows lanes of equal size and draw one
+        # bar per lane, from its earliest start to its latest end.
+        lane_size = math.ceil((last - first) / self.max_rows)
+        if not len(rows):
+            self.bars.set_verts([])
+            self.ax.set_yticks([])
+            return
+        lanes = (rows - first) // lane_size
+        boundaries = np.flatnonzero(np.diff(lanes)) + 1
+        starts = np.concatenate(([0], boundaries))
+        lane_numbers = lanes[starts]
+        lane_left = np.minimum.reduceat(self.left[rows], starts)
+        lane_right = np.maximum.reduceat(self.right[rows], starts)
+        counts = np.diff(np.concatenate((starts, [len(rows)])))
+
+        lane_first = first + lane_numbers * lane_size
+        lane_last = np.minimum(lane_first + lane_size, last) - 1
+        centers = (lane_first + lane_last) / 2
+        heights = lane_last - lane_first + BAR_HEIGHT
+        self.bars.set_verts(bar_vertices(centers, lane_left, lane_right, heights))
+        self._set_yticks(centers, [f"{count} tasks" for count in counts])
+
+
+# Function to build a Gantt chart figure that draws only what is in view.
+def build_lod_gantt_figure(project_name, tasks):
+    fig = Figure(figsize=(10, 6))
+    ax = fig.add_subplot()
+    style_gantt_axes(ax, project_name)
+    # Keep a reference on the figure: Matplotlib only holds callbacks weakly.
+    fig.level_of_detail = LevelOfDetailView(ax, tasks)
+    fig.tight_layout()
+    return fig
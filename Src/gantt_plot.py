@@ -0,0 +1,152 @@
+import textwrap  # Wrapping of long task names on the y-axis
+import threading  # The figure cache is shared with background threads
+from collections import OrderedDict  # LRU order of the cached figures
+
+import numpy as np  # Vectorized conversion of task times and bar geometry
+import matplotlib.dates as mdates  # Conversion of datetimes to Matplotlib's numeric format
+from matplotlib.collections import PolyCollection  # One artist for all task bars
+from matplotlib.figure import Figure  # Figures independent of pyplot, so they can be cached and reused
+
+
+# Appearance of the task bars.
+BAR_HEIGHT = 0.8
+BAR_COLOR = "skyblue"
+BAR_EDGE_COLOR = "grey"
+MAX_LABEL_CHARS = 20  # Task names are wrapped to lines of at most this many characters.
+
+
+# Function to convert the start/end times of all tasks to Matplotlib date numbers.
+# The minute timestamps of the Task records map directly onto numpy's
+# datetime64[m], so the whole project is converted with one date2num call each.
+def task_date_arrays(tasks):
+    count = len(tasks)
+    starts = np.fromiter((task.start for task in tasks), dtype=np.int64, count=count).astype("datetime64[m]")
+    ends = np.fromiter((task.end for task in tasks), dtype=np.int64, count=count).astype("datetime64[m]")
+    return mdates.date2num(starts), mdates.date2num(ends)
+
+
+# Function to build the rectangle corners of horizontal bars, one per row.
+def bar_vertices(rows, left, right, height=BAR_HEIGHT):
+    top = rows - height / 2
+    bottom = rows + height / 2
+    vertices = np.empty((len(rows), 4, 2))
+    vertices[:, 0, 0] = left
+    vertices[:, 0, 1] = top
+    vertices[:, 1, 0] = left
+    vertices[:, 1, 1] = bottom
+    vertices[:, 2, 0] = right
+    vertices[:, 2, 1] = bottom
+    vertices[:, 3, 0] = right
+    vertices[:, 3, 1] = top
+    return vertices
+
+
+# Function to draw one horizontal bar per task (task i on row i) onto an axis.
+# All bars go into a single PolyCollection instead of one Rectangle per task,
+# which keeps building and drawing the chart fast for very large projects.
+def draw_task_bars(ax, tasks):
+    left, right = task_date_arrays(tasks)
+    rows = np.arange(len(tasks), dtype=float)
+    bars = PolyCollection(bar_vertices(rows, left, right), facecolors=BAR_COLOR, edgecolors=BAR_EDGE_COLOR)
+    ax.add_collection(bars)
+    if len(tasks):
+        # Like ax.barh: the data limits cover the bars and the x-axis starts at the earliest bar.
+        bars.sticky_edges.x.append(left.min())
+        ax.update_datalim([(left.min(), -BAR_HEIGHT / 2), (right.max(), rows[-1] + BAR_HEIGHT / 2)])
+        ax.autoscale_view()
+    return bars
+
+
+# Function to wrap a task name for use as a y-axis label.
+def task_label(task):
+    return textwrap.fill(task.name, width=MAX_LABEL_CHARS)
+
+
+# Function to build the complete Gantt chart figure of a project.
+# The tasks are expected in display order (sorted by start time).
+def build_gantt_figure(project_name, tasks):
+    fig = Figure(figsize=(10, 6))
+    ax = fig.add_subplot()
+
+    # Draw a horizontal bar for every task in one go.
+    draw_task_bars(ax, tasks)
+
+    # One y-axis tick per task, labelled with the wrapped task name.
+    ax.set_yticks(range(len(tasks)))
+    ax.set_yticklabels([task_label(task) for task in tasks])
+    # Invert the y-axis so that tasks are listed from top to bottom.
+    ax.invert_yaxis()
+
+    style_gantt_axes(ax, project_name)
+    fig.tight_layout()
+    return fig
+
+
+# Function to apply the date axis, grid and titles shared by all Gantt charts.
+def style_gantt_axes(ax, project_name):
+    # Configure the x-axis to display dates and times.
+    ax.xaxis_date()
+    ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%d.%m.%Y %H:%M"))
+    for label in ax.get_xticklabels():
+        label.set_rotation(45)
+        label.set_horizontalalignment("right")
+    ax.grid(axis="x", linestyle="--", alpha=0.7)
+    ax.set_xlabel("Date/Time")
+    ax.set_ylabel("Tasks")
+    ax.set_title(f"Gantt Chart for {project_name}")
+
+
+class FigureCache:
+    """Keeps the most recently used chart figures for reuse.
+
+    Figures are keyed by project name, content digest and the function that
+    built them, so showing an unchanged project again reuses its figure,
+    while any edit of the project leads to a fresh one. A figure is built
+    once per key: callers asking for a figure that is being built wait for
+    it. The least recently used figures are dropped once more than
+    max_figures are cached.
+
+    Matplotlib figures are not thread-safe, so a cached figure must only be
+    drawn on one thread (the Tk thread); background work such as an export
+    builds its own figure instead.
+    """
+
+    def __init__(self, max_figures=4):
+        self.max_figures = max_figures
+        self._figures = OrderedDict()
+        self._building = {}  # key -> Event set when the build has finished
+        self._lock = threading.Lock()
+
+    def get_figure(self, project_name, digest, tasks, builder=build_gantt_figure):
+        key = (project_name, digest, builder)
+        while True:
+            with self._lock:
+                fig = self._figures.get(key)
+                if fig is not None:
+                    self._figures.move_to_end(key)
+                    return fig
+                event = self._building.get(key)
+                if event is None:
+                    event = self._building[key] = threading.Event()
+                    break
+            event.wait()  # Someone else builds it; then look again.
+        try:
+            fig = builder(project_name, tasks)
+            with self._lock:
+                self._figures[key] = fig
+                while len(self._figures) > self.max_figures:
+                    self._figures.popitem(last=False)
+            return fig
+        finally:
+            with self._lock:
+                del self._building[key]
+            event.set()
+
+    def clear(self):
+        with self._lock:
+            self._figures.clear()
+
+
+# Figure cache of the chart previews.
+figure_cache = FigureCache()
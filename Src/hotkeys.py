@@ -0,0 +1,157 @@
+import time  # Key press timestamps
+import threading  # Dispatcher thread, condition variable and stop event
+from collections import deque  # Pending key presses and recent latencies
+
+
+# Function to turn a pynput key into a binding name: the lower-case character
+# for normal keys ("s", "q"), the pynput Key name for special ones ("f6", "esc").
+def key_name(key):
+    char = getattr(key, "char", None)
+    if char:
+        return char.lower()
+    name = getattr(key, "name", None)
+    if name:
+        return name
+    return str(key)
+
+
+# Function to parse "key=command,key=command" into a dictionary.
+def parse_bindings(text):
+    bindings = {}
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        key, _, command = part.partition("=")
+        if not command:
+            raise ValueError(f"Binding {part!r} is not of the form key=command")
+        bindings[key.strip().lower()] = command.strip()
+    return bindings
+
+
+class HotkeyManager:
+    """A single keyboard listener shared by all automation tasks of a process.
+
+    bind() maps a key to an action. The listener thread only records the key
+    press and notifies a dispatcher thread through a condition variable; the
+    dispatcher runs the actions, so a slow action never delays the keyboard
+    hook. Actions run one at a time and should be quick (start or stop a task
+    that has its own thread, such as a PacedLoop). Holding a key down does not
+    repeat its action. The time from the key press reaching the process to the
+    action starting is recorded for every binding, see latency_summary().
+    """
+
+    def __init__(self, history=200):
+        self._bindings = {}  # key name -> (name, action)
+        self._lock = threading.Lock()
+        self._pending = deque()  # (key name, press time in perf_counter_ns)
+        self._wakeup = threading.Condition(self._lock)
+        self._held = set()  # Keys currently down, to ignore auto-repeat.
+        self._latencies = {}  # binding name -> deque of latencies in ns
+        self._history = history
+        self._stopped = threading.Event()
+        self._listener = None
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+
+    # --- Bindings ---
+
+    def bind(self, key, action, name=None):
+        key = key.lower()
+        with self._lock:
+            self._bindings[key] = (name or key, action)
+
+    def unbind(self, key):
+        with self._lock:
+            self._bindings.pop(key.lower(), None)
+
+    def bindings(self):
+        with self._lock:
+            return {key: name for key, (name, _) in self._bindings.items()}
+
+    # --- Key events ---
+
+    def key_pressed(self, key, pressed_ns=None):
+        # Called by the listener (or directly, e.g. by tests) with a key name.
+        pressed_ns = pressed_ns or time.perf_counter_ns()
+        with self._lock:
+            if key in self._held:
+                return  # Auto-repeat of a key that is still down.
+            self._held.add(key)
+            if key not in self._bindings:
+                return
+            self._pending.append((key, pressed_ns))
+            self._wakeup.notify()
+
+    def key_released(self, key):
+        with self._lock:
+            self._held.discard(key)
+
+    def _dispatch(self):
+        while True:
+            with self._lock:
+                while not self._pending and not self._stopped.is_set():
+                    self._wakeup.wait()
+                if self._stopped.is_set():
+                    return
+                key, pressed_ns = self._pending.popleft()
+                binding = self._bindings.get(key)
+            if binding is None:
+                continue
+            name, action = binding
+            latency = time.perf_counter_ns() - pressed_ns
+            with self._lock:
+                self._latencies.setdefault(name, deque(maxlen=self._history)).append(latency)
+            try:
+                action()
+            except Exception as e:
+                print(f"Hotkey {key!r} ({name}) failed: {e}")
+
+    # --- Running ---
+
+    def start(self):
+        # Start listening to the keyboard. pynput is imported here because it
+        # needs a display; the rest of the class works without it.
+        from pynput import keyboard
+        self._listener = keyboard.Listener(
+            on_press=lambda key: self.key_pressed(key_name(key)),
+            on_release=lambda key: self.key_released(key_name(key)),
+        )
+        self._listener.start()
+
+    def stop(self):
+        # Stop the listener and the dispatcher; wait() returns afterwards.
+        # Safe to call from an action.
+        if self._listener is not None:
+            self._listener.stop()
+        with self._lock:
+            self._stopped.set()
+            self._wakeup.notify_all()
+
+    @property
+    def stopped(self):
+        return self._stopped.is_set()
+
+    def wait(self, timeout=None):
+        # Block until stop() was called; returns False on timeout.
+        return self._stopped.wait(timeout)
+
+    # --- Latency ---
+
+    def latency_summary(self):
+        # Press-to-action latency per binding, in milliseconds.
+        with self._lock:
+            latencies = {name: sorted(values) for name, values in self._latencies.items()}
+        summary = {}
+        for name, values in latencies.items():
+            summary[name] = {
+                "count": len(values),
+                "median_ms": values[len(values) // 2] / 1e6,
+                "p95_ms": values[min(len(values) - 1, int(len(values) * 0.95))] / 1e6,
+                "max_ms": values[-1] / 1e6,
+            }
+        return summary
+
+    def print_latency(self):
+        for name, stats in self.latency_summary().items():
+            print(f"{name}: {stats['count']} presses, press to action "
+                  f"{stats['median_ms']:.3f} ms median / {stats['p95_ms']:.3f} ms p95 / {stats['max_ms']:.3f} ms max")
@@ -0,0 +1,214 @@
+import heapq  # Active intervals during the overlap sweep
+import random  # Node priorities of the treap
+
+
+class _Node:
+    __slots__ = ("start", "end", "item", "key", "priority", "left", "right", "max_end")
+
+    def __init__(self, start, end, item, key, priority):
+        self.start = start
+        self.end = end
+        self.item = item
+        self.key = key  # Tree order: (start, tie key of the item).
+        self.priority = priority
+        self.left = None
+        self.right = None
+        self.max_end = end  # Largest end in this node's subtree.
+
+
+class IntervalIndex:
+    """Index of half-open intervals [start, end) for fast time-range queries.
+
+    A treap (randomized balanced search tree) ordered by start, where every
+    node also knows the largest end in its subtree, so whole subtrees that end
+    before the queried range are skipped. query() therefore touches
+    O(log n + k) nodes for k results and returns the items ordered by start;
+    insert() and remove() take O(log n).
+
+    Intervals with the same start are ordered by tie_key(item), which also
+    tells the items apart in remove(). The default is the item's identity, so
+    the same object must be passed to remove() that was inserted; pass a key
+    such as the task id to get an order that is the same on every run.
+
+    Two intervals overlap when they share some point in time, i.e. when
+    max(starts) < min(ends). An empty interval (start == end, such as a
+    milestone) has no points, so it never overlaps anything.
+    """
+
+    def __init__(self, intervals=(), tie_key=id):
+        # intervals: iterable of (start, end, item) tuples.
+        self.tie_key = tie_key
+        intervals = sorted(intervals, key=lambda interval: (interval[0], tie_key(interval[2])))
+        self._root = self._build(intervals, tie_key)
+        self._size = len(intervals)
+
+    def __len__(self):
+        return self._size
+
+    @staticmethod
+    def _build(intervals, tie_key):
+        # Build a balanced tree from sorted intervals in O(n). Random priorities
+        # are handed out largest-first in breadth-first order, so every parent
+        # outranks its children and the tree is a valid treap.
+        if not intervals:
+            return None
+
+        def build(low, high):
+            if low > high:
+                return None
+            middle = (low + high) // 2
+            start, end, item = intervals[middle]
+            node = _Node(start, end, item, (start, tie_key(item)), 0.0)
+            node.left = build(low, middle - 1)
+            node.right = build(middle + 1, high)
+            return node
+
+        root = build(0, len(intervals) - 1)
+        order = [root]
+        for node in order:
+            if node.left is not None:
+                order.append(node.left)
+            if node.right is not None:
+                order.append(node.right)
+        priorities = sorted((random.random() for _ in order), reverse=True)
+        for node, priority in zip(order, priorities):
+            node.priority = priority
+        # Compute max_end bottom-up (children come after their parent in breadth-first order).
+        for node in reversed(order):
+            _update(node)
+        return root
+
+    # --- Changes ---
+
+    def insert(self, start, end, item):
+        self._root = _insert(self._root, _Node(start, end, item, (start, self.tie_key(item)), random.random()))
+        self._size += 1
+
+    def remove(self, start, item):
+        # Remove the interval of item (inserted with this start). Returns False if it is not indexed.
+        self._root, removed = _remove(self._root, (start, self.tie_key(item)))
+        if removed:
+            self._size -= 1
+        return removed
+
+    # --- Queries ---
+
+    def query(self, start, end):
+        # Items of all intervals that overlap [start, end), ordered by start.
+        results = []
+        if start >= end:
+            return results
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            # Walk down the left spine, skipping subtrees that end too early.
+            while node is not None and node.max_end > start:
+                stack.append(node)
+                node = node.left
+            if not stack:
+                break
+            node = stack.pop()
+            if node.start >= end:
+                # This node and everything to its right start after the range.
+                break
+            if node.end > start and node.start < node.end:
+                results.append(node.item)
+            node = node.right
+        return results
+
+    def overlapping(self, start, end, item):
+        # Items overlapping the interval of item, without item itself.
+        return [other for other in self.query(start, end) if other is not item]
+
+    def overlapping_pairs(self):
+        # All pairs (a, b) of overlapping intervals, each pair once with a
+        # starting first. A sweep over the start order that keeps the intervals
+        # still running in a heap: O(n log n + k) for k pairs.
+        active = []  # (end, sequence, item) of the intervals started so far and not yet ended.
+        pairs = []
+        for sequence, (start, end, item) in enumerate(self):
+            if start >= end:
+                continue
+            while active and active[0][0] <= start:
+                heapq.heappop(active)
+            pairs.extend((other, item) for _, _, other in active)
+            heapq.heappush(active, (end, sequence, item))
+        return pairs
+
+    def __iter__(self):
+        # All (start, end, item) tuples ordered by start.
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.start, node.end, node.item
+            node = node.right
+
+
+def _update(node):
+    max_end = node.end
+    if node.left is not None and node.left.max_end > max_end:
+        max_end = node.left.max_end
+    if node.right is not None and node.right.max_end > max_end:
+        max_end = node.right.max_end
+    node.max_end = max_end
+
+
+def _split(node, key):
+    # Split a subtree into the nodes with keys < key and those with keys >= key.
+    if node is None:
+        return None, None
+    if node.key < key:
+        node.right, right = _split(node.right, key)
+        _update(node)
+        return node, right
+    left, node.left = _split(node.left, key)
+    _update(node)
+    return left, node
+
+
+def _merge(left, right):
+    # Join two subtrees where every key in left is smaller than every key in right.
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+
+def _insert(node, new):
+    if node is None:
+        return new
+    if new.priority > node.priority:
+        new.left, new.right = _split(node, new.key)
+        _update(new)
+        return new
+    if new.key < node.key:
+        node.left = _insert(node.left, new)
+    else:
+        node.right = _insert(node.right, new)
+    _update(node)
+    return node
+
+
+def _remove(node, key):
+    if node is None:
+        return None, False
+    if key == node.key:
+        return _merge(node.left, node.right), True
+    if key < node.key:
+        node.left, removed = _remove(node.left, key)
+    else:
+        node.right, removed = _remove(node.right, key)
+    if removed:
+        _update(node)
+    return node, removed
@@ -0,0 +1,126 @@
+import os  # Paths and the environment of the measured process
+import sys  # The Python interpreter to start gantt_chart.py with
+import time  # Wall-clock time from launch to each milestone
+import argparse  # Command line options
+import threading  # Kills a run that does not finish
+import statistics  # Median of the runs
+import subprocess  # Starts gantt_chart.py
+
+
+GANTT_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gantt_chart.py")
+
+# Startup targets: median milliseconds from launching the process until the
+# window is on screen, and until the project names are listed in it.
+TARGETS = {"window": 1000, "projects": 1500}
+# Milestones the probe reports, in order.
+MILESTONES = ("widgets", "window", "projects")
+
+
+# Function run in the measured process (measure_startup.py --probe). It runs
+# gantt_chart.py with hooks that print each milestone as it is reached:
+# "widgets" when the event loop starts, "window" when the window is first
+# drawn and "projects" when the project names are listed. Once the window is
+# shown and the projects are listed, the window is closed through its own
+# close handler, so pending work is finished as usual.
+def probe():
+    import runpy  # Runs gantt_chart.py as the main program
+    import tkinter as tk  # The event loop is hooked to find the window
+    from virtual_list import VirtualListbox  # Filling the project list is the "projects" milestone
+
+    reached = set()
+    windows = []
+
+    def report(milestone):
+        if milestone in reached:
+            return
+        reached.add(milestone)
+        print(f"startup {milestone}", flush=True)
+        if milestone == "window":
+            heavy = [name for name in ("matplotlib", "tkcalendar", "numpy") if name in sys.modules]
+            print(f"startup-modules {','.join(heavy) or '-'}", flush=True)
+        if {"window", "projects"} <= reached:
+            root = windows[0]
+            root.after_idle(lambda: root.tk.call(root.protocol("WM_DELETE_WINDOW")))
+
+    mainloop = tk.Misc.mainloop
+    def probed_mainloop(widget, n=0):
+        windows.append(widget)
+        report("widgets")
+        widget.bind("<Map>", lambda event: widget.after_idle(report, "window"), add="+")
+        return mainloop(widget, n)
+    tk.Misc.mainloop = probed_mainloop
+
+    # The task list is only filled once a project is selected, so the first
+    # list filled after the event loop starts is the project list.
+    set_items = VirtualListbox.set_items
+    def probed_set_items(listbox, items):
+        set_items(listbox, items)
+        if windows:
+            report("projects")
+    VirtualListbox.set_items = probed_set_items
+
+    runpy.run_path(GANTT_SCRIPT, run_name="__main__")
+
+
+# Function to start gantt_chart.py once and time its startup milestones.
+# Returns ({milestone: ms since launch}, heavy modules loaded at window time).
+def measure_once(storage=None, timeout=60):
+    env = dict(os.environ)
+    if storage:
+        env["GANTT_STORAGE"] = storage
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--probe"], stdout=subprocess.PIPE, text=True, env=env)
+    killer = threading.Timer(timeout, process.kill)
+    killer.start()
+    times = {}
+    modules = None
+    try:
+        for line in process.stdout:
+            parts = line.split()
+            if len(parts) == 2 and parts[0] == "startup":
+                times[parts[1]] = (time.perf_counter() - started) * 1000
+            elif len(parts) == 2 and parts[0] == "startup-modules":
+                modules = parts[1]
+        process.wait()
+    finally:
+        killer.cancel()
+    if process.returncode != 0:
+        raise RuntimeError(f"gantt_chart.py exited with status {process.returncode}")
+    return times, modules
+
+
+def main():
+    if sys.argv[1:] == ["--probe"]:
+        probe()
+        return
+    parser = argparse.ArgumentParser(description="Measure how long gantt_chart.py takes to start.")
+    parser.add_argument("-n", "--runs", type=int, default=5, help="number of launches (default 5)")
+    parser.add_argument("--storage", choices=["json", "journal", "sqlite", "sharded"],
+                        help="storage backend to start with (default: the configured one)")
+    args = parser.parse_args()
+
+    runs = []
+    for run in range(args.runs):
+        times, modules = measure_once(args.storage)
+        runs.append(times)
+        print(f"run {run + 1}: " + ", ".join(f"{name} {times[name]:.0f} ms" for name in MILESTONES if name in times)
+              + f" (heavy modules at window: {modules})")
+
+    failed = False
+    for name in MILESTONES:
+        values = [times[name] for times in runs if name in times]
+        if not values:
+            print(f"{name}: not reached")
+            failed = failed or name in TARGETS
+            continue
+        line = f"{name}: median {statistics.median(values):.0f} ms, min {min(values):.0f} ms, max {max(values):.0f} ms"
+        if name in TARGETS:
+            met = statistics.median(values) <= TARGETS[name]
+            failed = failed or not met
+            line += f" (target {TARGETS[name]} ms: {'met' if met else 'MISSED'})"
+        print(line)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
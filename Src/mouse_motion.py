@@ -0,0 +1,190 @@
+import math  # Circles and random headings
+import random  # Jittered random walks
+import threading  # Finished event
+from itertools import islice  # Finite runs of frames
+from precise_timing import PacedLoop, constant_intervals
+
+
+# Paths are lists of (x, y) offsets from the position where the movement
+# starts, one per frame. The engine moves by the difference between
+# consecutive rounded offsets, so rounding never adds up and a closed path
+# really ends where it started.
+
+# Function to build a straight line from offset start to offset end.
+def line_path(end, frames, start=(0, 0)):
+    (x0, y0), (x1, y1) = start, end
+    return [(x0 + (x1 - x0) * i / frames, y0 + (y1 - y0) * i / frames) for i in range(1, frames + 1)]
+
+
+# Function to stay at an offset for some frames (a pause within a path).
+def hold_path(offset, frames):
+    return [offset] * frames
+
+
+# Function to build a circle through the start point, clockwise on screen.
+def circle_path(radius, frames):
+    # The centre is radius pixels to the right of the start point.
+    return [(radius - radius * math.cos(2 * math.pi * i / frames), -radius * math.sin(2 * math.pi * i / frames))
+            for i in range(1, frames + 1)]
+
+
+# Function to build a random walk: steps of about step pixels whose heading
+# changes by up to jitter radians per frame. With return_frames it ends with
+# a line back to the start, so it can be repeated without wandering off.
+def random_walk_path(frames, step=5, jitter=0.5, return_frames=0, seed=None):
+    rng = random.Random(seed)
+    heading = rng.uniform(0, 2 * math.pi)
+    x = y = 0.0
+    path = []
+    for _ in range(frames):
+        heading += rng.uniform(-jitter, jitter)
+        length = step * rng.uniform(0.5, 1.5)
+        x += length * math.cos(heading)
+        y += length * math.sin(heading)
+        path.append((x, y))
+    if return_frames:
+        path += line_path((0, 0), return_frames, start=(x, y))
+    return path
+
+
+# Function to build the classic movemouse pattern: up, wait, down, wait.
+def up_down_path(step, move_frames, hold_frames):
+    return (line_path((0, -step), move_frames) + hold_path((0, -step), hold_frames)
+            + line_path((0, 0), move_frames, start=(0, -step)) + hold_path((0, 0), hold_frames))
+
+
+# --- Backends: move the cursor by a relative amount ---
+
+class PyAutoGUIBackend:
+    """Moves the real cursor with pyautogui (without its per-call PAUSE)."""
+
+    def __init__(self):
+        import pyautogui  # Imported here: needs a display
+        self._pyautogui = pyautogui
+
+    def move_by(self, dx, dy):
+        self._pyautogui.move(dx, dy, _pause=False)
+
+    def position(self):
+        return tuple(self._pyautogui.position())
+
+
+class PynputBackend:
+    """Moves the real cursor with pynput."""
+
+    def __init__(self):
+        from pynput.mouse import Controller  # Imported here: needs a display
+        self._mouse = Controller()
+
+    def move_by(self, dx, dy):
+        self._mouse.move(dx, dy)
+
+    def position(self):
+        return tuple(self._mouse.position)
+
+
+class FakeCursor:
+    """A cursor that only exists in memory, for tests and benchmarks."""
+
+    def __init__(self, x=0, y=0, record=False):
+        self.x = x
+        self.y = y
+        self.moves = 0
+        self.history = [] if record else None
+
+    def move_by(self, dx, dy):
+        self.x += dx
+        self.y += dy
+        self.moves += 1
+        if self.history is not None:
+            self.history.append((self.x, self.y))
+
+    def position(self):
+        return (self.x, self.y)
+
+
+BACKENDS = {"pyautogui": PyAutoGUIBackend, "pynput": PynputBackend, "fake": FakeCursor}
+
+
+class MotionEngine:
+    """Plays paths on a cursor backend, one point per frame at a fixed frame rate.
+
+    Frames are scheduled at absolute deadlines by a PacedLoop, so a path of n
+    frames takes n / fps seconds however long the backend takes per move (as
+    long as it keeps up). stop() interrupts a movement between two frames;
+    wait() blocks until a non-repeating path has been played to its end.
+    """
+
+    def __init__(self, backend, fps=60):
+        # The frame interval is 1 / fps, worked out on the loop thread, where
+        # a bad rate would only stop the movement.
+        if not 0 < fps < float("inf"):
+            raise ValueError(f"fps must be a number greater than 0, not {fps!r}")
+        self.backend = backend
+        self.fps = fps
+        self._path = []
+        self._repeat = False
+        self._frame = 0
+        self._last = (0, 0)  # Rounded offset of the last frame played.
+        self._finished = threading.Event()
+        self._finished.set()
+        self._lock = threading.Lock()  # Orders play() against the end of the previous run.
+        self._run = None  # Number of the loop run playing the current path.
+        self._loop = PacedLoop(self._next_frame, self._frame_intervals, on_finished=self._on_finished)
+
+    @property
+    def stats(self):
+        return self._loop.stats
+
+    @property
+    def running(self):
+        return self._loop.running
+
+    def play(self, path, repeat=False):
+        # Start playing path from the current cursor position (stopping the
+        # previous path where it is).
+        path = list(path)
+        self.stop()
+        if not path:
+            return
+        self._path = path
+        self._repeat = repeat
+        with self._lock:
+            self._finished.clear()
+            self._run = self._loop.start()
+
+    def stop(self):
+        self._loop.stop()
+        self._finished.set()
+
+    def _on_finished(self):
+        # The end of an earlier path that was replaced by play() is ignored.
+        with self._lock:
+            if self._loop.finished_run == self._run:
+                self._finished.set()
+
+    def wait(self, timeout=None):
+        return self._finished.wait(timeout)
+
+    def close(self):
+        self._loop.close()
+        self._finished.set()
+
+    def _frame_intervals(self):
+        # Called by the loop on every start: begin the path at its first frame.
+        self._frame = 0
+        self._last = (0, 0)
+        frames = constant_intervals(self.fps)
+        return frames if self._repeat else islice(frames, len(self._path))
+
+    def _next_frame(self):
+        index = self._frame % len(self._path)
+        if index == 0:
+            self._last = (0, 0)  # Paths are relative to where each repetition starts.
+        x, y = self._path[index]
+        target = (round(x), round(y))
+        dx, dy = target[0] - self._last[0], target[1] - self._last[1]
+        if dx or dy:
+            self.backend.move_by(dx, dy)
+        self._last = target
+        self._frame += 1
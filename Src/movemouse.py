@@ -1,30 +1,108 @@
-import pyautogui
+import argparse  # Command line options
 import time
-import keyboard
+from hotkeys import HotkeyManager
+from mouse_motion import (BACKENDS, FakeCursor, MotionEngine, circle_path, random_walk_path,
+                          up_down_path)
 
 
-# Movement settings
-step = 50 # Pixels to move up and down
-delay = 0.5 # Seconds to wait between moves
-running = True # Controls the loop
+# Functions to check the numbers given on the command line (argparse types).
+def positive_float(text):
+    value = float(text)
+    if not 0 < value < float("inf"):
+        raise argparse.ArgumentTypeError(f"must be a number greater than 0, got {text}")
+    return value
 
-# Define an exit funciton 
-def stop_script():
-    global running
-    running = False
-    print("\nExit command received. Stopping script.")
 
-# Set 'q' as the exit key
-keyboard.add_hotkey("q", stop_script)
+def positive_int(text):
+    value = int(text)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {text}")
+    return value
 
-print("Mouse movement started. Press 'q' to exit.")
 
-# Continuous loop to move the mouse up and down
-while running:
-    pyautogui.moveRel(0, -step, duration=0.2) # Move up relative to current position
-    time.sleep(delay)
+def non_negative_float(text):
+    value = float(text)
+    if not 0 <= value < float("inf"):
+        raise argparse.ArgumentTypeError(f"must be a number not below 0, got {text}")
+    return value
 
-    pyautogui.moveRel(0, step, duration=0.2) # Move downq relative to current position
-    time.sleep(delay)
 
-print("Script exited successfully.")
\ No newline at end of file
+# Function to build the path selected on the command line.
+def make_path(args):
+    move_frames = max(1, round(args.move_time * args.fps))
+    if args.path == "circle":
+        return circle_path(args.step, max(3, round(args.circle_time * args.fps)))
+    if args.path == "walk":
+        return random_walk_path(round(args.move_time * args.fps * 10), step=max(1, args.step / move_frames),
+                                return_frames=move_frames)
+    # Up and down: step pixels up, wait, back down, wait.
+    return up_down_path(args.step, move_frames, round(args.delay * args.fps))
+
+
+# Function to print the achieved frame rate and timing of the engine.
+def print_stats(stats):
+    summary = stats.summary()
+    if "rate" in summary:
+        print(f"{summary['count']} frames, {summary['rate']:.1f} fps, jitter {summary['jitter_ms']:.3f} ms, "
+              f"late {summary['lateness_mean_ms']:.3f} ms avg / {summary['lateness_max_ms']:.3f} ms max")
+
+
+# Function to play the path on a fake cursor and check timing and end position.
+def benchmark(path, fps, repetitions):
+    cursor = FakeCursor()
+    engine = MotionEngine(cursor, fps)
+    started = time.perf_counter()
+    for _ in range(repetitions):
+        engine.play(path)
+        engine.wait()
+    elapsed = time.perf_counter() - started
+    engine.close()
+    expected = repetitions * len(path) / fps
+    print(f"{repetitions} x {len(path)} frames in {elapsed:.3f} s (expected {expected:.3f} s), "
+          f"{cursor.moves} moves, cursor ends at {cursor.position()}")
+    print_stats(engine.stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep the mouse moving until the quit key is pressed.")
+    parser.add_argument("--path", choices=["updown", "circle", "walk"], default="updown")
+    parser.add_argument("--step", type=int, default=50, help="pixels to move up and down (circle radius)")
+    parser.add_argument("--move-time", type=positive_float, default=0.2, help="seconds per movement")
+    parser.add_argument("--delay", type=non_negative_float, default=0.5, help="seconds to wait between moves")
+    parser.add_argument("--circle-time", type=positive_float, default=2.0, help="seconds per circle")
+    parser.add_argument("--fps", type=positive_float, default=60, help="cursor updates per second")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="pyautogui")
+    parser.add_argument("--quit-key", default="q")
+    parser.add_argument("--benchmark", type=positive_int, metavar="REPETITIONS",
+                        help="play the path on a fake cursor and print the timing")
+    args = parser.parse_args()
+
+    path = make_path(args)
+    if args.benchmark:
+        benchmark(path, args.fps, args.benchmark)
+        return
+
+    engine = MotionEngine(BACKENDS[args.backend](), args.fps)
+    hotkeys = HotkeyManager()
+
+    # Define an exit funciton: stops the movement right away, even mid-move
+    def stop_script():
+        engine.stop()
+        hotkeys.stop()
+        print("\nExit command received. Stopping script.")
+
+    hotkeys.bind(args.quit_key, stop_script, "quit")
+    hotkeys.start()
+
+    print(f"Mouse movement started. Press '{args.quit_key}' to exit.")
+    engine.play(path, repeat=True)
+    hotkeys.wait()
+    engine.close()
+
+    print_stats(engine.stats)
+    hotkeys.print_latency()
+    print("Script exited successfully.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+import time  # perf_counter_ns and sleep
+import math  # Square root for the jitter
+import threading  # Worker thread, parking and wake-up events
+from collections import deque  # Recent timestamps for the statistics
+
+
+# The last part of every wait is spent spinning on perf_counter_ns instead of
+# sleeping, because the OS may oversleep by about a timer tick.
+SPIN_NS = 1_500_000
+NS_PER_SECOND = 1_000_000_000
+
+
+# Function to wait until an absolute perf_counter_ns() deadline.
+# Sleeps (or waits on the interrupt event) for most of the time and spins for
+# the last spin_ns. Returns False if the interrupt event was set before the
+# deadline, True once the deadline has been reached.
+def sleep_until(deadline_ns, interrupt=None, spin_ns=SPIN_NS):
+    while True:
+        remaining = deadline_ns - time.perf_counter_ns()
+        if remaining <= spin_ns:
+            break
+        timeout = (remaining - spin_ns) / NS_PER_SECOND
+        if interrupt is None:
+            time.sleep(timeout)
+        elif interrupt.wait(timeout):
+            return False
+    while time.perf_counter_ns() < deadline_ns:
+        if interrupt is not None and interrupt.is_set():
+            return False
+    return True
+
+
+# Interval generators for PacedLoop: they yield the seconds until the next action.
+
+def constant_intervals(rate):
+    # rate actions per second, evenly spaced.
+    interval = 1.0 / rate
+    while True:
+        yield interval
+
+
+def burst_intervals(rate, burst_size, pause):
+    # burst_size actions at rate per second, then a pause of pause seconds.
+    interval = 1.0 / rate
+    while True:
+        yield pause + interval
+        for _ in range(burst_size - 1):
+            yield interval
+
+
+def pattern_intervals(intervals, repeat=True):
+    # The given intervals (seconds) in order, over and over unless repeat is False.
+    while True:
+        yield from intervals
+        if not repeat:
+            return
+
+
+class RateStats:
+    """Achieved rate and timing error of a deadline-driven loop.
+
+    record() gets the deadline and the actual time of every action (both
+    perf_counter_ns); summary() reports the rate, the jitter (standard
+    deviation of the intervals between actions) and how late the actions
+    were, over the last window actions.
+    """
+
+    def __init__(self, window=1000):
+        self._lock = threading.Lock()
+        self._times = deque(maxlen=window)
+        self._lateness = deque(maxlen=window)
+        self.count = 0
+        self.resyncs = 0  # Times the loop fell too far behind and skipped ahead.
+
+    def record(self, deadline_ns, actual_ns):
+        with self._lock:
+            self._times.append(actual_ns)
+            self._lateness.append(actual_ns - deadline_ns)
+            self.count += 1
+
+    def record_resync(self):
+        with self._lock:
+            self.resyncs += 1
+
+    def reset(self):
+        with self._lock:
+            self._times.clear()
+            self._lateness.clear()
+            self.count = 0
+            self.resyncs = 0
+
+    def summary(self):
+        with self._lock:
+            times = list(self._times)
+            lateness = list(self._lateness)
+            result = {"count": self.count, "resyncs": self.resyncs}
+        if len(times) < 2:
+            return result
+        intervals = [later - earlier for earlier, later in zip(times, times[1:])]
+        mean = sum(intervals) / len(intervals)
+        variance = sum((interval - mean) ** 2 for interval in intervals) / len(intervals)
+        result.update({
+            "rate": NS_PER_SECOND / mean if mean else float("inf"),
+            "interval_mean_ms": mean / 1e6,
+            "jitter_ms": math.sqrt(variance) / 1e6,
+            "lateness_mean_ms": sum(lateness) / len(lateness) / 1e6,
+            "lateness_max_ms": max(lateness) / 1e6,
+        })
+        return result
+
+
+class PacedLoop:
+    """Calls an action on its own thread at absolute deadlines.
+
+    Deadlines are computed from the previous deadline, not from when the
+    action finished, so the rate does not drift. intervals is a function
+    returning a fresh iterator of seconds-until-next-action (see the interval
+    generators above); it is called every time the loop is started. While
+    stopped, the thread is parked on an event and uses no CPU, and stop() or
+    close() interrupt a wait at once. If the loop falls more than max_lag
+    seconds behind (e.g. the action blocked), it skips ahead instead of
+    firing the missed actions in a burst. A finite interval iterator stops
+    the loop when it ends.
+
+    Every start() begins a new run and returns its number. When on_finished
+    is called, finished_run holds the number of the run that ended, so
+    callers can ignore the end of a run that was already replaced by a newer
+    one.
+    """
+
+    def __init__(self, action, intervals, max_lag=0.05, spin_ns=SPIN_NS, on_finished=None):
+        self.action = action
+        self.intervals = intervals
+        self.max_lag_ns = int(max_lag * NS_PER_SECOND)
+        self.spin_ns = spin_ns
+        self.on_finished = on_finished  # Called (on the loop thread) when a finite run ends.
+        self.stats = RateStats()
+        self._lock = threading.Lock()  # Orders start() against the end of a run.
+        self._run_number = 0
+        self.finished_run = None  # Number of the last run that ended on its own.
+        self._enabled = threading.Event()
+        self._changed = threading.Event()  # Wakes the thread when enabled/closed changes.
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def running(self):
+        return self._enabled.is_set()
+
+    def start(self):
+        with self._lock:
+            self._run_number += 1
+            self._enabled.set()
+            self._changed.set()
+            return self._run_number
+
+    def stop(self):
+        self._enabled.clear()
+        self._changed.set()
+
+    def toggle(self):
+        if self.running:
+            self.stop()
+        else:
+            self.start()
+
+    def close(self):
+        self._closed = True
+        self._enabled.set()  # Unpark the thread so it can exit.
+        self._changed.set()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            self._enabled.wait()
+            if self._closed:
+                return
+            self._changed.clear()
+            self._run_until_stopped()
+
+    def _run_until_stopped(self):
+        with self._lock:
+            run = self._run_number
+        intervals = iter(self.intervals())
+        deadline = time.perf_counter_ns()
+        while self._enabled.is_set() and not self._closed:
+            try:
+                interval = next(intervals)
+            except StopIteration:
+                with self._lock:
+                    if run != self._run_number:
+                        return  # Restarted meanwhile: the new run must keep going.
+                    self._enabled.clear()
+                    self.finished_run = run
+                if self.on_finished is not None:
+                    self.on_finished()
+                return
+            deadline += int(interval * NS_PER_SECOND)
+            if not sleep_until(deadline, self._changed, self.spin_ns):
+                return  # Stopped, closed or restarted; _run decides what comes next.
+            now = time.perf_counter_ns()
+            self.action()
+            self.stats.record(deadline, now)
+            if now - deadline > self.max_lag_ns:
+                self.stats.record_resync()
+                deadline = now
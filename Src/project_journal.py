@@ -0,0 +1,209 @@
+import os  # File paths and sizes
+import json  # Encoding of journal records and snapshots
+import shutil  # Appending a journal to a left-over one
+import argparse  # Command line for importing/exporting projects.json
+import threading  # Background compaction
+
+from project_store import (DATA_DIR, DATA_FILE, ProjectStore, atomic_write_text, load_projects,
+                           projects_from_json, projects_to_json, save_projects)
+from project_task import Task
+
+
+# Default locations of the journal backend inside the data directory.
+JOURNAL_FILE = os.path.join(DATA_DIR, "projects.journal")
+SNAPSHOT_FILE = os.path.join(DATA_DIR, "projects.snapshot.json")
+
+
+class JournalProjectStore(ProjectStore):
+    """Project store that appends one record per change instead of rewriting everything.
+
+    State on disk is a snapshot (the full projects dictionary plus the sequence
+    number of the last change it contains) and a journal with one compact JSON
+    line per change after that. Once the journal grows past
+    compact_threshold bytes it is folded into a fresh snapshot in the background.
+    """
+
+    def __init__(self, journal_path=JOURNAL_FILE, snapshot_path=SNAPSHOT_FILE,
+                 import_path=DATA_FILE, compact_threshold=4 * 1024 * 1024):
+        self.snapshot_path = snapshot_path
+        self.import_path = import_path  # projects.json to import if there is no snapshot yet.
+        self.compact_threshold = compact_threshold
+        self._seq = 0  # Sequence number of the last applied change.
+        self._journal = None  # Open append handle of the journal file.
+        self._compacting = False
+        super().__init__(journal_path, flush_delay=0)
+        self._compaction_done = threading.Condition(self._lock)  # Notified when a compaction has finished.
+
+    @property
+    def _old_journal_path(self):
+        # While a compaction runs, the previous journal is parked under this name.
+        return self.path + ".old"
+
+    # --- Loading ---
+
+    def reload(self):
+        with self._lock:
+            self._close_journal()
+            if not os.path.exists(self.snapshot_path) and not os.path.exists(self.path):
+                # First start: take over the existing projects.json (tasks get their ids here).
+                self._set_projects(projects_from_json(load_projects(self.import_path)) if self.import_path else {})
+                self._seq = 0
+                self._write_snapshot(self._project_lists(), self._seq)
+            else:
+                try:
+                    with open(self.snapshot_path, "r") as file:
+                        snapshot = json.load(file)
+                except FileNotFoundError:
+                    snapshot = {"seq": 0, "projects": {}}
+                self._set_projects(projects_from_json(snapshot["projects"]))
+                self._seq = snapshot["seq"]
+                # Replay everything newer than the snapshot, oldest journal first.
+                for path in (self._old_journal_path, self.path):
+                    self._replay(path)
+            self._journal = open(self.path, "a")
+            self._dirty = False
+
+    def _replay(self, path):
+        try:
+            file = open(path, "r")
+        except FileNotFoundError:
+            return
+        with file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn last line from a crash mid-append; everything before it is valid.
+                    break
+                if record["seq"] > self._seq:
+                    if "task" in record:
+                        record["task"] = Task.from_dict(record["task"])
+                    self._apply(record)
+                    self._seq = record["seq"]
+
+    def _refresh_if_changed(self):
+        # The journal is owned by this process; there is nothing to pick up.
+        pass
+
+    # --- Appending changes ---
+
+    def _record(self, record):
+        self._seq += 1
+        record["seq"] = self._seq
+        self._journal.write(json.dumps(record, separators=(",", ":"), default=Task.to_dict) + "\n")
+        self._journal.flush()
+        if not self._compacting and self._journal.tell() >= self.compact_threshold:
+            self._start_compaction()
+
+    def flush(self):
+        # Changes are appended as they happen; just make sure they reached the disk.
+        with self._lock:
+            if self._journal is not None and not self._journal.closed:
+                self._journal.flush()
+                os.fsync(self._journal.fileno())
+
+    def close(self):
+        with self._lock:
+            super().close()
+            self._close_journal()
+
+    def _close_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    # --- Compaction ---
+
+    def _start_compaction(self):
+        # Write the snapshot on a background thread so the caller does not wait.
+        projects, seq = self._rotate_journal()
+        thread = threading.Thread(target=self._compact, args=(projects, seq), daemon=True)
+        thread.start()
+
+    def _rotate_journal(self):
+        # Park the current journal and start a new one, and take a consistent copy
+        # of the data. Changes made while the snapshot is being written go to the
+        # new journal and are replayed on top of the snapshot.
+        self._compacting = True
+        self._close_journal()
+        if os.path.exists(self._old_journal_path):
+            # An earlier compaction failed and left its journal behind, and the
+            # snapshot does not contain those records yet: append the current
+            # journal to it, so the new snapshot replaces both. (A crash in
+            # between leaves records in both files; replay skips the repeats.)
+            with open(self.path, "r") as source, open(self._old_journal_path, "a") as target:
+                shutil.copyfileobj(source, target)
+                target.flush()
+                os.fsync(target.fileno())
+            os.remove(self.path)
+        else:
+            os.replace(self.path, self._old_journal_path)
+        self._journal = open(self.path, "a")
+        return self._project_lists(), self._seq
+
+    def _compact(self, projects, seq):
+        try:
+            self._write_snapshot(projects, seq)
+            os.remove(self._old_journal_path)
+        finally:
+            with self._lock:
+                self._compacting = False
+                self._compaction_done.notify_all()
+
+    def compact(self):
+        # Fold the journal into the snapshot right now (on the calling thread).
+        with self._lock:
+            if self._compacting:
+                return
+            projects, seq = self._rotate_journal()
+        self._compact(projects, seq)
+
+    def _write_snapshot(self, projects, seq):
+        with self._write_lock:
+            snapshot = {"seq": seq, "projects": projects_to_json(projects)}
+            atomic_write_text(self.snapshot_path, json.dumps(snapshot, separators=(",", ":")))
+
+    # --- projects.json interchange ---
+
+    def export_json(self, path=DATA_FILE):
+        # Write the current state in the regular projects.json format.
+        save_projects(self.to_dict(), path)
+
+    def import_json(self, path=DATA_FILE):
+        # Replace the current state with the contents of a projects.json file.
+        projects = projects_from_json(load_projects(path))
+        with self._lock:
+            # A running compaction would write its older snapshot over the imported one.
+            while self._compacting:
+                self._compaction_done.wait()
+            self._close_journal()
+            self._set_projects(projects)
+            self._seq += 1
+            self._write_snapshot(self._project_lists(), self._seq)
+            for journal in (self._old_journal_path, self.path):
+                if os.path.exists(journal):
+                    os.remove(journal)
+            self._journal = open(self.path, "a")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import or export the journal storage as projects.json.")
+    parser.add_argument("action", choices=["import", "export", "compact"])
+    parser.add_argument("path", nargs="?", default=DATA_FILE, help="projects.json file (default: %(default)s)")
+    args = parser.parse_args()
+
+    store = JournalProjectStore()
+    if args.action == "import":
+        store.import_json(args.path)
+        print(f"Imported {args.path} into {store.path}")
+    elif args.action == "export":
+        store.export_json(args.path)
+        print(f"Exported {store.path} to {args.path}")
+    else:
+        store.compact()
+        print(f"Compacted {store.path} into {store.snapshot_path}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
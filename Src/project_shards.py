@@ -0,0 +1,369 @@
+import os  # File paths, stat() and removing shard files
+import json  # Manifest and shard files
+import time  # Time stamp in the name of a conflict backup
+import hashlib  # Collision-free shard file names
+import argparse  # Command line for importing/exporting projects.json
+from collections import OrderedDict  # LRU order of the loaded shards
+
+from project_store import (DATA_DIR, DATA_FILE, ProjectStore, atomic_write_text, load_projects,
+                           projects_from_json, projects_to_json, save_projects)
+from project_task import Task
+
+
+# Default location of the sharded layout: a manifest plus one file per project.
+SHARD_DIR = os.path.join(DATA_DIR, "projects")
+MANIFEST_NAME = "manifest.json"
+# Number of projects kept in memory at most (projects with unsaved changes are always kept).
+MAX_LOADED_PROJECTS = 16
+
+
+# Function to build the shard file name of a project. The readable part is
+# cleaned up for the file system; the hash keeps names apart that only differ
+# in case or in the removed characters.
+def shard_file_name(project_name):
+    readable = "".join(c if c.isalnum() or c in "-_" else "_" for c in project_name)[:40]
+    return f"{readable}-{hashlib.sha1(project_name.encode()).hexdigest()[:10]}.json"
+
+
+# Function to get the (mtime, size) of a file, or None if it does not exist.
+def file_signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+# Function to read a manifest; None if there is none (yet).
+def load_manifest(path):
+    try:
+        with open(path, "r") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+class _ShardMap:
+    """The projects of a ShardedProjectStore as {name: {task id: Task}}.
+
+    Behaves like the dictionary ProjectStore keeps in _projects, but a
+    project's tasks are only read from its shard when they are first accessed,
+    and only the max_loaded most recently used projects stay in memory.
+    Projects with unsaved changes are never dropped.
+    """
+
+    def __init__(self, store, entries, max_loaded):
+        self._store = store
+        self.entries = entries  # {name: {"file": shard file name, "tasks": count}}, in project order
+        self.max_loaded = max_loaded
+        self._loaded = OrderedDict()  # name -> {task id: Task}, least recently used first
+        self.removed_files = set()  # Shards of deleted projects, removed on the next flush.
+
+    def __contains__(self, project_name):
+        return project_name in self.entries
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def keys(self):
+        return self.entries.keys()
+
+    def get(self, project_name, default=None):
+        if project_name not in self.entries:
+            return default
+        return self[project_name]
+
+    def __getitem__(self, project_name):
+        tasks = self._loaded.get(project_name)
+        if tasks is not None:
+            self._loaded.move_to_end(project_name)
+            return tasks
+        entry = self.entries[project_name]
+        tasks = self._store._read_shard(entry["file"])
+        self._loaded[project_name] = tasks
+        self._evict(keep=project_name)
+        return tasks
+
+    def __setitem__(self, project_name, tasks):
+        file_name = shard_file_name(project_name)
+        self.entries[project_name] = {"file": file_name, "tasks": len(tasks)}
+        self.removed_files.discard(file_name)
+        self._loaded[project_name] = tasks
+        self._evict(keep=project_name)
+
+    def __delitem__(self, project_name):
+        entry = self.entries.pop(project_name)
+        self._loaded.pop(project_name, None)
+        self.removed_files.add(entry["file"])
+
+    def items(self):
+        # Reads every project; only used for whole-store operations like to_dict().
+        for project_name in list(self.entries):
+            yield project_name, self[project_name]
+
+    def values(self):
+        for _, tasks in self.items():
+            yield tasks
+
+    def is_loaded(self, project_name):
+        return project_name in self._loaded
+
+    def _evict(self, keep=None):
+        # Drop the least recently used projects without unsaved changes. The
+        # project in keep is about to be handed out (and possibly changed), so
+        # it stays even when everything else is dirty.
+        dirty = self._store._dirty_projects
+        for project_name in list(self._loaded):
+            if len(self._loaded) <= self.max_loaded:
+                break
+            if project_name not in dirty and project_name != keep:
+                del self._loaded[project_name]
+                self._store._forget(project_name)
+
+
+class ShardedProjectStore(ProjectStore):
+    """Project store with a small manifest and one JSON file per project.
+
+    Opening the store only reads the manifest (project names, task counts and
+    the next task id); a project's shard is read when the project is first
+    used, and at most max_loaded projects are kept in memory. A flush writes
+    the shards of the changed projects and the manifest, so adding or
+    deleting a project touches only the manifest and that project's shard.
+
+    projects.json is migrated automatically: it is imported when there is no
+    manifest yet or when it was changed since the last import/export (i.e.
+    the single-file store was used in between), and open_store() exports the
+    shards back to it before opening the single-file store if they changed.
+    If both were changed since they were last in sync, the shards are saved to
+    a backup file (see conflict_backup) before projects.json is imported.
+    """
+
+    def __init__(self, shard_dir=SHARD_DIR, import_path=DATA_FILE, flush_delay=2.0,
+                 max_loaded=MAX_LOADED_PROJECTS):
+        self.shard_dir = shard_dir
+        self.import_path = import_path  # projects.json kept in sync with the shards.
+        self.max_loaded = max_loaded
+        self._dirty_projects = set()  # Projects whose shard must be written on the next flush.
+        self._single_file = {"signature": None, "in_sync": True}  # State of projects.json, see export_if_changed.
+        self.conflict_backup = None  # Backup of the shards written when projects.json was imported over them.
+        os.makedirs(shard_dir, exist_ok=True)
+        super().__init__(os.path.join(shard_dir, MANIFEST_NAME), flush_delay)
+
+    # --- Loading ---
+
+    def reload(self):
+        with self._lock:
+            self._dirty_projects = set()
+            manifest = load_manifest(self.path)
+            if manifest is None or self._single_file_changed(manifest):
+                # First start, or projects.json was edited by the single-file store: import it.
+                # Nothing else can hold unsaved changes here, so flushing under the lock is safe.
+                if manifest is not None and not manifest.get("single_file", {}).get("in_sync", False):
+                    # The shards were changed too: keep their state instead of overwriting it.
+                    self.conflict_backup = self._backup_shards(manifest)
+                self._import_single_file(self.import_path)
+                self.flush(keep_in_sync=True)
+                self._projects._evict()
+                return
+            self._next_id = manifest["next_id"]
+            self._single_file = manifest.get("single_file", {"signature": None, "in_sync": False})
+            self._projects = _ShardMap(self, manifest["projects"], self.max_loaded)
+            self._digests = {}
+            self._indexes = {}
+            self._sorted = {}
+            self._signature = self._stat_signature()
+            self._dirty = False
+
+    def _single_file_changed(self, manifest):
+        if not self.import_path:
+            return False
+        signature = file_signature(self.import_path)
+        recorded = manifest.get("single_file", {}).get("signature")
+        return signature is not None and signature != recorded
+
+    def _backup_shards(self, manifest):
+        # Write the projects of the shards named in manifest to a new file
+        # next to projects.json, in the same format; returns its path.
+        shards = _ShardMap(self, manifest["projects"], self.max_loaded)
+        projects = {name: list(shards[name].values()) for name in manifest["projects"]}
+        stem = f"{os.path.splitext(self.import_path)[0]}.shards-{time.strftime('%Y%m%d-%H%M%S')}"
+        path, number = f"{stem}.json", 1
+        while os.path.exists(path):
+            number += 1
+            path = f"{stem}-{number}.json"
+        save_projects(projects_to_json(projects), path)
+        return path
+
+    def _import_single_file(self, path):
+        # Replace the shards with the contents of a projects.json file.
+        projects = projects_from_json(load_projects(path)) if path else {}
+        self._set_projects(projects)  # Gives tasks without an id one; leaves a plain dict.
+        loaded = self._projects
+        self._dirty_projects = set(loaded)  # Also keeps them in memory until written.
+        self._projects = _ShardMap(self, {}, self.max_loaded)
+        for project_name, tasks in loaded.items():
+            self._projects[project_name] = tasks
+        if path == self.import_path:
+            self._single_file = {"signature": file_signature(path) if path else None, "in_sync": True}
+        else:
+            # Imported from another file: the shards now differ from projects.json.
+            self._single_file = {"signature": file_signature(self.import_path), "in_sync": False}
+        # Shard files of an earlier state that are not part of the import.
+        wanted = {entry["file"] for entry in self._projects.entries.values()}
+        self._projects.removed_files = {name for name in os.listdir(self.shard_dir)
+                                        if name.endswith(".json") and name != MANIFEST_NAME and name not in wanted}
+        self._dirty = True
+
+    def _read_shard(self, file_name):
+        try:
+            with open(os.path.join(self.shard_dir, file_name), "r") as file:
+                tasks = [Task.from_dict(task) for task in json.load(file)]
+        except FileNotFoundError:
+            tasks = []
+        return {task.id: task for task in tasks}
+
+    def _forget(self, project_name):
+        # Called when a project is dropped from memory: its index and sorted
+        # order refer to the dropped Task records. The digest stays valid.
+        self._indexes.pop(project_name, None)
+        self._sorted.pop(project_name, None)
+
+    def loaded_projects(self):
+        # Names of the projects currently held in memory (for tests and statistics).
+        with self._lock:
+            return [name for name in self._projects if self._projects.is_loaded(name)]
+
+    # --- Persistence ---
+
+    def _commit(self, record):
+        # Mark the project dirty before _apply() reads its shard, so it cannot
+        # be dropped from memory between being changed and being written.
+        project_name = record["project"]
+        was_dirty = project_name in self._dirty_projects
+        if record["op"] != "delete_project":
+            self._dirty_projects.add(project_name)
+        try:
+            return super()._commit(record)
+        except Exception:
+            if not was_dirty:
+                self._dirty_projects.discard(project_name)
+            raise
+
+    def _record(self, record):
+        if record["op"] == "delete_project":
+            self._dirty_projects.discard(record["project"])
+        else:
+            self._dirty_projects.add(record["project"])
+        self._mark_dirty()
+
+    def _manifest(self):
+        return {"version": 1, "next_id": self._next_id, "single_file": self._single_file,
+                "projects": self._projects.entries}
+
+    def flush(self, keep_in_sync=False):
+        # Write the changed shards, then the manifest, then remove the shards
+        # of deleted projects. The manifest never names a shard that is not
+        # written yet, so a crash in between loses at most the last changes.
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                shards = {}
+                for project_name in self._dirty_projects:
+                    tasks = self._projects[project_name]
+                    entry = self._projects.entries[project_name]
+                    entry["tasks"] = len(tasks)
+                    shards[entry["file"]] = json.dumps([task.to_dict() for task in tasks.values()], indent=4)
+                removed = self._projects.removed_files - set(shards)
+                if not keep_in_sync:
+                    self._single_file = dict(self._single_file, in_sync=False)
+                manifest = json.dumps(self._manifest(), indent=4)
+                written = self._dirty_projects
+                self._dirty_projects = set()
+                self._projects.removed_files = set()
+                self._dirty = False
+            try:
+                for file_name, text in shards.items():
+                    atomic_write_text(os.path.join(self.shard_dir, file_name), text)
+                atomic_write_text(self.path, manifest)
+                for file_name in removed:
+                    try:
+                        os.remove(os.path.join(self.shard_dir, file_name))
+                    except FileNotFoundError:
+                        pass
+            except OSError:
+                # Keep the changes pending so the next flush retries them.
+                with self._lock:
+                    self._dirty = True
+                    self._dirty_projects |= {name for name in written if name in self._projects}
+                    self._projects.removed_files |= removed
+                raise
+            with self._lock:
+                self._signature = self._stat_signature()
+
+    # --- projects.json interchange ---
+
+    def export_json(self, path=None):
+        # Write the current state in the regular projects.json format. When
+        # written to import_path, the shards count as in sync with it.
+        path = path or self.import_path
+        save_projects(self.to_dict(), path)
+        if path == self.import_path:
+            with self._lock:
+                self._single_file = {"signature": file_signature(path), "in_sync": True}
+                self._dirty = True
+            self.flush(keep_in_sync=True)
+
+    def import_json(self, path=None):
+        # Replace the current state with the contents of a projects.json file.
+        self.flush()
+        with self._lock:
+            self._import_single_file(path or self.import_path)
+        self.flush(keep_in_sync=True)
+        with self._lock:
+            self._projects._evict()
+
+
+# Function to bring projects.json up to date with the shards before the
+# single-file store is opened, if the shards were changed since the last
+# import or export. Returns True if projects.json was written.
+def export_if_changed(json_path=DATA_FILE, shard_dir=SHARD_DIR):
+    manifest = load_manifest(os.path.join(shard_dir, MANIFEST_NAME))
+    if manifest is None or manifest.get("single_file", {}).get("in_sync", True):
+        return False
+    store = ShardedProjectStore(shard_dir, import_path=json_path)
+    try:
+        if not store._single_file.get("in_sync"):
+            store.export_json(json_path)
+            return True
+        # projects.json was changed as well and has just been imported instead;
+        # the shards were saved to store.conflict_backup first.
+        return False
+    finally:
+        store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate projects between projects.json and the sharded storage.")
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("path", nargs="?", default=DATA_FILE, help="projects.json file (default: %(default)s)")
+    args = parser.parse_args()
+
+    store = ShardedProjectStore()
+    if args.action == "import":
+        store.import_json(args.path)
+        print(f"Imported {args.path} into {store.shard_dir}")
+    else:
+        store.export_json(args.path)
+        print(f"Exported {store.shard_dir} to {args.path}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+import os  # File paths
+import sqlite3  # Embedded database engine
+import argparse  # Command line for migrating to/from projects.json
+import threading  # The connection is shared between the GUI and background threads
+
+from project_store import DATA_DIR, DATA_FILE, load_projects, projects_to_json, save_projects
+from project_task import Task, parse_minutes, tasks_digest
+
+
+# Default location of the SQLite database inside the data directory.
+DATABASE_FILE = os.path.join(DATA_DIR, "projects.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    start_time INTEGER NOT NULL,
+    end_time INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_project_start ON tasks(project_id, start_time);
+CREATE INDEX IF NOT EXISTS tasks_project_end ON tasks(project_id, end_time);
+"""
+
+
+class SqliteProjectStore:
+    """Project store backed by a local SQLite database.
+
+    Offers the same methods as ProjectStore except interval_index(), but
+    nothing is held in memory. Task times are stored as the integer minutes
+    that Task records use, so sorted task lists, time-range and overlap
+    queries and deletes are single indexed statements; every change is
+    committed as its own small transaction. The row id of a task is its task id.
+    """
+
+    def __init__(self, path=DATABASE_FILE, import_path=DATA_FILE):
+        self.path = path
+        self._lock = threading.RLock()
+        self._digests = {}  # Cached content hash per project.
+        self._data_version = None  # Changes when another connection modifies the database.
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        is_new = not os.path.exists(self.path)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA foreign_keys = ON")
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.executescript(SCHEMA)
+        if is_new and import_path and os.path.exists(import_path):
+            # One-shot migration of the existing projects.json on first start.
+            self.import_json(import_path)
+
+    def _project_id(self, project_name):
+        row = self._db.execute("SELECT id FROM projects WHERE name = ?", (project_name,)).fetchone()
+        if row is None:
+            raise KeyError(project_name)
+        return row[0]
+
+    # --- Reads ---
+
+    def project_names(self):
+        with self._lock:
+            return [name for (name,) in self._db.execute("SELECT name FROM projects ORDER BY id")]
+
+    def has_project(self, project_name):
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM projects WHERE name = ?", (project_name,)).fetchone() is not None
+
+    def get_tasks(self, project_name):
+        # Tasks in the order they were added.
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT t.name, t.start_time, t.end_time, t.id FROM tasks t JOIN projects p ON p.id = t.project_id "
+                "WHERE p.name = ? ORDER BY t.id",
+                (project_name,),
+            )
+            return [Task(*row) for row in rows]
+
+    def get_task(self, project_name, task_id):
+        # The task with this id, or None.
+        with self._lock:
+            row = self._db.execute(
+                "SELECT t.name, t.start_time, t.end_time, t.id FROM tasks t JOIN projects p ON p.id = t.project_id "
+                "WHERE p.name = ? AND t.id = ?",
+                (project_name, task_id),
+            ).fetchone()
+            return None if row is None else Task(*row)
+
+    def get_sorted_tasks(self, project_name):
+        # Tasks ordered by start time, straight from the (project, start) index.
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT t.name, t.start_time, t.end_time, t.id FROM tasks t JOIN projects p ON p.id = t.project_id "
+                "WHERE p.name = ? ORDER BY t.start_time, t.id",
+                (project_name,),
+            )
+            return [Task(*row) for row in rows]
+
+    def tasks_in_range(self, project_name, start, end):
+        # Tasks that are active at some point between the two datetime strings
+        # (same rule as IntervalIndex: empty tasks and ranges overlap nothing).
+        start, end = parse_minutes(start), parse_minutes(end)
+        if start >= end:
+            return []
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT t.name, t.start_time, t.end_time, t.id FROM tasks t JOIN projects p ON p.id = t.project_id "
+                "WHERE p.name = ? AND t.start_time < ? AND t.end_time > ? AND t.end_time > t.start_time "
+                "ORDER BY t.start_time, t.id",
+                (project_name, end, start),
+            )
+            return [Task(*row) for row in rows]
+
+    def project_digest(self, project_name):
+        # Content hash of the project's sorted tasks; changes whenever the chart would.
+        with self._lock:
+            data_version = self._db.execute("PRAGMA data_version").fetchone()[0]
+            if data_version != self._data_version:
+                self._digests = {}
+                self._data_version = data_version
+            digest = self._digests.get(project_name)
+            if digest is None:
+                digest = tasks_digest(self.get_sorted_tasks(project_name))
+                self._digests[project_name] = digest
+            return digest
+
+    def overlapping_tasks(self, project_name, task):
+        # The other tasks of the project whose time overlaps the given task.
+        if task.start >= task.end:
+            return []
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT t.name, t.start_time, t.end_time, t.id FROM tasks t JOIN projects p ON p.id = t.project_id "
+                "WHERE p.name = ? AND t.start_time < ? AND t.end_time > ? AND t.end_time > t.start_time "
+                "AND t.id IS NOT ? ORDER BY t.start_time, t.id",
+                (project_name, task.end, task.start, task.id),
+            )
+            return [Task(*row) for row in rows]
+
+    def find_conflicts(self, project_name):
+        # All pairs of overlapping tasks (earlier-starting task first), as one
+        # self-join over the (project, start) index.
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT a.name, a.start_time, a.end_time, a.id, b.name, b.start_time, b.end_time, b.id "
+                "FROM tasks a JOIN projects p ON p.id = a.project_id "
+                "JOIN tasks b ON b.project_id = a.project_id "
+                "AND b.start_time >= a.start_time AND b.start_time < a.end_time "
+                "AND (b.start_time > a.start_time OR b.id > a.id) "
+                "WHERE p.name = ? AND a.end_time > a.start_time AND b.end_time > b.start_time ORDER BY a.start_time, a.id, b.start_time, b.id",
+                (project_name,),
+            )
+            return [(Task(*row[:4]), Task(*row[4:])) for row in rows]
+
+    def to_dict(self):
+        with self._lock:
+            return projects_to_json({name: self.get_tasks(name) for name in self.project_names()})
+
+    # --- Mutations ---
+
+    def add_project(self, project_name):
+        with self._lock, self._db:
+            try:
+                self._db.execute("INSERT INTO projects (name) VALUES (?)", (project_name,))
+            except sqlite3.IntegrityError:
+                return False
+            return True
+
+    def delete_project(self, project_name):
+        # The tasks go with it through ON DELETE CASCADE.
+        with self._lock, self._db:
+            self._digests.pop(project_name, None)
+            return self._db.execute("DELETE FROM projects WHERE name = ?", (project_name,)).rowcount > 0
+
+    def add_task(self, project_name, task):
+        # Store a new task; it gets a fresh id, which is returned.
+        with self._lock, self._db:
+            self._digests.pop(project_name, None)
+            task.id = self._db.execute(
+                "INSERT INTO tasks (project_id, name, start_time, end_time) VALUES (?, ?, ?, ?)",
+                (self._project_id(project_name), task.name, task.start, task.end),
+            ).lastrowid
+            return task.id
+
+    def edit_task(self, project_name, task_id, task):
+        # Replace the task with this id; the new task takes over the id.
+        with self._lock, self._db:
+            self._digests.pop(project_name, None)
+            updated = self._db.execute(
+                "UPDATE tasks SET name = ?, start_time = ?, end_time = ? WHERE id = ? AND project_id = ?",
+                (task.name, task.start, task.end, task_id, self._project_id(project_name)),
+            ).rowcount
+            if not updated:
+                raise KeyError(task_id)
+            task.id = task_id
+
+    def delete_task(self, project_name, task_id):
+        # Remove the task with this id and return it.
+        with self._lock, self._db:
+            self._digests.pop(project_name, None)
+            task = self.get_task(project_name, task_id)
+            if task is None:
+                raise KeyError(task_id)
+            self._db.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+            return task
+
+    def delete_tasks_in_range(self, project_name, start, end):
+        # Remove every task that lies completely between the two datetime strings.
+        with self._lock, self._db:
+            self._digests.pop(project_name, None)
+            return self._db.execute(
+                "DELETE FROM tasks WHERE project_id = ? AND start_time >= ? AND end_time <= ?",
+                (self._project_id(project_name), parse_minutes(start), parse_minutes(end)),
+            ).rowcount
+
+    def flush(self):
+        # Every change is committed immediately; nothing is pending.
+        pass
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    # --- projects.json interchange ---
+
+    def import_json(self, path=DATA_FILE):
+        # Replace the database contents with a projects.json file in one transaction.
+        projects = load_projects(path)
+        with self._lock, self._db:
+            self._digests = {}
+            self._db.execute("DELETE FROM projects")
+            # Task ids from the file are kept; tasks without one (or with a
+            # duplicate one) get a new id after the largest one in the file.
+            next_id = max((task["id"] for tasks in projects.values() for task in tasks if task.get("id") is not None),
+                          default=0) + 1
+            used_ids = set()
+            for project_name, tasks in projects.items():
+                project_id = self._db.execute("INSERT INTO projects (name) VALUES (?)", (project_name,)).lastrowid
+                rows = []
+                for task in tasks:
+                    task_id = task.get("id")
+                    if task_id is None or task_id in used_ids:
+                        task_id = next_id
+                        next_id += 1
+                    used_ids.add(task_id)
+                    rows.append((task_id, project_id, task["task"], parse_minutes(task["start"]), parse_minutes(task["end"])))
+                self._db.executemany(
+                    "INSERT INTO tasks (id, project_id, name, start_time, end_time) VALUES (?, ?, ?, ?, ?)", rows
+                )
+
+    def export_json(self, path=DATA_FILE):
+        save_projects(self.to_dict(), path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate projects between projects.json and the SQLite database.")
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("path", nargs="?", default=DATA_FILE, help="projects.json file (default: %(default)s)")
+    args = parser.parse_args()
+
+    store = SqliteProjectStore()
+    if args.action == "import":
+        store.import_json(args.path)
+        print(f"Imported {args.path} into {store.path}")
+    else:
+        store.export_json(args.path)
+        print(f"Exported {store.path} to {args.path}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
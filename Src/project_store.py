@@ -0,0 +1,388 @@
+import os  # File paths and stat() for change detection
+import json  # Encoding and decoding of the projects file
+import atexit  # Flush pending changes when the interpreter exits
+import threading  # Lock and write-behind timer
+
+from file_utils import DATA_DIR, atomic_write_text  # Data directory and atomic file writes
+from project_task import SortedTasks, Task, parse_minutes, tasks_digest  # Task records with pre-parsed start/end times
+from interval_index import IntervalIndex  # Time-range and overlap queries per project
+
+
+# Default location of the projects file (same layout as gantt_chart.py uses).
+DATA_FILE = os.path.join(DATA_DIR, "projects.json")
+# Optional settings file; {"storage": "json" | "journal" | "sqlite" | "sharded"} selects the backend.
+CONFIG_FILE = os.path.join(DATA_DIR, "config.json")
+
+
+# Function to load the projects dictionary from a JSON file.
+def load_projects(path=DATA_FILE):
+    try:
+        with open(path, "r") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        # A missing or broken file is treated as "no projects yet".
+        return {}
+
+
+# Functions to convert between the projects.json layout (lists of dicts with
+# "id"/"task"/"start"/"end") and lists of Task records.
+def projects_from_json(data):
+    return {name: [Task.from_dict(task) for task in tasks] for name, tasks in data.items()}
+
+
+def projects_to_json(projects):
+    return {name: [task.to_dict() for task in tasks] for name, tasks in projects.items()}
+
+
+# Function to save the projects dictionary to a JSON file (atomically).
+def save_projects(projects, path=DATA_FILE):
+    atomic_write_text(path, json.dumps(projects, indent=4))
+
+
+class ProjectStore:
+    """Keeps all projects in memory and writes them back to disk lazily.
+
+    The file is parsed once; every read is served from memory. Mutations mark
+    the store dirty and start a write-behind timer, so a burst of edits costs a
+    single write. Pending changes are also flushed at interpreter exit, or
+    by close().
+
+    Each project is a dict from task id to Task (in the order the tasks were
+    added), so a task is found, edited or deleted by its id in O(1). Tasks
+    without an id, e.g. from an older projects.json, get one when loaded. The
+    start-time order of a project is sorted once on first use and from then on
+    updated with every change.
+    """
+
+    def __init__(self, path=DATA_FILE, flush_delay=2.0):
+        self.path = path
+        self.flush_delay = flush_delay  # Seconds between the first change and the write.
+        self._lock = threading.RLock()  # Guards the in-memory data.
+        self._write_lock = threading.Lock()  # Keeps writes to the file in order.
+        self._projects = {}  # {project name: {task id: Task}}
+        self._next_id = 1  # Id for the next new task.
+        self._signature = None  # (mtime, size) of the file as we last saw it.
+        self._dirty = False
+        self._timer = None
+        self._digests = {}  # Cached content hash per project, dropped when the project changes.
+        self._indexes = {}  # Interval index per project, built on first use and kept up to date.
+        self._sorted = {}  # SortedTasks per project, built on first use and kept up to date.
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.reload()
+        atexit.register(self.flush)
+
+    # --- Loading and change detection ---
+
+    def _stat_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def reload(self):
+        # (Re)read the file and drop any in-memory state.
+        with self._lock:
+            signature = self._stat_signature()
+            migrated = self._set_projects(projects_from_json(load_projects(self.path)))
+            self._signature = signature
+            self._dirty = False
+            if migrated:
+                # Write the new task ids back, so they stay the same from now on.
+                self._mark_dirty()
+
+    def _set_projects(self, projects):
+        # Replace the in-memory data with {project name: [Task]} and drop all caches.
+        # Tasks without an id (or with a duplicate one) get a new id; returns
+        # True if that happened.
+        used_ids = {task.id for tasks in projects.values() for task in tasks if task.id is not None}
+        self._next_id = max(used_ids, default=0) + 1
+        used_ids = set()
+        migrated = False
+        self._projects = {}
+        for project_name, tasks in projects.items():
+            by_id = self._projects[project_name] = {}
+            for task in tasks:
+                if task.id is None or task.id in used_ids:
+                    task.id = self._next_id
+                    self._next_id += 1
+                    migrated = True
+                used_ids.add(task.id)
+                by_id[task.id] = task
+        self._digests = {}
+        self._indexes = {}
+        self._sorted = {}
+        return migrated
+
+    def _project_lists(self):
+        # The projects as {project name: [Task]}, for writing them out.
+        return {name: list(tasks.values()) for name, tasks in self._projects.items()}
+
+    def _refresh_if_changed(self):
+        # Pick up edits made to the file by someone else, unless we have
+        # unsaved changes of our own (those win on the next flush).
+        if not self._dirty and self._stat_signature() != self._signature:
+            self.reload()
+
+    # --- Reads ---
+
+    def project_names(self):
+        with self._lock:
+            self._refresh_if_changed()
+            return list(self._projects.keys())
+
+    def has_project(self, project_name):
+        with self._lock:
+            self._refresh_if_changed()
+            return project_name in self._projects
+
+    def get_tasks(self, project_name):
+        # A new list of the project's tasks in the order they were added. The
+        # tasks themselves are the stored records; treat them as read-only and
+        # use the mutation methods below so that changes get persisted.
+        with self._lock:
+            self._refresh_if_changed()
+            return list(self._projects.get(project_name, {}).values())
+
+    def get_task(self, project_name, task_id):
+        # The task with this id, or None.
+        with self._lock:
+            self._refresh_if_changed()
+            return self._projects.get(project_name, {}).get(task_id)
+
+    def get_sorted_tasks(self, project_name):
+        # A new list of the project's tasks ordered by start time, copied from
+        # the maintained order (so later changes do not alter the returned list).
+        with self._lock:
+            self._refresh_if_changed()
+            return self._sorted_tasks(project_name).to_list()
+
+    def _sorted_tasks(self, project_name):
+        sorted_tasks = self._sorted.get(project_name)
+        if sorted_tasks is None:
+            sorted_tasks = SortedTasks(self._projects.get(project_name, {}).values())
+            self._sorted[project_name] = sorted_tasks
+        return sorted_tasks
+
+    def interval_index(self, project_name):
+        # The project's interval index; built on first use, then updated with every change.
+        with self._lock:
+            self._refresh_if_changed()
+            index = self._indexes.get(project_name)
+            if index is None:
+                # Equal starts are ordered by task id, as in SortedTasks and the SQLite store.
+                tasks = self._projects.get(project_name, {}).values()
+                index = IntervalIndex(((task.start, task.end, task) for task in tasks), tie_key=lambda task: task.id)
+                self._indexes[project_name] = index
+            return index
+
+    def tasks_in_range(self, project_name, start, end):
+        # Tasks that are active at some point between the two datetime strings, ordered by start.
+        with self._lock:
+            return self.interval_index(project_name).query(parse_minutes(start), parse_minutes(end))
+
+    def overlapping_tasks(self, project_name, task):
+        # The other tasks of the project whose time overlaps the given task.
+        with self._lock:
+            return self.interval_index(project_name).overlapping(task.start, task.end, task)
+
+    def find_conflicts(self, project_name):
+        # All pairs of overlapping tasks (earlier-starting task first).
+        with self._lock:
+            return self.interval_index(project_name).overlapping_pairs()
+
+    def project_digest(self, project_name):
+        # Content hash of the project's sorted tasks; changes whenever the chart would.
+        with self._lock:
+            self._refresh_if_changed()
+            digest = self._digests.get(project_name)
+            if digest is None:
+                digest = tasks_digest(self._sorted_tasks(project_name))
+                self._digests[project_name] = digest
+            return digest
+
+    def to_dict(self):
+        # A copy of the whole store in the projects.json layout.
+        with self._lock:
+            self._refresh_if_changed()
+            return projects_to_json(self._project_lists())
+
+    # --- Mutations ---
+    # Every change is described by a small record (an "op" plus its arguments),
+    # applied to the in-memory data and then handed to _record() for persistence.
+
+    def add_project(self, project_name):
+        with self._lock:
+            self._refresh_if_changed()
+            if project_name in self._projects:
+                return False
+            self._commit({"op": "add_project", "project": project_name})
+            return True
+
+    def delete_project(self, project_name):
+        with self._lock:
+            self._refresh_if_changed()
+            if project_name not in self._projects:
+                return False
+            self._commit({"op": "delete_project", "project": project_name})
+            return True
+
+    def add_task(self, project_name, task):
+        # Store a new task; it gets a fresh id, which is returned.
+        with self._lock:
+            self._refresh_if_changed()
+            task.id = None
+            return self._commit({"op": "add_task", "project": project_name, "task": task})
+
+    def edit_task(self, project_name, task_id, task):
+        # Replace the task with this id; the new task takes over the id.
+        with self._lock:
+            self._refresh_if_changed()
+            task.id = task_id
+            self._commit({"op": "edit_task", "project": project_name, "id": task_id, "task": task})
+
+    def delete_task(self, project_name, task_id):
+        # Remove the task with this id and return it.
+        with self._lock:
+            self._refresh_if_changed()
+            return self._commit({"op": "delete_task", "project": project_name, "id": task_id})
+
+    def _commit(self, record):
+        result = self._apply(record)
+        self._record(record)
+        return result
+
+    def _apply(self, record):
+        # Apply one change record to the in-memory projects.
+        # Cached digests are dropped; an existing interval index and sorted order
+        # are updated in place.
+        op = record["op"]
+        project_name = record["project"]
+        self._digests.pop(project_name, None)
+        index = self._indexes.get(project_name)
+        sorted_tasks = self._sorted.get(project_name)
+        if op == "add_project":
+            self._projects[project_name] = {}
+        elif op == "delete_project":
+            del self._projects[project_name]
+            self._indexes.pop(project_name, None)
+            self._sorted.pop(project_name, None)
+        elif op == "add_task":
+            task = record["task"]
+            if task.id is None:
+                task.id = self._next_id
+            self._next_id = max(self._next_id, task.id + 1)
+            self._projects[project_name][task.id] = task
+            if index is not None:
+                index.insert(task.start, task.end, task)
+            if sorted_tasks is not None:
+                sorted_tasks.add(task)
+            return task.id
+        elif op == "edit_task":
+            tasks = self._projects[project_name]
+            task_id = self._record_task_id(record, tasks)
+            old_task, task = tasks[task_id], record["task"]
+            task.id = task_id
+            tasks[task_id] = task
+            if index is not None:
+                index.remove(old_task.start, old_task)
+                index.insert(task.start, task.end, task)
+            if sorted_tasks is not None:
+                sorted_tasks.remove(old_task)
+                sorted_tasks.add(task)
+        elif op == "delete_task":
+            tasks = self._projects[project_name]
+            task = tasks.pop(self._record_task_id(record, tasks))
+            if index is not None:
+                index.remove(task.start, task)
+            if sorted_tasks is not None:
+                sorted_tasks.remove(task)
+            return task
+        else:
+            raise ValueError(f"Unknown change record: {op!r}")
+
+    @staticmethod
+    def _record_task_id(record, tasks):
+        # The id of the task a record refers to. Records written before tasks
+        # had ids (in a journal) give its position in insertion order instead.
+        if "id" in record:
+            return record["id"]
+        return list(tasks)[record["index"]]
+
+    def _record(self, record):
+        # The whole-file store only needs to know that something changed.
+        self._mark_dirty()
+
+    # --- Write-behind persistence ---
+
+    def _mark_dirty(self):
+        self._dirty = True
+        # The timer is started by the first change only; later changes ride
+        # along with it, which bounds how long a change can stay unsaved.
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        # Write pending changes to disk now. Safe to call at any time.
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                text = json.dumps(projects_to_json(self._project_lists()), indent=4)
+                self._dirty = False
+            try:
+                atomic_write_text(self.path, text)
+            except OSError:
+                # Keep the changes pending so the next flush retries them.
+                with self._lock:
+                    self._dirty = True
+                raise
+            with self._lock:
+                self._signature = self._stat_signature()
+
+    def close(self):
+        # Write pending changes and drop the flush at interpreter exit, which
+        # would otherwise keep the store alive until then.
+        self.flush()
+        atexit.unregister(self.flush)
+
+
+# Function to read the settings file; the GANTT_STORAGE environment variable
+# overrides the configured storage backend.
+def load_config(path=CONFIG_FILE):
+    config = {"storage": "json"}
+    try:
+        with open(path, "r") as file:
+            config.update(json.load(file))
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+    if os.environ.get("GANTT_STORAGE"):
+        config["storage"] = os.environ["GANTT_STORAGE"]
+    return config
+
+
+# Function to create the project store selected in the settings.
+def open_store(backend=None):
+    if backend is None:
+        backend = load_config()["storage"]
+    if backend == "json":
+        # Pick up changes made with the sharded backend since the last switch.
+        if os.path.exists(os.path.join(DATA_DIR, "projects")):
+            from project_shards import export_if_changed
+            export_if_changed(DATA_FILE)
+        return ProjectStore(DATA_FILE)
+    if backend == "journal":
+        from project_journal import JournalProjectStore
+        return JournalProjectStore()
+    if backend == "sqlite":
+        from project_sqlite import SqliteProjectStore
+        return SqliteProjectStore()
+    if backend == "sharded":
+        from project_shards import ShardedProjectStore
+        return ShardedProjectStore()
+    raise ValueError(f"Unknown storage backend: {backend!r}")
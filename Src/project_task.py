@@ -0,0 +1,156 @@
+import bisect  # Binary search in the sorted task order
+import hashlib  # Content hashes of task lists
+from datetime import date, datetime, timedelta  # Calendar arithmetic for the minute timestamps
+
+
+# Format of the task "start"/"end" strings in projects.json and in the GUI.
+DATETIME_FORMAT = "%d.%m.%Y %H:%M"
+
+# Task times are kept as whole minutes since 1970-01-01 (naive local time).
+EPOCH = datetime(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+MINUTES_PER_DAY = 24 * 60
+
+
+# Function to turn a "dd.mm.yyyy HH:MM" string into minutes since the epoch.
+# The fixed layout is sliced directly, which is many times faster than
+# datetime.strptime; anything unusual falls back to strptime.
+def parse_minutes(text):
+    if len(text) == 16 and text[2] == "." and text[5] == "." and text[10] == " " and text[13] == ":":
+        try:
+            value = datetime(int(text[6:10]), int(text[3:5]), int(text[0:2]), int(text[11:13]), int(text[14:16]))
+        except ValueError:
+            value = datetime.strptime(text, DATETIME_FORMAT)
+    else:
+        value = datetime.strptime(text, DATETIME_FORMAT)
+    return (value.toordinal() - EPOCH_ORDINAL) * MINUTES_PER_DAY + value.hour * 60 + value.minute
+
+
+# Function to turn minutes since the epoch back into a "dd.mm.yyyy HH:MM" string.
+def format_minutes(minutes):
+    days, minute_of_day = divmod(minutes, MINUTES_PER_DAY)
+    day = date.fromordinal(EPOCH_ORDINAL + days)
+    hour, minute = divmod(minute_of_day, 60)
+    return f"{day.day:02d}.{day.month:02d}.{day.year:04d} {hour:02d}:{minute:02d}"
+
+
+def minutes_to_datetime(minutes):
+    return EPOCH + timedelta(minutes=minutes)
+
+
+def datetime_to_minutes(value):
+    return (value.toordinal() - EPOCH_ORDINAL) * MINUTES_PER_DAY + value.hour * 60 + value.minute
+
+
+# Function to compute a short content hash of a list of tasks (order matters).
+# Two projects with the same tasks in the same order get the same digest, so it
+# can key caches of anything derived from the tasks, such as rendered charts.
+def tasks_digest(tasks):
+    digest = hashlib.blake2b(digest_size=16)
+    for task in tasks:
+        digest.update(f"{task.name}\x1f{task.start}\x1f{task.end}\x1e".encode())
+    return digest.hexdigest()
+
+
+class Task:
+    """One task of a project with its start and end parsed once into minutes.
+
+    The "dd.mm.yyyy HH:MM" strings are only produced again when the task is
+    saved (to_dict) or shown to the user (start_text/end_text). The id is
+    handed out by the project store when the task is added and stays the same
+    across edits, so it identifies the task even among tasks with equal values.
+    """
+
+    __slots__ = ("name", "start", "end", "id")
+
+    def __init__(self, name, start, end, id=None):
+        self.name = name
+        self.start = start  # Minutes since 1970-01-01.
+        self.end = end
+        self.id = id  # Unique within the store; None until the task is stored.
+
+    @classmethod
+    def from_dict(cls, data):
+        # Build a task from its projects.json form {"id", "task", "start", "end"}
+        # ("id" is missing in files written before tasks had ids).
+        return cls(data["task"], parse_minutes(data["start"]), parse_minutes(data["end"]), data.get("id"))
+
+    @classmethod
+    def from_strings(cls, name, start_text, end_text):
+        return cls(name, parse_minutes(start_text), parse_minutes(end_text))
+
+    def to_dict(self):
+        if self.id is None:
+            return {"task": self.name, "start": self.start_text, "end": self.end_text}
+        return {"id": self.id, "task": self.name, "start": self.start_text, "end": self.end_text}
+
+    @property
+    def start_text(self):
+        return format_minutes(self.start)
+
+    @property
+    def end_text(self):
+        return format_minutes(self.end)
+
+    @property
+    def start_datetime(self):
+        return minutes_to_datetime(self.start)
+
+    @property
+    def end_datetime(self):
+        return minutes_to_datetime(self.end)
+
+    def __eq__(self, other):
+        # Compares the values only; use the ids to tell equal tasks apart.
+        if not isinstance(other, Task):
+            return NotImplemented
+        return (self.name, self.start, self.end) == (other.name, other.start, other.end)
+
+    __hash__ = None  # Tasks compare by value but can be edited, so they are not hashable.
+
+    def __repr__(self):
+        return f"Task({self.name!r}, {self.start_text!r}, {self.end_text!r})"
+
+
+class SortedTasks:
+    """The tasks of one project, kept ordered by start time.
+
+    Tasks with the same start are ordered by id, i.e. in the order they were
+    added. add() and remove() find the position with a binary search over a
+    parallel list of sort keys, so the order is maintained without ever
+    sorting the whole project again.
+    """
+
+    def __init__(self, tasks=()):
+        self._tasks = sorted(tasks, key=self.sort_key)
+        self._keys = [self.sort_key(task) for task in self._tasks]
+
+    @staticmethod
+    def sort_key(task):
+        return (task.start, task.id)
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __iter__(self):
+        return iter(self._tasks)
+
+    def to_list(self):
+        # A copy of the tasks in order (cheap: no sorting, no key calls).
+        return list(self._tasks)
+
+    def add(self, task):
+        key = self.sort_key(task)
+        position = bisect.bisect_right(self._keys, key)
+        self._keys.insert(position, key)
+        self._tasks.insert(position, task)
+
+    def remove(self, task):
+        # Remove a task with the start and id it was added with. Returns False if it is not there.
+        key = self.sort_key(task)
+        position = bisect.bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            del self._keys[position]
+            del self._tasks[position]
+            return True
+        return False
@@ -1,19 +1,116 @@
 import tkinter as tk
+import os
+import json
 import time
 import random
+import argparse
+import statistics
+from datetime import datetime
 from tkinter import messagebox
+from file_utils import DATA_DIR, atomic_write_text
+
+# Where the results of all sessions are kept
+RESULTS_FILE = os.path.join(DATA_DIR, "reaction_times.json")
+# Reactions faster than this are anticipations, not reactions
+MIN_REACTION_MS = 100
+# Reactions further than this many (scaled) median absolute deviations from
+# the median are rejected as outliers
+OUTLIER_K = 3.0
+
+
+# Function to get the p-th percentile (0-100) of sorted values, interpolated.
+def percentile(sorted_values, p):
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    position = (len(sorted_values) - 1) * p / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+# Function to split reaction times into kept values and rejected outliers.
+# Anticipations (< MIN_REACTION_MS) are always rejected; the rest is filtered
+# with the median absolute deviation, which a single lapse does not inflate
+# the way it inflates the standard deviation.
+def reject_outliers(times, k=OUTLIER_K):
+    candidates = [t for t in times if t >= MIN_REACTION_MS]
+    rejected = [t for t in times if t < MIN_REACTION_MS]
+    if len(candidates) < 3:
+        return candidates, rejected
+    median = statistics.median(candidates)
+    mad = statistics.median(abs(t - median) for t in candidates) * 1.4826
+    if mad == 0:
+        return candidates, rejected
+    kept = [t for t in candidates if abs(t - median) <= k * mad]
+    rejected += [t for t in candidates if abs(t - median) > k * mad]
+    return kept, rejected
+
+
+# Function to compute the statistics of a session's reaction times (ms).
+def summarize(times, k=OUTLIER_K):
+    kept, rejected = reject_outliers(times, k)
+    summary = {"trials": len(times), "kept": len(kept), "rejected": sorted(rejected)}
+    if kept:
+        ordered = sorted(kept)
+        summary.update({
+            "mean_ms": statistics.fmean(ordered),
+            "median_ms": statistics.median(ordered),
+            "p95_ms": percentile(ordered, 95),
+            "stdev_ms": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+            "best_ms": ordered[0],
+        })
+    return summary
+
+
+# Functions to load and save the stored sessions.
+def load_sessions(path=RESULTS_FILE):
+    try:
+        with open(path, "r") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+
+def save_session(session, path=RESULTS_FILE):
+    sessions = load_sessions(path)
+    sessions.append(session)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    atomic_write_text(path, json.dumps(sessions, indent=2))
+    return sessions
+
+
+# Function to print the stored sessions, oldest first.
+def print_history(sessions):
+    if not sessions:
+        print("No sessions recorded yet.")
+        return
+    for session in sessions:
+        summary = session["summary"]
+        if "median_ms" not in summary:
+            continue
+        print(f"{session['date']}  {summary['kept']:3d}/{summary['trials']:<3d} trials  "
+              f"median {summary['median_ms']:7.1f} ms  p95 {summary['p95_ms']:7.1f} ms  "
+              f"stdev {summary['stdev_ms']:6.1f} ms")
+
 
 class ReactionTimeTest:
-    def __init__(self, master):
+    def __init__(self, master, trials=5, outlier_k=OUTLIER_K, results_file=RESULTS_FILE):
         self.master = master
         self.master.title("Reaction Time Test")
         self.master.geometry("600x400")
         self.state = 'start'  # Possible states: start, wait, go
-        self.click_count = 0
-        self.times = []
-        self.start_time = 0
+        self.trials = trials
+        self.outlier_k = outlier_k
+        self.results_file = results_file
+        self.records = []  # One dictionary per completed trial
+        self.false_starts = 0
+        self.due_ns = 0  # When the colour change was requested for
+        self.shown_ns = 0  # When the green screen was actually drawn
+        self.callback_latency_ms = 0.0  # Event loop delay of the colour change
+        self.draw_latency_ms = 0.0  # Time taken to draw the green screen
+        self.pending = None  # after() id of the scheduled colour change
 
-        self.label = tk.Label(master, text="Click to Start", font=("Helvetica", 24))
+        self.label = tk.Label(master, text=self.start_text(), font=("Helvetica", 24))
         self.label.pack(expand=True, fill='both')
 
         self.master.configure(bg='grey')
@@ -21,11 +118,16 @@ class ReactionTimeTest:
 
         self.master.bind("<Button-1>", self.on_click)
 
+    def start_text(self):
+        return f"Click to Start\n(trial {len(self.records) + 1} of {self.trials})"
+
     def on_click(self, event):
+        # Taken first thing, before any other work of the handler
+        click_ns = time.perf_counter_ns()
         if self.state == 'start':
             self.start_test()
         elif self.state == 'go':
-            self.record_reaction()
+            self.record_reaction(click_ns)
         elif self.state == 'wait':
             self.too_soon()
 
@@ -35,25 +137,40 @@ class ReactionTimeTest:
         self.label.configure(bg='red')
         self.label.config(text="Wait for Green...")
         wait_time = random.uniform(2, 5)  # Wait between 2 to 5 seconds
-        self.master.after(int(wait_time * 1000), self.change_to_green)
+        self.due_ns = time.perf_counter_ns() + int(wait_time * 1e9)
+        self.pending = self.master.after(int(wait_time * 1000), self.change_to_green)
 
     def change_to_green(self):
+        self.pending = None
+        callback_ns = time.perf_counter_ns()
         self.state = 'go'
         self.master.configure(bg='green')
         self.label.configure(bg='green')
         self.label.config(text="Click now!")
-        self.start_time = time.time()
+        # Draw now, so the clock starts when green is on screen rather than
+        # when it was requested; the delays of the event loop and of drawing
+        # are measured and kept out of the reaction time
+        self.master.update_idletasks()
+        self.shown_ns = time.perf_counter_ns()
+        self.callback_latency_ms = (callback_ns - self.due_ns) / 1e6
+        self.draw_latency_ms = (self.shown_ns - callback_ns) / 1e6
 
-    def record_reaction(self):
-        reaction_time = (time.time() - self.start_time) * 1000  # in milliseconds
-        self.times.append(reaction_time)
-        self.click_count += 1
-        if self.click_count < 5:
+    def record_reaction(self, click_ns):
+        self.records.append({
+            "reaction_ms": (click_ns - self.shown_ns) / 1e6,
+            "scheduling_latency_ms": self.callback_latency_ms,
+            "draw_latency_ms": self.draw_latency_ms,
+        })
+        if len(self.records) < self.trials:
             self.reset_test()
         else:
             self.show_results()
 
     def too_soon(self):
+        if self.pending is not None:
+            self.master.after_cancel(self.pending)
+            self.pending = None
+        self.false_starts += 1
         messagebox.showinfo("Too Soon!", "You clicked too soon! Wait for green.")
         self.reset_test()
 
@@ -61,18 +178,50 @@ class ReactionTimeTest:
         self.state = 'start'
         self.master.configure(bg='grey')
         self.label.configure(bg='grey')
-        self.label.config(text="Click to Start")
+        self.label.config(text=self.start_text())
 
     def show_results(self):
-        average = sum(self.times) / len(self.times)
-        results = "\n".join([f"Attempt {i+1}: {t:.2f} ms" for i, t in enumerate(self.times)])
-        message = f"Your Reaction Times:\n{results}\n\nAverage Reaction Time: {average:.2f} ms"
+        times = [record["reaction_ms"] for record in self.records]
+        summary = summarize(times, self.outlier_k)
+        session = {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "trials": self.records,
+            "false_starts": self.false_starts,
+            "summary": summary,
+        }
+        sessions = save_session(session, self.results_file)
+
+        results = "\n".join([f"Attempt {i+1}: {t:.2f} ms" for i, t in enumerate(times)])
+        latency = max(record["scheduling_latency_ms"] + record["draw_latency_ms"] for record in self.records)
+        message = f"Your Reaction Times:\n{results}\n\n"
+        if "median_ms" in summary:
+            message += (f"Median: {summary['median_ms']:.2f} ms\n"
+                        f"95th percentile: {summary['p95_ms']:.2f} ms\n"
+                        f"Standard deviation: {summary['stdev_ms']:.2f} ms\n")
+        if summary["rejected"]:
+            message += "Rejected: " + ", ".join(f"{t:.0f} ms" for t in summary["rejected"]) + "\n"
+        message += f"False starts: {self.false_starts}\nDisplay latency (max, excluded): {latency:.2f} ms"
+        previous = [s["summary"]["median_ms"] for s in sessions[:-1] if "median_ms" in s["summary"]]
+        if previous and "median_ms" in summary:
+            message += (f"\n\nPrevious sessions: {len(previous)}, best median {min(previous):.2f} ms, "
+                        f"last median {previous[-1]:.2f} ms")
         messagebox.showinfo("Results", message)
         self.master.quit()
 
 def main():
+    parser = argparse.ArgumentParser(description="Measure your reaction time.")
+    parser.add_argument("-n", "--trials", type=int, default=5, help="trials per session (default 5)")
+    parser.add_argument("--outlier-k", type=float, default=OUTLIER_K,
+                        help="reject reactions more than K scaled MADs from the median")
+    parser.add_argument("--results", default=RESULTS_FILE, help="JSON file the sessions are stored in")
+    parser.add_argument("--history", action="store_true", help="print the stored sessions and exit")
+    args = parser.parse_args()
+    if args.history:
+        print_history(load_sessions(args.results))
+        return
+
     root = tk.Tk()
-    app = ReactionTimeTest(root)
+    app = ReactionTimeTest(root, args.trials, args.outlier_k, args.results)
     root.mainloop()
 
 if __name__ == "__main__":
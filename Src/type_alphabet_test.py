@@ -1,34 +1,97 @@
-from pynput import keyboard
-from pynput.keyboard import Controller
-import time
+import argparse  # Command line options
+import string
+import threading  # Waits for the end of typing
+from hotkeys import HotkeyManager
+from typing_engine import BACKENDS, RecorderTyper, TypingEngine
 
-# Initialize the keyboard controller
-keyboard_controller = Controller()
-
-# The alphabet to type
+# The alphabet to type (without the "a" that starts it)
 alphabet = "bcdefghijklmnopqrstuvwxyz"
 
-# Function to type the alphabet
-def type_alphabet():
-    for letter in alphabet:
-        keyboard_controller.type(letter)  # Simulate typing the letter
-        time.sleep(0.1)  # Small delay to simulate typing speed
-
-# Listener function for key press
-def on_press(key):
-    try:
-        # Start typing when "a" is pressed
-        if key.char == "a":
-            print("Starting to type the alphabet...")
-            type_alphabet()
-            print("Alphabet typed successfully!")
-            # Stop the listener after completing the task
-            return False
-    except AttributeError:
-        # Ignore special keys
-        pass
-
-# Start listening for the key press
-print("Press 'a' to start typing the alphabet automatically.")
-with keyboard.Listener(on_press=on_press) as listener:
-    listener.join()
+
+# Function to parse --rate (argparse type): characters per second, greater than 0.
+def typing_rate(text):
+    rate = float(text)
+    if not 0 < rate < float("inf"):
+        raise argparse.ArgumentTypeError(f"must be a number greater than 0, got {text}")
+    return rate
+
+
+# Function to print what a typing run achieved.
+def print_summary(engine):
+    summary = engine.summary()
+    if "seconds" in summary:
+        print(f"{summary['chars']} characters in {summary['seconds']:.3f} s "
+              f"({summary['chars_per_second']:.1f} chars/sec)")
+
+
+# Function to type the text into an in-memory recorder and report the rate.
+def benchmark(text, rate, human):
+    recorder = RecorderTyper()
+    engine = TypingEngine(recorder, rate, human)
+    engine.type(text)
+    engine.wait()
+    engine.close()
+    if recorder.text != text:
+        print("Recorded text does not match the input!")
+    print_summary(engine)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Type text automatically when the start key is pressed.")
+    parser.add_argument("--text", help="text to type (default: the alphabet)")
+    parser.add_argument("--file", help="type the contents of this file")
+    parser.add_argument("--rate", type=typing_rate, default=10, help="characters per second (default 10)")
+    parser.add_argument("--max-speed", action="store_true", help="type as fast as the backend allows")
+    parser.add_argument("--human", action="store_true", help="randomized, human-like cadence around --rate")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="pynput")
+    parser.add_argument("--start-key", default="a")
+    parser.add_argument("--stop-key", default="esc", help="key that interrupts typing")
+    parser.add_argument("--benchmark", type=int, metavar="CHARS",
+                        help="type this many characters into a recorder and print the rate")
+    args = parser.parse_args()
+    if args.human and args.max_speed:
+        parser.error("--human types around --rate and cannot be combined with --max-speed")
+
+    rate = None if args.max_speed else args.rate
+
+    if args.benchmark:
+        text = (string.ascii_letters * (args.benchmark // len(string.ascii_letters) + 1))[:args.benchmark]
+        benchmark(text, rate, args.human)
+        return
+
+    # Initialize the typing engine
+    engine = TypingEngine(BACKENDS[args.backend](), rate, args.human)
+    hotkeys = HotkeyManager()
+
+    # Hotkey action: starts typing in the background and returns at once
+    def start_typing():
+        if engine.running:
+            return  # Typed text may contain the start key.
+        print("Starting to type...")
+        source = open(args.file, "r", encoding="utf-8") if args.file else (args.text or alphabet)
+        engine.type(source)
+
+        # Stop listening after completing the task
+        def finish():
+            engine.wait()
+            if args.file:
+                source.close()
+            print("Text typed successfully!")
+            print_summary(engine)
+            hotkeys.stop()
+
+        threading.Thread(target=finish, daemon=True).start()
+
+    hotkeys.bind(args.start_key, start_typing, "start typing")
+    hotkeys.bind(args.stop_key, engine.stop, "stop typing")
+
+    # Start listening for the key press
+    print(f"Press '{args.start_key}' to start typing automatically, '{args.stop_key}' to stop.")
+    hotkeys.start()
+    hotkeys.wait()
+    engine.close()
+    hotkeys.print_latency()
+
+
+if __name__ == "__main__":
+    main()
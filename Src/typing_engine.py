@@ -0,0 +1,178 @@
+import math  # Rounding batch sizes up
+import time  # Elapsed time of a run
+import random  # Human-like cadence
+import threading  # Finished event
+from precise_timing import PacedLoop
+
+
+# Shortest time between two deadlines when typing at a fixed rate; faster
+# rates send several characters per deadline instead.
+MIN_INTERVAL = 0.002
+# Extra pause (as a multiple of the normal interval) after these characters
+# in human-like mode.
+HUMAN_PAUSES = {" ": 2.0, "\n": 4.0, ",": 3.0, ".": 5.0, "!": 5.0, "?": 5.0}
+
+
+# Function to cut text into chunks of at most size characters. source is a
+# string or an open text file, which is read a block at a time.
+def iter_chunks(source, size):
+    if isinstance(source, str):
+        for start in range(0, len(source), size):
+            yield source[start:start + size]
+        return
+    while True:
+        block = source.read(size)
+        if not block:
+            return
+        yield block
+
+
+# --- Backends: send text to the target ---
+
+class PynputTyper:
+    """Types into the focused window with pynput."""
+
+    max_batch = 32  # Characters per type() call; pynput sends them one by one anyway.
+
+    def __init__(self):
+        from pynput.keyboard import Controller  # Imported here: needs a display
+        self._keyboard = Controller()
+
+    def type_text(self, text):
+        self._keyboard.type(text)
+
+
+class RecorderTyper:
+    """Collects the typed text in memory, for tests and benchmarks."""
+
+    max_batch = 4096
+
+    def __init__(self, record_times=False):
+        self.parts = []
+        self.times = [] if record_times else None
+
+    def type_text(self, text):
+        self.parts.append(text)
+        if self.times is not None:
+            self.times.append(time.perf_counter_ns())
+
+    @property
+    def text(self):
+        return "".join(self.parts)
+
+
+BACKENDS = {"pynput": PynputTyper, "recorder": RecorderTyper}
+
+
+class TypingEngine:
+    """Streams text to a typing backend at a target rate.
+
+    rate is in characters per second; None types as fast as the backend
+    takes it, in batches of backend.max_batch characters. At a fixed rate the
+    characters are sent at absolute deadlines (a PacedLoop), batched so that
+    deadlines are at least MIN_INTERVAL apart. With human=True every
+    character gets its own randomized interval around 1 / rate, with longer
+    pauses after spaces and punctuation. stop() interrupts typing between
+    two batches.
+    """
+
+    def __init__(self, backend, rate=None, human=False, seed=None):
+        # Checked here: the intervals are computed on the loop thread, where
+        # an error would only end the typing.
+        if rate is not None and not 0 < rate < math.inf:
+            raise ValueError(f"rate must be a number of characters per second greater than 0, not {rate!r}")
+        if human and rate is None:
+            raise ValueError("human-like typing needs a rate")
+        self.backend = backend
+        self.rate = rate
+        self.human = human
+        self._rng = random.Random(seed)
+        self._source = ""
+        self._pending = ""  # Chunk to type at the next deadline.
+        self.typed = 0
+        self._started = None
+        self._ended = None
+        self._finished = threading.Event()
+        self._finished.set()
+        self._lock = threading.Lock()  # Orders type() against the end of the previous run.
+        self._run = None  # Number of the loop run typing the current source.
+        self._loop = PacedLoop(self._type_pending, self._schedule, max_lag=0.2, on_finished=self._on_finished)
+
+    @property
+    def stats(self):
+        return self._loop.stats
+
+    @property
+    def running(self):
+        return self._loop.running
+
+    def batch_size(self):
+        if self.human:
+            return 1
+        if self.rate is None:
+            return self.backend.max_batch
+        return max(1, min(self.backend.max_batch, math.ceil(self.rate * MIN_INTERVAL)))
+
+    def type(self, source):
+        # Start typing source (a string or an open text file) in the background.
+        self.stop()
+        self._source = source
+        self.typed = 0
+        with self._lock:
+            self._finished.clear()
+            self._run = self._loop.start()
+
+    def stop(self):
+        self._loop.stop()
+        self._done()
+
+    def wait(self, timeout=None):
+        return self._finished.wait(timeout)
+
+    def close(self):
+        self._loop.close()
+        self._done()
+
+    def summary(self):
+        # Characters typed and the achieved rate of the last run.
+        result = {"chars": self.typed}
+        if self._started is not None:
+            seconds = ((self._ended or time.perf_counter_ns()) - self._started) / 1e9
+            result["seconds"] = seconds
+            result["chars_per_second"] = self.typed / seconds if seconds else float("inf")
+        return result
+
+    def _on_finished(self):
+        # The end of an earlier text that was replaced by type() is ignored.
+        with self._lock:
+            if self._loop.finished_run == self._run:
+                self._done()
+
+    def _done(self):
+        if self._started is not None and self._ended is None:
+            self._ended = time.perf_counter_ns()
+        self._finished.set()
+
+    def _schedule(self):
+        # Interval generator for the loop: prepares the next chunk and yields
+        # the time to wait before typing it. Called on every start.
+        self._started = time.perf_counter_ns()
+        self._ended = None
+        size = self.batch_size()
+        first = True
+        for chunk in iter_chunks(self._source, size):
+            self._pending = chunk
+            if first or self.rate is None:
+                interval = 0  # The first chunk is typed right away.
+            elif self.human:
+                interval = self._rng.lognormvariate(0, 0.35) / self.rate
+                interval *= HUMAN_PAUSES.get(previous[-1], 1.0)
+            else:
+                interval = len(previous) / self.rate  # Time the previous chunk is worth.
+            first = False
+            previous = chunk
+            yield interval
+
+    def _type_pending(self):
+        self.backend.type_text(self._pending)
+        self.typed += len(self._pending)
@@ -0,0 +1,218 @@
+import tkinter as tk  # Tk widgets
+import tkinter.font as tkfont  # Row height of the listbox font
+
+
+class VirtualListbox(tk.Frame):
+    """A listbox for very long lists that only creates the rows in view.
+
+    The items stay in the caller's list (for example the in-memory sorted task
+    list); the widget keeps a reference to it and formats just the visible
+    window of rows when scrolling. Indices in insert/delete/get/curselection
+    refer to that list, also while a filter is active, and selecting a row
+    generates <<ListboxSelect>> on this widget like a regular Listbox.
+    """
+
+    def __init__(self, master, formatter=str, filter_key=None, **listbox_options):
+        super().__init__(master)
+        self.formatter = formatter  # Item -> row text.
+        self.filter_key = filter_key or formatter  # Item -> text the filter searches in.
+        self._items = []
+        self._filter_text = ""
+        self._matches = None  # Indices of the items matching the filter, or None without filter.
+        self._top = 0  # Position (in the filtered view) of the first visible row.
+        self._selected = None  # Index of the selected item in self._items.
+        self._font = None  # Listbox font the row height was measured for.
+        self._row_height = 1
+
+        listbox_options.setdefault("exportselection", False)
+        self.listbox = tk.Listbox(self, **listbox_options)
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.listbox.bind("<Configure>", lambda event: self._render())
+        self.listbox.bind("<<ListboxSelect>>", self._on_listbox_select)
+        self.listbox.bind("<MouseWheel>", self._on_mousewheel)
+        self.listbox.bind("<Button-4>", lambda event: self.scroll(-3))
+        self.listbox.bind("<Button-5>", lambda event: self.scroll(3))
+        self.listbox.bind("<Up>", lambda event: self._move_selection(-1))
+        self.listbox.bind("<Down>", lambda event: self._move_selection(1))
+        self.listbox.bind("<Prior>", lambda event: self._move_selection(-self.visible_rows()))
+        self.listbox.bind("<Next>", lambda event: self._move_selection(self.visible_rows()))
+
+    # --- Data ---
+
+    def set_items(self, items):
+        # Show a new list of items (kept by reference, not copied).
+        self._items = items
+        self._selected = None
+        self._top = 0
+        self._apply_filter(self._filter_text, refine=False)
+
+    def insert(self, index, item):
+        if index == tk.END:
+            index = len(self._items)
+        self._items.insert(index, item)
+        if self._selected is not None and self._selected >= index:
+            self._selected += 1
+        self._apply_filter(self._filter_text, refine=False)
+
+    def delete(self, first, last=None):
+        # Delete the items first..last (inclusive, like Listbox.delete).
+        if first == tk.END:
+            first = len(self._items) - 1
+        if last is None:
+            last = first
+        elif last == tk.END:
+            last = len(self._items) - 1
+        del self._items[first:last + 1]
+        if self._selected is not None:
+            if first <= self._selected <= last:
+                self._selected = None
+            elif self._selected > last:
+                self._selected -= last - first + 1
+        self._apply_filter(self._filter_text, refine=False)
+
+    def get(self, index):
+        return self._items[index]
+
+    def size(self):
+        return len(self._items)
+
+    # --- Selection ---
+
+    def curselection(self):
+        # Like Listbox.curselection(): a tuple with the selected item's index, or empty.
+        return () if self._selected is None else (self._selected,)
+
+    def selection_set(self, index):
+        self._selected = index
+        self.see(index)
+
+    def selection_clear(self):
+        self._selected = None
+        self._render()
+
+    def see(self, index):
+        # Scroll so that the item with this index is visible.
+        position = self._position_of(index)
+        if position is None:
+            return
+        rows = self.visible_rows()
+        if position < self._top:
+            self._top = position
+        elif position >= self._top + rows:
+            self._top = position - rows + 1
+        self._render()
+
+    def _on_listbox_select(self, event):
+        selection = self.listbox.curselection()
+        if not selection:
+            return
+        position = self._top + selection[0]
+        if position < self._view_length():
+            self._selected = self._index_at(position)
+            self.event_generate("<<ListboxSelect>>")
+
+    def _move_selection(self, step):
+        length = self._view_length()
+        if not length:
+            return "break"
+        position = self._position_of(self._selected) if self._selected is not None else None
+        position = 0 if position is None else min(max(position + step, 0), length - 1)
+        self._selected = self._index_at(position)
+        self.see(self._selected)
+        self.event_generate("<<ListboxSelect>>")
+        return "break"
+
+    # --- Filtering ---
+
+    def set_filter(self, text):
+        # Show only items whose filter key contains the text (case-insensitive).
+        # When the new text extends the previous one, only the current matches
+        # are searched again instead of the whole list.
+        text = text.lower()
+        refine = bool(self._filter_text) and text.startswith(self._filter_text)
+        self._top = 0
+        self._apply_filter(text, refine)
+
+    def _apply_filter(self, text, refine):
+        if not text:
+            self._matches = None
+        else:
+            candidates = self._matches if refine and self._matches is not None else range(len(self._items))
+            key = self.filter_key
+            items = self._items
+            self._matches = [index for index in candidates if text in key(items[index]).lower()]
+        self._filter_text = text
+        self._top = min(self._top, max(0, self._view_length() - 1))
+        self._render()
+
+    def _view_length(self):
+        return len(self._items) if self._matches is None else len(self._matches)
+
+    def _index_at(self, position):
+        # Item index of a position in the (filtered) view.
+        return position if self._matches is None else self._matches[position]
+
+    def _position_of(self, index):
+        # Position in the (filtered) view of an item index, or None if it is filtered out.
+        if self._matches is None:
+            return index if 0 <= index < len(self._items) else None
+        # The matches are in item order, so a binary search finds the position.
+        low, high = 0, len(self._matches)
+        while low < high:
+            middle = (low + high) // 2
+            if self._matches[middle] < index:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self._matches) and self._matches[low] == index:
+            return low
+        return None
+
+    # --- Scrolling and drawing ---
+
+    def visible_rows(self):
+        # Number of rows that fit into the listbox at its current size.
+        font = self.listbox.cget("font")
+        if font != self._font:
+            # Measured once per font instead of creating a Font on every render.
+            self._font = font
+            self._row_height = tkfont.Font(font=font).metrics("linespace") + 1
+        return max(1, self.listbox.winfo_height() // self._row_height)
+
+    def scroll(self, rows):
+        self._top += rows
+        self._render()
+
+    def _on_mousewheel(self, event):
+        self.scroll(-1 if event.delta > 0 else 1)
+        return "break"
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == tk.MOVETO:
+            self._top = int(float(amount) * self._view_length())
+        elif unit == tk.PAGES:
+            self._top += int(amount) * self.visible_rows()
+        else:
+            self._top += int(amount)
+        self._render()
+
+    def _render(self):
+        # Fill the listbox with the rows of the visible window only.
+        length = self._view_length()
+        rows = self.visible_rows()
+        self._top = max(0, min(self._top, length - rows))
+        end = min(self._top + rows + 1, length)  # One extra row for a partly visible last line.
+        self.listbox.delete(0, tk.END)
+        for position in range(self._top, end):
+            self.listbox.insert(tk.END, self.formatter(self._items[self._index_at(position)]))
+        if self._selected is not None:
+            position = self._position_of(self._selected)
+            if position is not None and self._top <= position < end:
+                self.listbox.selection_set(position - self._top)
+        if length:
+            self.scrollbar.set(self._top / length, min(1.0, (self._top + rows) / length))
+        else:
+            self.scrollbar.set(0.0, 1.0)
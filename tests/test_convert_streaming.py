@@ -0,0 +1,60 @@
+import io
+import zipfile
+
+import pytest
+
+pytest.importorskip("pdf2docx")
+
+from docx import Document
+from docx.enum.section import WD_ORIENT
+from docx.opc.constants import RELATIONSHIP_TYPE
+from docx.shared import Mm
+
+from convert_pdf_2_docx import merge_parts
+
+# Two different 1x1 PNG images.
+RED_PNG = bytes.fromhex("89504e470d0a1a0a0000000d4948445200000001000000010802000000907753de0000000c4944415408d763f8cfc000"
+                        "00030101001857a0e10000000049454e44ae426082")
+BLUE_PNG = bytes.fromhex("89504e470d0a1a0a0000000d4948445200000001000000010802000000907753de0000000c4944415408d76360"
+                         "60f80f00010401000bf1c1150000000049454e44ae426082")
+
+
+def make_part(path, text, image, link, landscape=False):
+    document = Document()
+    if landscape:
+        section = document.sections[0]
+        section.orientation = WD_ORIENT.LANDSCAPE
+        section.page_width, section.page_height = Mm(297), Mm(210)
+    paragraph = document.add_paragraph(text)
+    # A hyperlink relationship, referenced from the paragraph like pdf2docx does.
+    r_id = document.part.relate_to(link, RELATIONSHIP_TYPE.HYPERLINK, is_external=True)
+    hyperlink = paragraph._p.makeelement("{http://schemas.openxmlformats.org/wordprocessingml/2006/main}hyperlink")
+    hyperlink.set("{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id", r_id)
+    paragraph._p.append(hyperlink)
+    document.add_picture(io.BytesIO(image))
+    document.save(path)
+    return str(path)
+
+
+def test_merge_parts_keeps_text_sections_images_and_links(tmp_path):
+    parts = [make_part(tmp_path / "1.docx", "one", RED_PNG, "https://example.com/1"),
+             make_part(tmp_path / "2.docx", "two", BLUE_PNG, "https://example.com/2", landscape=True),
+             make_part(tmp_path / "3.docx", "three", RED_PNG, "https://example.com/1")]
+    merged = str(tmp_path / "merged.docx")
+    merge_parts(parts, merged)
+
+    document = Document(merged)
+    assert [p.text for p in document.paragraphs if p.text] == ["one", "two", "three"]
+    assert [section.orientation for section in document.sections] == [
+        WD_ORIENT.PORTRAIT, WD_ORIENT.LANDSCAPE, WD_ORIENT.PORTRAIT]
+
+    rels = document.part.rels
+    blobs = [rels[shape._inline.graphic.graphicData.pic.blipFill.blip.embed].target_part.blob
+             for shape in document.inline_shapes]
+    assert blobs == [RED_PNG, BLUE_PNG, RED_PNG]
+    links = [rels[node.get("{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id")].target_ref
+             for node in document.element.body.iter("{http://schemas.openxmlformats.org/wordprocessingml/2006/main}hyperlink")]
+    assert links == ["https://example.com/1", "https://example.com/2", "https://example.com/1"]
+    with zipfile.ZipFile(merged) as archive:
+        # Equal images are stored once.
+        assert len([name for name in archive.namelist() if name.startswith("word/media/")]) == 2
@@ -0,0 +1,113 @@
+import pytest
+
+from gantt_api import create_app
+from project_sqlite import SqliteProjectStore
+from project_store import ProjectStore
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "json":
+        store = ProjectStore(str(tmp_path / "projects.json"), flush_delay=60)
+    else:
+        store = SqliteProjectStore(str(tmp_path / "projects.sqlite3"), import_path=None)
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def client(store):
+    return create_app(store).test_client()
+
+
+def task_body(name, start="01.01.2024 08:00", end="01.01.2024 09:00"):
+    return {"task": name, "start": start, "end": end}
+
+
+def test_projects(client):
+    assert client.post("/api/projects", json={"name": "P"}).status_code == 201
+    assert client.post("/api/projects", json={"name": "P"}).status_code == 409
+    assert client.post("/api/projects", json={}).status_code == 400
+    assert client.get("/api/projects").get_json() == {"projects": ["P"]}
+    assert client.get("/api/projects/P").get_json()["tasks"] == 0
+    assert client.delete("/api/projects/P").status_code == 204
+    assert client.get("/api/projects/P").status_code == 404
+    assert client.delete("/api/projects/P").status_code == 404
+
+
+def test_project_names_with_a_slash_are_rejected(client):
+    # The routes could not reach such a project afterwards.
+    assert client.post("/api/projects", json={"name": "a/b"}).status_code == 400
+    assert client.get("/api/projects").get_json() == {"projects": []}
+
+
+def test_tasks(client):
+    client.post("/api/projects", json={"name": "P"})
+    response = client.post("/api/projects/P/tasks", json=task_body("a"))
+    assert response.status_code == 201
+    task_id = response.get_json()["id"]
+    assert client.get(f"/api/projects/P/tasks/{task_id}").get_json()["task"] == "a"
+
+    response = client.put(f"/api/projects/P/tasks/{task_id}", json=task_body("b", end="01.01.2024 10:00"))
+    assert response.get_json() == {"id": task_id, **task_body("b", end="01.01.2024 10:00")}
+    assert client.put(f"/api/projects/P/tasks/{task_id}", json={"task": "c"}).status_code == 400
+
+    assert client.delete(f"/api/projects/P/tasks/{task_id}").status_code == 204
+    assert client.get(f"/api/projects/P/tasks/{task_id}").status_code == 404
+    assert client.delete(f"/api/projects/P/tasks/{task_id}").status_code == 404
+    assert client.put(f"/api/projects/P/tasks/{task_id}", json=task_body("d")).status_code == 404
+
+
+def test_tasks_of_a_missing_project(client):
+    assert client.get("/api/projects/P/tasks").status_code == 404
+    assert client.post("/api/projects/P/tasks", json=task_body("a")).status_code == 404
+    assert client.put("/api/projects/P/tasks/1", json=task_body("a")).status_code == 404
+    assert client.delete("/api/projects/P/tasks/1").status_code == 404
+
+
+@pytest.mark.parametrize("method", ["edit_task", "delete_task"])
+def test_project_deleted_by_another_request_meanwhile(client, store, method):
+    # The project is deleted just before the route changes it: the route
+    # must answer 404 instead of failing.
+    client.post("/api/projects", json={"name": "P"})
+    task_id = client.post("/api/projects/P/tasks", json=task_body("a")).get_json()["id"]
+    change = getattr(store, method)
+
+    def change_after_delete(*args):
+        store.delete_project("P")
+        return change(*args)
+
+    setattr(store, method, change_after_delete)
+    if method == "edit_task":
+        response = client.put(f"/api/projects/P/tasks/{task_id}", json=task_body("b"))
+    else:
+        response = client.delete(f"/api/projects/P/tasks/{task_id}")
+    assert response.status_code == 404
+
+
+def test_task_range_and_etag(client):
+    client.post("/api/projects", json={"name": "P"})
+    client.post("/api/projects/P/tasks", json=task_body("morning", "01.01.2024 08:00", "01.01.2024 09:00"))
+    client.post("/api/projects/P/tasks", json=task_body("noon", "01.01.2024 12:00", "01.01.2024 13:00"))
+
+    response = client.get("/api/projects/P/tasks", query_string={"start": "2024-01-01T11:00"})
+    assert [task["task"] for task in response.get_json()["tasks"]] == ["noon"]
+    assert client.get("/api/projects/P/tasks", query_string={"start": "soon"}).status_code == 400
+
+    response = client.get("/api/projects/P/tasks")
+    assert [task["task"] for task in response.get_json()["tasks"]] == ["morning", "noon"]
+    again = client.get("/api/projects/P/tasks", headers={"If-None-Match": response.headers["ETag"]})
+    assert again.status_code == 304
+
+
+def test_chart_is_rendered_once(client):
+    client.post("/api/projects", json={"name": "P"})
+    assert client.get("/api/projects/P/chart.png").status_code == 404  # No tasks yet.
+    client.post("/api/projects/P/tasks", json=task_body("a"))
+    response = client.get("/api/projects/P/chart.svg")
+    assert response.status_code == 200
+    assert response.mimetype == "image/svg+xml"
+    assert client.get("/api/projects/P/chart.svg").data == response.data
+    assert client.get("/api/projects/P/chart.svg", headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
+    assert client.application.extensions["gantt_charts"].renders == 1
+    assert client.get("/api/projects/P/chart.gif").status_code == 404
@@ -0,0 +1,24 @@
+import json
+import sys
+
+import pytest
+
+import gantt_benchmark
+
+
+def test_compare_with_the_default_results_file(tmp_path, monkeypatch):
+    # The previous results are in the file the run writes its own results to:
+    # they must be read before they are overwritten.
+    results_file = str(tmp_path / "gantt_benchmark.json")
+    monkeypatch.setattr(gantt_benchmark, "RESULTS_FILE", results_file)
+    faster = {name: 1e-9 for name in ["show_chart", "export_chart_build", "export_chart_png"]}
+    with open(results_file, "w") as file:
+        json.dump({"results": [{"total_tasks": 10, "timings": faster}]}, file)
+
+    monkeypatch.setattr(sys, "argv", ["gantt_benchmark.py", "--sizes", "10", "--repeat", "1", "--lookups", "10",
+                                      "--compare", results_file])
+    with pytest.raises(SystemExit) as exit_info:
+        gantt_benchmark.main()
+    assert exit_info.value.code == 1
+    with open(results_file, "r") as file:
+        assert json.load(file)["results"][0]["timings"]["save_projects"] > 1e-9
@@ -0,0 +1,67 @@
+import random
+
+from interval_index import IntervalIndex
+
+
+def overlaps(a_start, a_end, b_start, b_end):
+    return max(a_start, b_start) < min(a_end, b_end)
+
+
+def random_intervals(rng, count):
+    intervals = []
+    for number in range(count):
+        start = rng.randrange(0, 200)
+        intervals.append((start, start + rng.choice([0, 0, 1, 5, 20, 60]), f"i{number}"))
+    return intervals
+
+
+def test_query_matches_a_linear_scan():
+    rng = random.Random(1)
+    intervals = random_intervals(rng, 300)
+    index = IntervalIndex(intervals)
+    starts = {item: start for start, _, item in intervals}
+    for _ in range(200):
+        start = rng.randrange(-10, 260)
+        end = start + rng.choice([0, 1, 10, 50])
+        result = index.query(start, end)
+        assert set(result) == {item for s, e, item in intervals if overlaps(s, e, start, end)}
+        assert len(result) == len(set(result))
+        assert [starts[item] for item in result] == sorted(starts[item] for item in result)
+
+
+def test_changes_keep_the_index_correct():
+    rng = random.Random(2)
+    intervals = random_intervals(rng, 100)
+    index = IntervalIndex(intervals[:50])
+    for interval in intervals[50:]:
+        index.insert(*interval)
+    for start, end, item in intervals[::3]:
+        assert index.remove(start, item)
+    assert not index.remove(intervals[0][0], intervals[0][2])
+    kept = [interval for number, interval in enumerate(intervals) if number % 3]
+    assert len(index) == len(kept)
+    assert sorted(item for _, _, item in index) == sorted(item for _, _, item in kept)
+    expected = {item for s, e, item in kept if overlaps(s, e, 50, 120)}
+    assert set(index.query(50, 120)) == expected
+
+
+def test_overlapping_pairs_follow_the_same_rule_as_query():
+    rng = random.Random(3)
+    intervals = random_intervals(rng, 200)
+    index = IntervalIndex(intervals)
+    expected = {frozenset((a[2], b[2])) for number, a in enumerate(intervals) for b in intervals[number + 1:]
+                if overlaps(a[0], a[1], b[0], b[1])}
+    pairs = index.overlapping_pairs()
+    assert len(pairs) == len(expected)
+    assert {frozenset(pair) for pair in pairs} == expected
+    for start, end, item in intervals:
+        from_pairs = {other for pair in pairs if item in pair for other in pair if other is not item}
+        assert set(index.overlapping(start, end, item)) == from_pairs
+
+
+def test_empty_intervals_overlap_nothing():
+    index = IntervalIndex([(3, 8, "task"), (5, 5, "milestone"), (8, 8, "end")])
+    assert index.query(0, 10) == ["task"]
+    assert index.query(5, 5) == []
+    assert index.overlapping(5, 5, "milestone") == []
+    assert index.overlapping_pairs() == []
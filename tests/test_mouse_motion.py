@@ -0,0 +1,9 @@
+import pytest
+
+from mouse_motion import FakeCursor, MotionEngine
+
+
+@pytest.mark.parametrize("fps", [0, -30, float("nan"), float("inf")])
+def test_frame_rate_must_be_positive(fps):
+    with pytest.raises(ValueError):
+        MotionEngine(FakeCursor(), fps)
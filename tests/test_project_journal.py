@@ -0,0 +1,127 @@
+import os
+import threading
+
+import pytest
+
+from project_journal import JournalProjectStore
+from project_store import save_projects
+from project_task import Task
+
+
+def open_journal(tmp_path, **kwargs):
+    return JournalProjectStore(str(tmp_path / "projects.journal"), str(tmp_path / "projects.snapshot.json"),
+                               import_path=str(tmp_path / "projects.json"), **kwargs)
+
+
+def task(name, start="01.01.2024 08:00", end="01.01.2024 09:00"):
+    return Task.from_strings(name, start, end)
+
+
+def test_changes_are_replayed_after_reopening(tmp_path):
+    store = open_journal(tmp_path)
+    store.add_project("P")
+    first = store.add_task("P", task("a"))
+    second = store.add_task("P", task("b"))
+    store.edit_task("P", first, task("a2"))
+    store.delete_task("P", second)
+    store.close()
+
+    store = open_journal(tmp_path)
+    assert store.to_dict() == {"P": [{"id": first, "task": "a2", "start": "01.01.2024 08:00",
+                                      "end": "01.01.2024 09:00"}]}
+    store.close()
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    store = open_journal(tmp_path)
+    store.add_project("P")
+    store.add_task("P", task("a"))
+    store.close()
+    with open(tmp_path / "projects.journal", "a") as file:
+        file.write('{"op":"add_task","proj')
+
+    store = open_journal(tmp_path)
+    assert [t.name for t in store.get_tasks("P")] == ["a"]
+    store.close()
+
+
+def test_compaction_folds_the_journal_into_the_snapshot(tmp_path):
+    store = open_journal(tmp_path)
+    store.add_project("P")
+    for number in range(20):
+        store.add_task("P", task(f"t{number}"))
+    store.compact()
+    assert os.path.getsize(tmp_path / "projects.journal") == 0
+    assert not os.path.exists(tmp_path / "projects.journal.old")
+    store.add_task("P", task("after"))
+    expected = store.to_dict()
+    store.close()
+
+    store = open_journal(tmp_path)
+    assert store.to_dict() == expected
+    store.close()
+
+
+def test_failed_compaction_loses_no_records(tmp_path, monkeypatch):
+    store = open_journal(tmp_path)
+    store.add_project("P")
+    store.add_task("P", task("a"))
+
+    def failing_write_snapshot(projects, seq):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(store, "_write_snapshot", failing_write_snapshot)
+    with pytest.raises(OSError):
+        store.compact()
+    assert os.path.exists(tmp_path / "projects.journal.old")
+
+    # The next rotation must keep the records of the parked journal.
+    store.add_task("P", task("b"))
+    with pytest.raises(OSError):
+        store.compact()
+    store.add_task("P", task("c"))
+    store.close()
+
+    store = open_journal(tmp_path)
+    assert [t.name for t in store.get_tasks("P")] == ["a", "b", "c"]
+    store.compact()
+    assert not os.path.exists(tmp_path / "projects.journal.old")
+    store.close()
+
+    store = open_journal(tmp_path)
+    assert [t.name for t in store.get_tasks("P")] == ["a", "b", "c"]
+    store.close()
+
+
+def test_import_waits_for_a_running_compaction(tmp_path, monkeypatch):
+    store = open_journal(tmp_path)
+    store.add_project("Old")
+    store.add_task("Old", task("a"))
+    save_projects({"New": [{"task": "b", "start": "01.01.2024 08:00", "end": "01.01.2024 09:00"}]},
+                  str(tmp_path / "import.json"))
+
+    # Hold the background snapshot until the import has been started.
+    release = threading.Event()
+    write_snapshot = store._write_snapshot
+
+    def slow_write_snapshot(projects, seq):
+        release.wait(5)
+        write_snapshot(projects, seq)
+
+    monkeypatch.setattr(store, "_write_snapshot", slow_write_snapshot)
+    with store._lock:
+        store._start_compaction()
+    monkeypatch.setattr(store, "_write_snapshot", write_snapshot)
+
+    importer = threading.Thread(target=store.import_json, args=(str(tmp_path / "import.json"),))
+    importer.start()
+    importer.join(0.2)
+    assert importer.is_alive()  # Waiting for the compaction.
+    release.set()
+    importer.join(5)
+    assert not importer.is_alive()
+    store.close()
+
+    store = open_journal(tmp_path)
+    assert store.project_names() == ["New"]
+    store.close()
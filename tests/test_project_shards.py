@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from project_shards import ShardedProjectStore
+from project_store import save_projects
+from project_task import Task
+
+
+def open_shards(tmp_path, **kwargs):
+    return ShardedProjectStore(str(tmp_path / "projects"), import_path=str(tmp_path / "projects.json"), **kwargs)
+
+
+def task(name, start="01.01.2024 08:00", end="01.01.2024 09:00"):
+    return Task.from_strings(name, start, end)
+
+
+def test_changing_more_projects_than_max_loaded_between_flushes(tmp_path):
+    names = [f"P{number}" for number in range(6)]
+    store = open_shards(tmp_path, max_loaded=2)
+    for name in names:
+        store.add_project(name)
+        store.add_task(name, task(f"{name} first"))
+    store.close()
+
+    # Every project is read from its shard and changed before the next flush.
+    store = open_shards(tmp_path, max_loaded=2, flush_delay=60)
+    added = {name: store.add_task(name, task(f"{name} second")) for name in names}
+    for name, task_id in added.items():
+        assert store.get_task(name, task_id).name == f"{name} second"
+    store.close()
+
+    store = open_shards(tmp_path, max_loaded=2)
+    for name in names:
+        assert [t.name for t in store.get_tasks(name)] == [f"{name} first", f"{name} second"]
+    assert len(store.loaded_projects()) <= 2
+    store.close()
+
+
+def test_failed_change_does_not_leave_the_project_pending(tmp_path):
+    store = open_shards(tmp_path, flush_delay=60)
+    store.add_project("P")
+    store.flush()
+    with pytest.raises(KeyError):
+        store.add_task("missing", task("a"))
+    with pytest.raises(KeyError):
+        store.delete_task("P", 12345)
+    assert store._dirty_projects == set()
+    store.close()
+
+
+def test_projects_json_changed_while_the_shards_were_not_exported(tmp_path):
+    store = open_shards(tmp_path)
+    store.add_project("Shards")
+    store.add_task("Shards", task("kept"))
+    store.close()
+    # Meanwhile the single-file store wrote projects.json.
+    save_projects({"Json": []}, str(tmp_path / "projects.json"))
+
+    store = open_shards(tmp_path)
+    assert store.project_names() == ["Json"]
+    with open(store.conflict_backup, "r") as file:
+        backup = json.load(file)
+    assert [t["task"] for t in backup["Shards"]] == ["kept"]
+    store.close()
+
+
+def test_projects_json_changed_after_an_export_is_imported(tmp_path):
+    store = open_shards(tmp_path)
+    store.add_project("Old")
+    store.export_json()
+    store.close()
+    save_projects({"New": []}, str(tmp_path / "projects.json"))
+
+    store = open_shards(tmp_path)
+    assert store.project_names() == ["New"]
+    assert store.conflict_backup is None
+    store.close()
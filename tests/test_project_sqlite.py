@@ -0,0 +1,85 @@
+from project_sqlite import SqliteProjectStore
+from project_store import ProjectStore, save_projects
+from project_task import Task
+
+
+PROJECTS = {
+    "Build": [
+        {"id": 7, "task": "Walls", "start": "02.01.2024 08:00", "end": "03.01.2024 16:00"},
+        {"task": "Roof", "start": "01.01.2024 08:00", "end": "02.01.2024 12:00"},
+        {"id": 7, "task": "Windows", "start": "03.01.2024 08:00", "end": "03.01.2024 12:00"},
+    ],
+    "Empty": [],
+}
+
+
+def open_sqlite(tmp_path):
+    return SqliteProjectStore(str(tmp_path / "projects.sqlite3"), import_path=str(tmp_path / "projects.json"))
+
+
+def test_first_start_imports_projects_json(tmp_path):
+    save_projects(PROJECTS, str(tmp_path / "projects.json"))
+    store = open_sqlite(tmp_path)
+    assert store.project_names() == ["Build", "Empty"]
+    tasks = store.get_tasks("Build")
+    # Ids from the file are kept; missing and duplicate ones get new ids.
+    assert [task.id for task in tasks] == [7, 8, 9]
+    assert [task.name for task in store.get_sorted_tasks("Build")] == ["Roof", "Walls", "Windows"]
+    store.close()
+
+
+def test_changes_are_persisted(tmp_path):
+    store = open_sqlite(tmp_path)
+    assert store.add_project("P")
+    assert not store.add_project("P")
+    first = store.add_task("P", Task.from_strings("a", "01.01.2024 08:00", "01.01.2024 09:00"))
+    second = store.add_task("P", Task.from_strings("b", "01.01.2024 07:00", "01.01.2024 08:00"))
+    store.edit_task("P", first, Task.from_strings("a2", "01.01.2024 10:00", "01.01.2024 11:00"))
+    assert store.delete_task("P", second).name == "b"
+    store.close()
+
+    store = open_sqlite(tmp_path)
+    assert store.to_dict() == {"P": [{"id": first, "task": "a2", "start": "01.01.2024 10:00",
+                                      "end": "01.01.2024 11:00"}]}
+    assert store.delete_project("P")
+    assert store.project_names() == []
+    store.close()
+
+
+def test_digest_changes_with_the_tasks(tmp_path):
+    store = open_sqlite(tmp_path)
+    store.add_project("P")
+    empty = store.project_digest("P")
+    task_id = store.add_task("P", Task.from_strings("a", "01.01.2024 08:00", "01.01.2024 09:00"))
+    changed = store.project_digest("P")
+    assert changed != empty
+    store.edit_task("P", task_id, Task.from_strings("a", "01.01.2024 08:00", "01.01.2024 10:00"))
+    assert store.project_digest("P") != changed
+    store.close()
+
+
+def test_queries_match_the_in_memory_store(tmp_path):
+    save_projects(PROJECTS, str(tmp_path / "projects.json"))
+    sqlite_store = open_sqlite(tmp_path)
+    json_store = ProjectStore(str(tmp_path / "projects.json"))
+    for store in (sqlite_store, json_store):
+        store.add_task("Build", Task.from_strings("Paint", "03.01.2024 10:00", "04.01.2024 10:00"))
+        store.add_task("Build", Task.from_strings("Inspection", "03.01.2024 11:00", "03.01.2024 11:00"))
+
+    def ids(tasks):
+        return [task.id for task in tasks]
+
+    def pair_ids(pairs):
+        return sorted((first.id, second.id) for first, second in pairs)
+
+    assert ids(sqlite_store.get_sorted_tasks("Build")) == ids(json_store.get_sorted_tasks("Build"))
+    for start, end in [("01.01.2024 00:00", "31.12.2024 00:00"), ("02.01.2024 12:00", "03.01.2024 08:00"),
+                       ("03.01.2024 11:00", "03.01.2024 11:00"), ("05.01.2024 00:00", "06.01.2024 00:00")]:
+        assert (ids(sqlite_store.tasks_in_range("Build", start, end))
+                == ids(json_store.tasks_in_range("Build", start, end)))
+    assert pair_ids(sqlite_store.find_conflicts("Build")) == pair_ids(json_store.find_conflicts("Build"))
+    for task in json_store.get_tasks("Build"):
+        assert ids(sqlite_store.overlapping_tasks("Build", task)) == ids(json_store.overlapping_tasks("Build", task))
+    assert sqlite_store.project_digest("Build") == json_store.project_digest("Build")
+    sqlite_store.close()
+    json_store.flush()
@@ -0,0 +1,62 @@
+import gc
+import weakref
+
+import pytest
+
+from project_journal import JournalProjectStore
+from project_shards import ShardedProjectStore
+from project_store import ProjectStore, load_projects
+from project_task import Task
+
+
+def open_store(storage, tmp_path):
+    if storage == "json":
+        return ProjectStore(str(tmp_path / "projects.json"), flush_delay=60)
+    if storage == "journal":
+        return JournalProjectStore(str(tmp_path / "projects.journal"), str(tmp_path / "projects.snapshot.json"),
+                                   import_path=None)
+    return ShardedProjectStore(str(tmp_path / "projects"), import_path=None, flush_delay=60)
+
+
+@pytest.mark.parametrize("storage", ["json", "journal", "sharded"])
+def test_close_writes_changes_and_releases_the_store(tmp_path, storage):
+    store = open_store(storage, tmp_path)
+    store.add_project("P")
+    store.add_task("P", Task.from_strings("a", "01.01.2024 08:00", "01.01.2024 09:00"))
+    store.close()
+    # Nothing else (such as the flush at interpreter exit) holds on to a closed store.
+    closed = weakref.ref(store)
+    del store
+    gc.collect()
+    assert closed() is None
+
+    store = open_store(storage, tmp_path)
+    assert [task.name for task in store.get_tasks("P")] == ["a"]
+    store.close()
+
+
+def test_json_store_writes_on_close(tmp_path):
+    store = open_store("json", tmp_path)
+    store.add_project("P")
+    store.close()
+    assert load_projects(str(tmp_path / "projects.json")) == {"P": []}
+
+
+def test_tasks_with_the_same_start_are_ordered_by_id(tmp_path):
+    store = open_store("json", tmp_path)
+    store.add_project("P")
+    ids = [store.add_task("P", Task.from_strings(f"t{number}", "01.01.2024 08:00", "01.01.2024 09:00"))
+           for number in range(30)]
+    # Edited tasks are new objects; they keep their place among equal starts.
+    for task_id in reversed(ids[::2]):
+        store.edit_task("P", task_id, Task.from_strings("edited", "01.01.2024 08:00", "01.01.2024 10:00"))
+
+    def in_range():
+        return [task.id for task in store.tasks_in_range("P", "01.01.2024 00:00", "02.01.2024 00:00")]
+
+    assert in_range() == ids
+    assert [task.id for task in store.get_sorted_tasks("P")] == ids
+    store.close()
+    store = open_store("json", tmp_path)
+    assert in_range() == ids
+    store.close()